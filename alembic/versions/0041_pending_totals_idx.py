@@ -0,0 +1,31 @@
+"""Add a partial index for unsettled totals predictions
+
+Revision ID: 0041_pending_totals_idx
+Revises: 0040_news_seo_fields
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "0041_pending_totals_idx"
+down_revision = "0040_news_seo_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Settlement and the pending views filter on COALESCE(status, 'PENDING') = 'PENDING',
+    # which idx_predictions_totals_status cannot serve. The partial index only holds
+    # unsettled rows, so it stays small as history grows.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_predictions_totals_pending_fixture
+        ON predictions_totals (fixture_id)
+        WHERE COALESCE(status, 'PENDING') = 'PENDING'
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_predictions_totals_pending_fixture")
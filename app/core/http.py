@@ -1,4 +1,5 @@
 import asyncio
+import importlib.util
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 
@@ -7,6 +8,8 @@ import httpx
 from .config import settings
 
 _DEFAULT_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# httpx only speaks HTTP/2 with the optional h2 package installed.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 _api_football_client: httpx.AsyncClient | None = None
 _openweather_client: httpx.AsyncClient | None = None
 _telegram_client: httpx.AsyncClient | None = None
@@ -111,8 +114,10 @@ def assets_client() -> httpx.AsyncClient:
     if _assets_client is None or _assets_client.is_closed:
         _assets_client = httpx.AsyncClient(
             timeout=httpx.Timeout(15.0),
-            limits=_http_limits(),
+            # Logos come from a handful of CDN hosts; keep their connections warm between fixtures.
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60.0),
             follow_redirects=True,
+            http2=_HTTP2_AVAILABLE,
         )
     return _assets_client
 
@@ -192,13 +197,19 @@ async def request_with_retries(
     backoff_max: float = 8.0,
     retry_statuses: set[int] | None = None,
     retry_exceptions: tuple[type[BaseException], ...] = (httpx.RequestError,),
+    stream: bool = False,
     _sleep=asyncio.sleep,
     **kwargs,
 ) -> httpx.Response:
     statuses = retry_statuses or _DEFAULT_RETRY_STATUSES
     for attempt in range(retries + 1):
         try:
-            response = await client.request(method, url, params=params, **kwargs)
+            if stream:
+                # Body is left unread; the caller must consume and aclose() the response.
+                request = client.build_request(method, url, params=params, **kwargs)
+                response = await client.send(request, stream=True)
+            else:
+                response = await client.request(method, url, params=params, **kwargs)
         except retry_exceptions:
             if attempt >= retries:
                 raise
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+from collections import OrderedDict
 from typing import Iterable
 
 from app.core.http import request_with_retries, telegram_client
@@ -10,6 +11,11 @@ _TELEGRAM_RETRYABLE_CODES = {429, 500, 502, 503, 504}
 _TELEGRAM_MAX_RETRIES = 3
 _TELEGRAM_BACKOFF_BASE = 0.6
 _TELEGRAM_BACKOFF_CAP = 8.0
+_PHOTO_FILE_ID_CACHE_MAX = 256
+
+# Telegram file_ids are reusable by the same bot in any chat, so an image that was
+# uploaded once can be re-sent by reference instead of re-uploading the bytes.
+_photo_file_ids: OrderedDict[str, str] = OrderedDict()
 
 
 def _payload_retry_after(data: dict) -> float | None:
@@ -96,32 +102,59 @@ async def send_photo(
     filename: str = "prediction.png",
     caption: str | None = None,
     parse_mode: str = "HTML",
+    cache_key: str | None = None,
 ) -> int:
     client = telegram_client()
     data = {"chat_id": str(chat_id)}
     if caption:
         data["caption"] = caption
         data["parse_mode"] = parse_mode
+    file_id = _photo_file_ids.get(cache_key) if cache_key else None
     for attempt in range(_TELEGRAM_MAX_RETRIES + 1):
-        resp = await request_with_retries(
-            client,
-            "POST",
-            "/sendPhoto",
-            data=data,
-            files={"photo": (filename, image_bytes, "image/png")},
-        )
+        if file_id:
+            resp = await request_with_retries(
+                client,
+                "POST",
+                "/sendPhoto",
+                data={**data, "photo": file_id},
+            )
+        else:
+            resp = await request_with_retries(
+                client,
+                "POST",
+                "/sendPhoto",
+                data=data,
+                files={"photo": (filename, image_bytes, "image/png")},
+            )
         payload = resp.json()
         if isinstance(payload, dict) and payload.get("ok"):
             msg = payload.get("result") or {}
             msg_id = msg.get("message_id")
             if not msg_id:
                 raise RuntimeError("Telegram sendPhoto missing message_id")
+            if cache_key and not file_id:
+                _remember_photo_file_id(cache_key, msg.get("photo"))
             return int(msg_id)
 
         code = int((payload or {}).get("error_code") or 0) if isinstance(payload, dict) else 0
+        if file_id and code == 400:
+            # Stale or foreign file_id: forget it and upload the bytes instead.
+            _photo_file_ids.pop(cache_key, None)
+            file_id = None
+            continue
         retry_after = _payload_retry_after(payload if isinstance(payload, dict) else {})
         if code in _TELEGRAM_RETRYABLE_CODES and attempt < _TELEGRAM_MAX_RETRIES:
             await asyncio.sleep(_backoff_delay(attempt, retry_after=retry_after))
             continue
         raise RuntimeError(f"Telegram sendPhoto failed: {json.dumps(payload)[:500]}")
     raise RuntimeError("Telegram sendPhoto failed: exhausted retries")
+
+
+def _remember_photo_file_id(cache_key: str, sizes: list | None) -> None:
+    # Telegram lists the stored sizes smallest first; the last one is the original.
+    if not sizes or not isinstance(sizes[-1], dict) or not sizes[-1].get("file_id"):
+        return
+    _photo_file_ids[cache_key] = str(sizes[-1]["file_id"])
+    _photo_file_ids.move_to_end(cache_key)
+    while len(_photo_file_ids) > _PHOTO_FILE_ID_CACHE_MAX:
+        _photo_file_ids.popitem(last=False)
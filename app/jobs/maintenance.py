@@ -33,25 +33,22 @@ async def _cleanup_api_cache(session: AsyncSession) -> dict:
     max_rows = int(getattr(settings, "api_cache_max_rows", 0) or 0)
     deleted_overflow = 0
     if max_rows > 0:
-        cnt_row = (await session.execute(text("SELECT COUNT(*) AS cnt FROM api_cache"))).first()
-        total = int(cnt_row.cnt or 0) if cnt_row else 0
-        overflow = total - max_rows
-        if overflow > 0:
-            res2 = await session.execute(
-                text(
-                    """
-                    DELETE FROM api_cache
-                    WHERE cache_key IN (
-                      SELECT cache_key
-                      FROM api_cache
-                      ORDER BY expires_at ASC
-                      LIMIT :lim
-                    )
-                    """
-                ),
-                {"lim": int(overflow)},
-            )
-            deleted_overflow = int(res2.rowcount or 0)
+        # Count and trim in one statement: the LIMIT is the overflow over max_rows.
+        res2 = await session.execute(
+            text(
+                """
+                DELETE FROM api_cache
+                WHERE cache_key IN (
+                  SELECT cache_key
+                  FROM api_cache
+                  ORDER BY expires_at ASC
+                  LIMIT GREATEST((SELECT COUNT(*) FROM api_cache) - :max_rows, 0)
+                )
+                """
+            ),
+            {"max_rows": max_rows},
+        )
+        deleted_overflow = int(res2.rowcount or 0)
 
     return {
         "api_cache_deleted_error": deleted_error,
@@ -2569,6 +2569,7 @@ async def api_publish_post_preview(
     fixture_id: int,
     image_theme: Optional[str] = None,
     lang: Optional[str] = None,
+    include_blocked_bodies: bool = True,
     _: None = Depends(_require_admin),
     session: AsyncSession = Depends(get_session),
 ):
@@ -2578,6 +2579,7 @@ async def api_publish_post_preview(
             fixture_id,
             image_theme=image_theme,
             lang=lang,
+            include_blocked_bodies=include_blocked_bodies,
         )
     except ValueError:
         raise HTTPException(status_code=404, detail="fixture not found")
@@ -40,6 +40,9 @@ _CHROMIUM_ARGS: list[str] = [
 _playwright_instance = None
 _browser = None
 _lock = asyncio.Lock()
+# Browser contexts are reused across renders (one per viewport width); each
+# screenshot still gets a fresh page, so no DOM state leaks between cards.
+_contexts: dict = {}
 
 
 async def _ensure_browser():
@@ -64,6 +67,34 @@ async def _ensure_browser():
         return _browser
 
 
+async def _ensure_context(width: int):
+    """Return the cached context for *width*, creating it on first use."""
+    context = _contexts.get(width)
+    if context is not None:
+        return context
+
+    browser = await _ensure_browser()
+    async with _lock:
+        context = _contexts.get(width)
+        if context is None:
+            context = await browser.new_context(
+                viewport={"width": width, "height": _DEFAULT_VIEWPORT_H},
+                device_scale_factor=_DEVICE_SCALE_FACTOR,
+                color_scheme="dark",
+            )
+            _contexts[width] = context
+        return context
+
+
+async def _drop_context(width: int) -> None:
+    context = _contexts.pop(width, None)
+    if context is not None:
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+
 async def screenshot(
     html: str,
     width: int = _DEFAULT_WIDTH,
@@ -88,16 +119,15 @@ async def screenshot(
     bytes
         PNG image bytes.
     """
-    browser = await _ensure_browser()
     effective_width = max(_MIN_WIDTH, int(width))
 
-    context = await browser.new_context(
-        viewport={"width": effective_width, "height": _DEFAULT_VIEWPORT_H},
-        device_scale_factor=_DEVICE_SCALE_FACTOR,
-        color_scheme="dark",
-    )
     try:
-        page = await context.new_page()
+        page = await (await _ensure_context(effective_width)).new_page()
+    except Exception:
+        # A cached context dies with its browser; start over with a fresh one.
+        await _drop_context(effective_width)
+        page = await (await _ensure_context(effective_width)).new_page()
+    try:
         await page.set_content(html, wait_until="domcontentloaded")
 
         # Wait for palette-ready signal (legacy compat + future v2)
@@ -137,13 +167,16 @@ async def screenshot(
 
         return png
     finally:
-        await context.close()
+        await page.close()
 
 
 async def close_browser() -> None:
     """Gracefully shut down the singleton browser and Playwright instance."""
     global _playwright_instance, _browser
 
+    for width in list(_contexts):
+        await _drop_context(width)
+
     async with _lock:
         if _browser is not None:
             try:
@@ -29,20 +29,23 @@ from pathlib import Path
 # Text normalisation helpers (minimal — same as html_image.py)
 # ---------------------------------------------------------------------------
 
-_TAG_RE = re.compile(r"<[^>]+>")
-_EMOJI_RE = re.compile(r"[\U0001F1E6-\U0001F1FF\U0001F300-\U0001FAFF\u2600-\u27BF]")
 _VS = "\ufe0f"
 _ZWJ = "\u200d"
+# Tags, joiners and emoji removed in one pass.  A tag match always wins at "<",
+# so this is equivalent to stripping tags first and emoji second.
+_STRIP_RE = re.compile(
+    r"<[^>]+>"
+    f"|[{_VS}{_ZWJ}"
+    r"\U0001F1E6-\U0001F1FF\U0001F300-\U0001FAFF\u2600-\u27BF]"
+)
 
 
+@lru_cache(maxsize=1024)
 def _norm(text: str | None) -> str:
-    """Lightweight normalisation: strip tags, emojis, trim."""
+    """Lightweight normalisation: strip tags, emojis, trim (memoised)."""
     if not text:
         return ""
-    t = _TAG_RE.sub("", text)
-    t = "".join(ch for ch in t if ch not in (_VS, _ZWJ))
-    t = _EMOJI_RE.sub("", t)
-    return t.strip()
+    return _STRIP_RE.sub("", text).strip()
 
 
 # ---------------------------------------------------------------------------
@@ -53,6 +56,22 @@ _WIDE = frozenset("MW@#%&")
 _NARROW = frozenset("ilIjtfr")
 
 
+@lru_cache(maxsize=4096)
+def _char_width_units(ch: str) -> float:
+    """Width weight of a single character (memoised; glyph classes never change)."""
+    if ch.isspace():
+        return 0.32
+    if ch in _WIDE:
+        return 1.04
+    if ch in _NARROW:
+        return 0.45
+    if ch.isupper():
+        return 0.84
+    if ch.isdigit():
+        return 0.72
+    return 0.68
+
+
 def text_width_units(text: str | None) -> float:
     """Estimate proportional text width (unit-less, for relative comparison).
 
@@ -63,18 +82,7 @@ def text_width_units(text: str | None) -> float:
         return 1.0
     units = 0.0
     for ch in src:
-        if ch.isspace():
-            units += 0.32
-        elif ch in _WIDE:
-            units += 1.04
-        elif ch in _NARROW:
-            units += 0.45
-        elif ch.isupper():
-            units += 0.84
-        elif ch.isdigit():
-            units += 0.72
-        else:
-            units += 0.68
+        units += _char_width_units(ch)
     return max(units, 1.0)
 
 
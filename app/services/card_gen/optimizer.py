@@ -60,9 +60,9 @@ def optimize_for_telegram(png_bytes: bytes) -> bytes:
 
         # Step 2: RGBA → RGB composite on dark background
         if img.mode == "RGBA":
-            bg = Image.new("RGB", img.size, _BG_COLOR)
-            bg.paste(img, mask=img.split()[3])  # alpha channel as mask
-            img = bg
+            # Single-pass composite; avoids splitting out an alpha band for a masked paste.
+            bg = Image.new("RGBA", img.size, _BG_COLOR + (255,))
+            img = Image.alpha_composite(bg, img).convert("RGB")
         elif img.mode != "RGB":
             img = img.convert("RGB")
 
@@ -1,8 +1,8 @@
 """Card Gen v2 — Python-side team colour extraction.
 
 Replaces the client-side JavaScript canvas palette algorithm from
-``html_image.py``.  Uses Pillow for pixel sampling (no extra deps)
-with identical HSL normalisation parameters.
+``html_image.py``.  Uses Pillow for pixel sampling and NumPy for the
+weighted average (no extra deps) with identical HSL normalisation parameters.
 
 Usage::
 
@@ -22,6 +22,8 @@ import math
 from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 log = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -31,6 +33,7 @@ _MAX_SAMPLE_SIDE = 42       # canvas max side in JS
 _ALPHA_THRESHOLD = 40       # skip pixels with alpha < 40
 _SAT_THRESHOLD = 20         # skip pixels with (max-min) < 20
 _WEIGHT_OFFSET = 10         # weight = sat + 10
+_SAMPLE_REDUCING_GAP = 3     # box-reduce big logos before the LANCZOS pass
 
 # HSL clamp ranges (JS: Math.min/max)
 _SAT_MIN = 0.36
@@ -140,36 +143,26 @@ def _normalize_accent(
         return fallback
 
 
-def _accent_from_pixels(
-    pixels: list[tuple[int, int, int, int]],
+def _accent_from_array(
+    rgba: np.ndarray,
     fallback: tuple[int, int, int],
 ) -> tuple[int, int, int]:
     """Saturation-weighted average colour — exact port of JS ``accentFromImage``.
 
-    *pixels* is a list of (R, G, B, A) tuples.
+    *rgba* is an ``(N, 4)`` (or ``(H, W, 4)``) RGBA array. Weights and weighted
+    channel sums are integers, so the int64 totals are exact and the result
+    matches the JS per-pixel loop bit for bit.
     """
-    total = 0.0
-    rs = 0.0
-    gs = 0.0
-    bs = 0.0
-
-    for r, g, b, a in pixels:
-        if a < _ALPHA_THRESHOLD:
-            continue
-        sat = max(r, g, b) - min(r, g, b)
-        if sat < _SAT_THRESHOLD:
-            continue
-        weight = sat + _WEIGHT_OFFSET
-        total += weight
-        rs += r * weight
-        gs += g * weight
-        bs += b * weight
-
-    if total <= 0:
+    px = rgba.reshape(-1, 4).astype(np.int64, copy=False)
+    rgb = px[:, :3]
+    sat = rgb.max(axis=1) - rgb.min(axis=1)
+    keep = (px[:, 3] >= _ALPHA_THRESHOLD) & (sat >= _SAT_THRESHOLD)
+    if not keep.any():
         return fallback
-
+    weight = sat[keep] + _WEIGHT_OFFSET
+    total = float(weight.sum())
+    rs, gs, bs = (weight @ rgb[keep]).tolist()
     return (rs / total, gs / total, bs / total)  # type: ignore[return-value]
-    # NOTE: returns floats intentionally — _normalize_accent handles rounding
 
 
 # ---------------------------------------------------------------------------
@@ -246,6 +239,8 @@ def extract_team_color(
         from PIL import Image
 
         img = Image.open(io.BytesIO(logo_bytes))
+        # JPEG logos can be decoded at a reduced scale; only a 42px sample is needed.
+        img.draft("RGB", (_MAX_SAMPLE_SIDE * _SAMPLE_REDUCING_GAP, _MAX_SAMPLE_SIDE * _SAMPLE_REDUCING_GAP))
         img = img.convert("RGBA")
 
         # Resize to max 42px side (same as JS canvas)
@@ -254,10 +249,9 @@ def extract_team_color(
         if ratio < 1.0:
             new_w = max(2, round(w * ratio))
             new_h = max(2, round(h * ratio))
-            img = img.resize((new_w, new_h), Image.LANCZOS)
+            img = img.resize((new_w, new_h), Image.LANCZOS, reducing_gap=_SAMPLE_REDUCING_GAP)
 
-        pixels = list(img.getdata())  # list of (R, G, B, A) tuples
-        raw_rgb = _accent_from_pixels(pixels, fallback)
+        raw_rgb = _accent_from_array(np.asarray(img), fallback)
         result = _normalize_accent(raw_rgb[0], raw_rgb[1], raw_rgb[2], fallback)
 
         # Update cache
@@ -11,9 +11,11 @@ Usage::
 
 from __future__ import annotations
 
+import hashlib
 import html as html_mod
 import logging
 import re
+from collections import OrderedDict
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
@@ -27,9 +29,12 @@ log = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 _TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
 
+# Templates ship with the package, so compiled templates are kept for the life of
+# the process instead of being re-stat'ed on every render (auto_reload).
 _jinja_env = Environment(
     loader=FileSystemLoader(str(_TEMPLATES_DIR)),
     autoescape=select_autoescape(["html", "j2"]),
+    auto_reload=False,
 )
 
 # ---------------------------------------------------------------------------
@@ -398,6 +403,13 @@ def _build_result_context(card: ResultCardData) -> dict:
 # Public API
 # ---------------------------------------------------------------------------
 
+# The HTML document (logos embedded as data URIs) fully determines the card, so
+# finished JPEGs are kept by a digest of it; previews and re-publishes of the
+# same card skip the browser round-trip.
+_RENDER_CACHE_MAX_ENTRIES = 32
+_render_cache: OrderedDict[str, bytes] = OrderedDict()
+
+
 async def render_card(
     card_data: PredictionCardData | ResultCardData,
 ) -> bytes:
@@ -439,11 +451,22 @@ async def render_card(
     template = _jinja_env.get_template(template_name)
     html_doc = template.render(**ctx)
 
+    cache_key = hashlib.blake2b(
+        f"{ctx['width']}\0{html_doc}".encode("utf-8"), digest_size=16
+    ).hexdigest()
+    cached = _render_cache.get(cache_key)
+    if cached is not None:
+        _render_cache.move_to_end(cache_key)
+        return cached
+
     # Screenshot
     png_bytes = await screenshot(html_doc, width=ctx["width"])
 
     # Optimize
     jpeg_bytes = optimize_for_telegram(png_bytes)
+    _render_cache[cache_key] = jpeg_bytes
+    while len(_render_cache) > _RENDER_CACHE_MAX_ENTRIES:
+        _render_cache.popitem(last=False)
 
     log.info(
         "card rendered: %s theme=%s, png=%d bytes → jpeg=%d bytes",
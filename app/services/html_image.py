@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 
-from playwright.sync_api import Browser, sync_playwright
+from playwright.sync_api import Browser, BrowserContext, sync_playwright
 
 
 _WIDTH = 1280
@@ -20,11 +20,19 @@ _STYLE_VARIANTS = {"pro", "viral"}
 
 _VARIATION_SELECTOR = "\ufe0f"
 _ZERO_WIDTH_JOINER = "\u200d"
-_EMOJI_RE = re.compile(r"[\U0001F1E6-\U0001F1FF\U0001F300-\U0001FAFF\u2600-\u27BF]")
+# Joiners and emoji removed in a single pass.
+_EMOJI_RE = re.compile(
+    f"[{_VARIATION_SELECTOR}{_ZERO_WIDTH_JOINER}"
+    r"\U0001F1E6-\U0001F1FF\U0001F300-\U0001FAFF\u2600-\u27BF]"
+)
+_TAG_RE = re.compile(r"<[^>]+>")
 
 _PLAYWRIGHT = None
 _BROWSER: Browser | None = None
 _BROWSER_LOCK = threading.Lock()
+# Browser contexts are reused across renders (one per viewport width); each render
+# still gets a fresh page, so no DOM state leaks between cards.
+_CONTEXTS: dict[int, BrowserContext] = {}
 
 
 @dataclass
@@ -44,16 +52,18 @@ class _CardData:
 
 
 def _strip_tags(text: str) -> str:
-    return re.sub(r"<[^>]+>", "", text or "")
+    return _TAG_RE.sub("", text or "")
 
 
 def _strip_emojis(text: str) -> str:
     if not text:
         return ""
-    cleaned = "".join(ch for ch in text if ch not in (_VARIATION_SELECTOR, _ZERO_WIDTH_JOINER))
-    return _EMOJI_RE.sub("", cleaned)
+    return _EMOJI_RE.sub("", text)
 
 
+# Team names, league titles and card lines repeat across renders; the emoji/tag
+# scan is pure, so memoise it.
+@lru_cache(maxsize=1024)
 def _normalize_line(line: str) -> str:
     return _strip_emojis(html.unescape(_strip_tags(line))).strip()
 
@@ -197,24 +207,28 @@ def _signal_title_font_size_px(title: str | None) -> int:
     return 24
 
 
+@lru_cache(maxsize=4096)
+def _char_width_units(ch: str) -> float:
+    if ch.isspace():
+        return 0.32
+    if ch in "MW@#%&":
+        return 1.04
+    if ch in "ilIjtfr":
+        return 0.45
+    if ch.isupper():
+        return 0.84
+    if ch.isdigit():
+        return 0.72
+    return 0.68
+
+
 def _text_width_units(text: str | None) -> float:
     src = _normalize_line(text or "")
     if not src:
         return 1.0
     units = 0.0
     for ch in src:
-        if ch.isspace():
-            units += 0.32
-        elif ch in "MW@#%&":
-            units += 1.04
-        elif ch in "ilIjtfr":
-            units += 0.45
-        elif ch.isupper():
-            units += 0.84
-        elif ch.isdigit():
-            units += 0.72
-        else:
-            units += 0.68
+        units += _char_width_units(ch)
     return max(units, 1.0)
 
 
@@ -240,6 +254,15 @@ def _normalize_probability(value: float | int | None) -> float | None:
     return max(0.0, min(1.0, num))
 
 
+_REC_KEYWORDS = frozenset({
+    "BET OF THE DAY", "RECOMMENDATION", "РЕКОМЕНДАЦІЯ",
+    "РЕКОМЕНДАЦИЯ", "PREDICTION", "ПРОГНОЗ",
+    "PRONOSTIC", "TIPP", "TYP", "PALPITE",
+    "PRONÓSTICO", "PROGNOSE", "PRÉDICTION",
+    "PREVISÃO", "PROGNOZA",
+})
+
+
 def _parse_card_data(
     text: str,
     *,
@@ -252,7 +275,8 @@ def _parse_card_data(
     lines = [_normalize_line(x) for x in (text or "").splitlines()]
     lines = [x for x in lines if x]
     if clean_league:
-        lines = [x for x in lines if x.lower() != clean_league.lower()]
+        league_lower = clean_league.lower()
+        lines = [x for x in lines if x.lower() != league_lower]
     lines = [x for x in lines if not x.startswith("🎯")]
     if not lines:
         lines = ["HOT PREDICTION"]
@@ -268,31 +292,25 @@ def _parse_card_data(
     _search_from = max(match_idx or 0, date_idx or 0)
     rec_idx = None
     if clean_bet:
+        bet_lower = clean_bet.lower()
         # Exact match (only after match/date)
         rec_idx = next(
-            (i for i, line in enumerate(lines) if i >= _search_from and line.lower() == clean_bet.lower()),
+            (i for i, line in enumerate(lines) if i >= _search_from and line.lower() == bet_lower),
             None,
         )
         # Contains match (handles "━━━ PREDICTION ━━━" matching "PREDICTION")
         if rec_idx is None:
             rec_idx = next(
                 (i for i, line in enumerate(lines)
-                 if i >= _search_from and clean_bet.lower() in line.lower() and line != clean_bet),
+                 if i >= _search_from and bet_lower in line.lower() and line != clean_bet),
                 None,
             )
     if rec_idx is None:
-        _rec_keywords = {
-            "BET OF THE DAY", "RECOMMENDATION", "РЕКОМЕНДАЦІЯ",
-            "РЕКОМЕНДАЦИЯ", "PREDICTION", "ПРОГНОЗ",
-            "PRONOSTIC", "TIPP", "TYP", "PALPITE",
-            "PRONÓSTICO", "PROGNOSE", "PRÉDICTION",
-            "PREVISÃO", "PROGNOZA",
-        }
         rec_idx = next(
             (
                 i
                 for i, line in enumerate(lines)
-                if i >= _search_from and line.upper().strip("━ ") in _rec_keywords
+                if i >= _search_from and line.upper().strip("━ ") in _REC_KEYWORDS
             ),
             None,
         )
@@ -333,6 +351,8 @@ def _rgb_to_hex(color: tuple[int, int, int]) -> str:
     return f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
 
 
+# League and team logos recur across cards; keep their base64 encoding.
+@lru_cache(maxsize=128)
 def _bytes_to_data_uri(data: bytes | None, fallback_svg: str) -> str:
     if not data:
         return fallback_svg
@@ -347,6 +367,7 @@ def _bytes_to_data_uri(data: bytes | None, fallback_svg: str) -> str:
     return f"data:{mime};base64,{encoded}"
 
 
+@lru_cache(maxsize=256)
 def _fallback_logo_svg(letter: str, bg: str) -> str:
     svg = (
         f"<svg xmlns='http://www.w3.org/2000/svg' width='96' height='96' viewBox='0 0 96 96'>"
@@ -407,8 +428,37 @@ def _ensure_browser() -> Browser:
         return _BROWSER
 
 
+def _ensure_context(width: int) -> BrowserContext:
+    context = _CONTEXTS.get(width)
+    if context is not None:
+        return context
+    browser = _ensure_browser()
+    with _BROWSER_LOCK:
+        context = _CONTEXTS.get(width)
+        if context is None:
+            context = browser.new_context(
+                viewport={"width": width, "height": _DEFAULT_VIEWPORT_H},
+                device_scale_factor=2,
+                color_scheme="dark",
+            )
+            _CONTEXTS[width] = context
+        return context
+
+
+def _drop_context(width: int) -> None:
+    with _BROWSER_LOCK:
+        context = _CONTEXTS.pop(width, None)
+    if context is not None:
+        try:
+            context.close()
+        except Exception:
+            pass
+
+
 def _shutdown_browser() -> None:
     global _PLAYWRIGHT, _BROWSER
+    for width in list(_CONTEXTS):
+        _drop_context(width)
     with _BROWSER_LOCK:
         if _BROWSER is not None:
             try:
@@ -478,8 +528,9 @@ def _build_html(
     home_team_html = html.escape(data.home_team)
     away_team_html = html.escape(data.away_team)
     pick_main_html = html.escape(data.recommendation_main)
-    odds_center_html = html.escape(_odds_display(data.recommendation_odd))
-    odds_font_size_px = _odds_font_size_px(_odds_display(data.recommendation_odd))
+    odds_value = _odds_display(data.recommendation_odd)
+    odds_center_html = html.escape(odds_value)
+    odds_font_size_px = _odds_font_size_px(odds_value)
     title_html = html.escape(data.title)
     title_color = _title_color(data.title)
     signal_rows_raw = [signal_line_1, signal_line_2, signal_line_3]
@@ -1587,13 +1638,13 @@ def render_headline_image_html(
         signal_line_3=signal_line_3,
     )
 
-    browser = _ensure_browser()
-    context = browser.new_context(
-        viewport={"width": max(800, int(width)), "height": _DEFAULT_VIEWPORT_H},
-        device_scale_factor=2,
-        color_scheme="dark",
-    )
-    page = context.new_page()
+    viewport_w = max(800, int(width))
+    try:
+        page = _ensure_context(viewport_w).new_page()
+    except Exception:
+        # A cached context dies with its browser; start over with a fresh one.
+        _drop_context(viewport_w)
+        page = _ensure_context(viewport_w).new_page()
     try:
         page.set_content(html_doc, wait_until="domcontentloaded")
         try:
@@ -1607,8 +1658,8 @@ def render_headline_image_html(
         box = element.bounding_box()
         if box and box.get("height", 0) > _DEFAULT_VIEWPORT_H:
             h = min(_MAX_VIEWPORT_H, int(box["height"]) + 48)
-            page.set_viewport_size({"width": max(800, int(width)), "height": h})
+            page.set_viewport_size({"width": viewport_w, "height": h})
         png = element.screenshot(type="png")
         return png
     finally:
-        context.close()
+        page.close()
@@ -44,12 +44,13 @@ def match_probs_poisson(
     k_max: int = 8,
 ) -> tuple[float, float, float]:
     """Standard Poisson 1X2 probabilities (no tau correction), normalized."""
+    # Each PMF depends on k only: build both rows once, not per grid cell
+    pmf_a = [poisson_pmf(j, lam_a) for j in range(k_max + 1)]
     p_h, p_d, p_a = 0.0, 0.0, 0.0
     for i in range(k_max + 1):
         pi = poisson_pmf(i, lam_h)
         for j in range(k_max + 1):
-            pj = poisson_pmf(j, lam_a)
-            prob = pi * pj
+            prob = pi * pmf_a[j]
             if i > j:
                 p_h += prob
             elif i == j:
@@ -5,22 +5,34 @@ import base64
 import hashlib
 import json
 import re
+import string
+import struct
 import time
-from dataclasses import dataclass
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any
+from functools import lru_cache, partial
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Callable, NamedTuple
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.db import SessionLocal
 from app.core.http import assets_client, request_with_retries
 from app.core.logger import get_logger
 from app.data.providers.api_football import get_fixture_by_id, get_standings
 from app.data.providers.deepl import translate_html
 from app.data.providers.telegram import send_message_parts, send_photo
 from app.services.ai_enrich import enrich_analysis, translate_text
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
 try:
     from app.services.html_image import render_headline_image_html
 except Exception:  # pragma: no cover - startup must survive optional renderer failures
@@ -46,8 +58,41 @@ _STAT_DIFF_MINOR = 0.25
 _STAT_DIFF_MAJOR = 0.45
 _LOGO_MAX_BYTES = 2 * 1024 * 1024
 _IMAGE_THEMES = {"pro", "viral"}
+_TEMPLATE_FORMATTER = string.Formatter()
+_PROTECTED_RE = re.compile(r"<x>(.*?)</x>")
+_REASON_PAREN_RE = re.compile(r"\(([^)]+)\)")
+_REASON_BRIER_RE = re.compile(r"Brier\s+([0-9.]+)")
+_REASON_LOGLOSS_RE = re.compile(r"LogLoss\s+([0-9.]+)")
+_BR_TAG_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_SPACE_RUN_RE = re.compile(r"[ \t]{2,}")
+_PADDED_NEWLINE_RE = re.compile(r" *\n *")
+_INDICATOR_PREFIX_RE = re.compile(r"^[^\wА-Яа-я0-9]+")
+_WHITESPACE_RUN_RE = re.compile(r"\s{2,}")
+_NEWLINE_COLON_RE = re.compile(r"\n\s*:")
+_VS_RE = re.compile(r"\s+vs\s+", re.IGNORECASE)
+_REASON_EXACT = {
+    "нет отчёта качества": "reason_no_report",
+    "нет сводки качества": "reason_no_summary",
+    "CLV coverage 0%": "reason_clv_zero",
+}
+_REASON_PREFIX = (
+    ("малый объём", "reason_low_sample", "bets"),
+    ("CLV coverage низкий", "reason_clv_low", "pct"),
+)
+
+_LOGO_CACHE_MAX_ENTRIES = 512
+_LOGO_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
-_logo_cache: dict[str, bytes] = {}
+_LOGO_CACHE_TTL_SECONDS = 24 * 3600
+_LOGO_STALE_MAX_ENTRIES = 128
+
+# url -> (bytes, stored_at, etag, last_modified)
+_logo_cache: OrderedDict[str, tuple[bytes, float, str | None, str | None]] = OrderedDict()
+# Expired logos that carried validators, kept so the next fetch can revalidate (304)
+# instead of downloading the same image again.
+_logo_stale: OrderedDict[str, tuple[bytes, str | None, str | None]] = OrderedDict()
+_logo_cache_bytes = 0
+_logo_inflight: dict[str, asyncio.Future] = {}
 
 
 def _normalize_image_theme(value: str | None) -> str:
@@ -2491,7 +2536,7 @@ _LANG_TEXT: dict[str, dict[str, Any]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketPreview:
     market: str
     headline_raw: str
@@ -2503,7 +2548,7 @@ class MarketPreview:
     reasons: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageVisualContext:
     league_country: str | None = None
     league_round: str | None = None
@@ -2521,17 +2566,15 @@ class ImageVisualContext:
     away_form: str | None = None
 
 
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
 def _escape_html(value: str) -> str:
-    return (
-        value.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-    )
+    return value.translate(_HTML_ESCAPE_TABLE)
 
 
 def _protect(value: str) -> str:
-    return f"<x>{_escape_html(value)}</x>"
+    return f"<x>{value.translate(_HTML_ESCAPE_TABLE)}</x>"
 
 
 def _strip_protect_tags(text: str) -> str:
@@ -2543,6 +2586,7 @@ def _lang_key(lang: str | None) -> str:
     return key if key in _LANG_TEXT else "ru"
 
 
+@lru_cache(maxsize=16)
 def _lang_pack(lang: str | None) -> dict[str, Any]:
     return _LANG_TEXT[_lang_key(lang)]
 
@@ -2550,7 +2594,7 @@ def _lang_pack(lang: str | None) -> dict[str, Any]:
 def _extract_protected_values(text: str) -> list[str]:
     if not text:
         return []
-    return [m.group(1) for m in re.finditer(r"<x>(.*?)</x>", text)]
+    return _PROTECTED_RE.findall(text)
 
 
 def _prepare_translation_html(text: str) -> str:
@@ -2565,26 +2609,34 @@ def _restore_translated_html(text: str) -> str:
         return text
     out = text.replace("\r\n", "\n")
     out = out.replace("\n", " ")
-    out = re.sub(r"<br\s*/?>", "\n", out, flags=re.IGNORECASE)
-    out = re.sub(r"[ \t]{2,}", " ", out)
-    out = re.sub(r" *\n *", "\n", out)
+    out = _BR_TAG_RE.sub("\n", out)
+    out = _SPACE_RUN_RE.sub(" ", out)
+    out = _PADDED_NEWLINE_RE.sub("\n", out)
     return out.strip()
 
 
+@lru_cache(maxsize=256)
+def _protected_value_res(value: str) -> tuple[re.Pattern[str], re.Pattern[str]]:
+    escaped = re.escape(value)
+    # rf"\\w" puts a literal backslash + "w" into the pattern; kept byte-for-byte so
+    # normalized output does not change.
+    return re.compile(rf"(?<=\\w){escaped}"), re.compile(rf"{escaped}(?=\\w)")
+
+
 def _normalize_translated_text(text: str, protected: list[str]) -> str:
     if not text:
         return text
     out = text.replace("\r\n", "\n")
-    out = re.sub(r"\n\s*:", ":", out)
+    # Drops every "\n<space>:" up front, so no per-value "<value>\n:" pass is needed.
+    out = _NEWLINE_COLON_RE.sub(":", out)
     for value in protected:
         if not value:
             continue
-        escaped = re.escape(value)
-        out = re.sub(rf"{escaped}\n\s*:", f"{value}:", out)
-        out = re.sub(rf"(?<=\\w){escaped}", f" {value}", out)
-        out = re.sub(rf"{escaped}(?=\\w)", f"{value} ", out)
-    out = re.sub(r"[ \t]{2,}", " ", out)
-    out = re.sub(r"\s+vs\s+", " vs ", out, flags=re.IGNORECASE)
+        glued_before, glued_after = _protected_value_res(value)
+        out = glued_before.sub(f" {value}", out)
+        out = glued_after.sub(f"{value} ", out)
+    out = _SPACE_RUN_RE.sub(" ", out)
+    out = _VS_RE.sub(" vs ", out)
     return out
 
 
@@ -2599,16 +2651,70 @@ def _strip_image_probability_line(text: str) -> str:
     return "\n".join(lines)
 
 
+def _logo_cache_get(key: str) -> bytes | None:
+    global _logo_cache_bytes
+    entry = _logo_cache.get(key)
+    if entry is None:
+        return None
+    data, stored_at, etag, last_modified = entry
+    if time.monotonic() - stored_at > _LOGO_CACHE_TTL_SECONDS:
+        del _logo_cache[key]
+        _logo_cache_bytes -= len(data)
+        if etag or last_modified:
+            _logo_stale[key] = (data, etag, last_modified)
+            while len(_logo_stale) > _LOGO_STALE_MAX_ENTRIES:
+                _logo_stale.popitem(last=False)
+        return None
+    _logo_cache.move_to_end(key)
+    return data
+
+
+def _logo_cache_put(key: str, data: bytes, etag: str | None = None, last_modified: str | None = None) -> None:
+    global _logo_cache_bytes
+    previous = _logo_cache.pop(key, None)
+    if previous is not None:
+        _logo_cache_bytes -= len(previous[0])
+    _logo_cache[key] = (data, time.monotonic(), etag, last_modified)
+    _logo_cache_bytes += len(data)
+    while _logo_cache and (
+        len(_logo_cache) > _LOGO_CACHE_MAX_ENTRIES or _logo_cache_bytes > _LOGO_CACHE_MAX_BYTES
+    ):
+        _, (evicted, *_) = _logo_cache.popitem(last=False)
+        _logo_cache_bytes -= len(evicted)
+
+
 async def _fetch_logo_bytes(url: str | None) -> bytes | None:
     if not url:
         return None
     key = url.strip()
     if not key:
         return None
-    cached = _logo_cache.get(key)
+    cached = _logo_cache_get(key)
     if cached:
         return cached
+    # Single-flight: concurrent previews for the same team share one download.
+    pending = _logo_inflight.get(key)
+    if pending is None or pending.done():
+        pending = asyncio.ensure_future(_download_logo(key))
+        _logo_inflight[key] = pending
+        pending.add_done_callback(lambda done: _logo_inflight_release(key, done))
+    return await asyncio.shield(pending)
+
+
+def _logo_inflight_release(key: str, done: asyncio.Future) -> None:
+    if _logo_inflight.get(key) is done:
+        del _logo_inflight[key]
+
+
+async def _download_logo(key: str) -> bytes | None:
     client = assets_client()
+    stale = _logo_stale.pop(key, None)
+    headers: dict[str, str] = {}
+    if stale is not None:
+        if stale[1]:
+            headers["If-None-Match"] = stale[1]
+        if stale[2]:
+            headers["If-Modified-Since"] = stale[2]
     try:
         resp = await request_with_retries(
             client,
@@ -2617,15 +2723,29 @@ async def _fetch_logo_bytes(url: str | None) -> bytes | None:
             retries=2,
             backoff_base=0.4,
             backoff_max=2.0,
+            stream=True,
+            headers=headers or None,
         )
-        if resp.status_code < 200 or resp.status_code >= 300:
+        try:
+            if resp.status_code == 304 and stale is not None:
+                _logo_cache_put(key, stale[0], stale[1], stale[2])
+                return stale[0]
+            if resp.status_code < 200 or resp.status_code >= 300:
+                return None
+            declared = _to_int_or_none(resp.headers.get("Content-Length"))
+            if declared is not None and declared > _LOGO_MAX_BYTES:
+                return None
+            buf = bytearray()
+            async for chunk in resp.aiter_bytes(65536):
+                buf.extend(chunk)
+                if len(buf) > _LOGO_MAX_BYTES:
+                    return None
+        finally:
             await resp.aclose()
+        if not buf:
             return None
-        data = await resp.aread()
-        await resp.aclose()
-        if not data or len(data) > _LOGO_MAX_BYTES:
-            return None
-        _logo_cache[key] = data
+        data = bytes(buf)
+        _logo_cache_put(key, data, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
         return data
     except Exception:
         log.exception("logo_fetch_failed url=%s", key)
@@ -2660,6 +2780,9 @@ def _payload_dict(value: Any) -> dict[str, Any] | None:
     return None
 
 
+_1X2_SELECTIONS = frozenset({"HOME_WIN", "DRAW", "AWAY_WIN"})
+
+
 def _extract_1x2_chances(payload: Any) -> tuple[float | None, float | None, float | None]:
     data = _payload_dict(payload)
     if not data:
@@ -2668,12 +2791,14 @@ def _extract_1x2_chances(payload: Any) -> tuple[float | None, float | None, floa
     if not isinstance(candidates, list):
         return None, None, None
 
-    probs: dict[str, float] = {}
+    home: float | None = None
+    draw: float | None = None
+    away: float | None = None
     for item in candidates:
         if not isinstance(item, dict):
             continue
         selection = str(item.get("selection") or "").strip().upper()
-        if selection not in {"HOME_WIN", "DRAW", "AWAY_WIN"}:
+        if selection not in _1X2_SELECTIONS:
             continue
         try:
             value = float(item.get("prob"))
@@ -2681,18 +2806,24 @@ def _extract_1x2_chances(payload: Any) -> tuple[float | None, float | None, floa
             continue
         if value < 0:
             continue
-        probs[selection] = value
+        if selection == "HOME_WIN":
+            home = value
+        elif selection == "DRAW":
+            draw = value
+        else:
+            away = value
 
-    return probs.get("HOME_WIN"), probs.get("DRAW"), probs.get("AWAY_WIN")
+    return home, draw, away
 
 
-def _extract_standing_row(payload: dict, team_id: int) -> dict | None:
+def _build_standing_index(payload: dict) -> dict[int, dict]:
+    index: dict[int, dict] = {}
     response = payload.get("response") or []
     if not isinstance(response, list):
-        return None
+        return index
     for item in response:
-        league = (item or {}).get("league") if isinstance(item, dict) else None
-        standings = (league or {}).get("standings") if isinstance(league, dict) else None
+        league = item.get("league") if isinstance(item, dict) else None
+        standings = league.get("standings") if isinstance(league, dict) else None
         if not isinstance(standings, list):
             continue
         for group in standings:
@@ -2701,28 +2832,80 @@ def _extract_standing_row(payload: dict, team_id: int) -> dict | None:
             for row in group:
                 if not isinstance(row, dict):
                     continue
-                team = row.get("team") or {}
-                if _to_int_or_none(team.get("id")) == int(team_id):
-                    return row
-    return None
+                team_id = _to_int_or_none((row.get("team") or {}).get("id"))
+                # First occurrence wins, matching the old first-match scan.
+                if team_id is not None and team_id not in index:
+                    index[team_id] = row
+    return index
+
+
+async def _fetch_standings_payload(league_id: int, season: int) -> dict:
+    # Own session: AsyncSession does not allow the concurrent fixture lookup to share one.
+    async with SessionLocal() as standings_session:
+        payload = await get_standings(standings_session, league_id, season)
+        await standings_session.commit()
+    return payload
+
+
+_VISUAL_CONTEXT_TTL_SECONDS = 300
+_VISUAL_CONTEXT_CACHE_MAX_ENTRIES = 256
+
+_visual_context_cache: dict[tuple, tuple[ImageVisualContext, float]] = {}
 
 
 async def _fetch_image_visual_context(session: AsyncSession, fixture: Any) -> ImageVisualContext:
-    ctx = ImageVisualContext()
+    # Venue, round and standings barely move within minutes, while a burst of
+    # publications (preview, then publish) asks for the same fixture repeatedly.
+    cache_key = tuple(
+        getattr(fixture, name, None) for name in ("id", "league_id", "season", "home_team_id", "away_team_id")
+    )
+    now = time.monotonic()
+    cached = _visual_context_cache.get(cache_key)
+    if cached is not None and cached[1] > now:
+        return replace(cached[0])
+    ctx, complete = await _load_image_visual_context(session, fixture)
+    if complete:
+        if len(_visual_context_cache) >= _VISUAL_CONTEXT_CACHE_MAX_ENTRIES:
+            _visual_context_cache.clear()
+        _visual_context_cache[cache_key] = (replace(ctx), now + _VISUAL_CONTEXT_TTL_SECONDS)
+    return ctx
 
-    fixture_id = _to_int_or_none(getattr(fixture, "id", None))
-    league_id = _to_int_or_none(getattr(fixture, "league_id", None))
-    season = _to_int_or_none(getattr(fixture, "season", None)) or _to_int_or_none(getattr(settings, "season", None))
-    home_team_id = _to_int_or_none(getattr(fixture, "home_team_id", None))
-    away_team_id = _to_int_or_none(getattr(fixture, "away_team_id", None))
 
-    if fixture_id:
-        try:
-            fixture_payload = await get_fixture_by_id(
+async def _load_image_visual_context(session: AsyncSession, fixture: Any) -> tuple[ImageVisualContext, bool]:
+    """Fetch the card context; the flag is False when a lookup failed, so the
+    partial result is not cached."""
+    ctx = ImageVisualContext()
+    complete = True
+    to_int = _to_int_or_none
+    clean = _clean_text
+
+    fixture_id = to_int(getattr(fixture, "id", None))
+    league_id = to_int(getattr(fixture, "league_id", None))
+    season = to_int(getattr(fixture, "season", None)) or to_int(getattr(settings, "season", None))
+    home_team_id = to_int(getattr(fixture, "home_team_id", None))
+    away_team_id = to_int(getattr(fixture, "away_team_id", None))
+
+    want_fixture = bool(fixture_id)
+    want_standings = bool(league_id and season and home_team_id and away_team_id)
+    pending = []
+    if want_fixture:
+        pending.append(
+            get_fixture_by_id(
                 session,
                 int(fixture_id),
                 metric_league_id=int(league_id) if league_id is not None else None,
             )
+        )
+    if want_standings:
+        pending.append(_fetch_standings_payload(int(league_id), int(season)))
+    fetched = list(await asyncio.gather(*pending, return_exceptions=True))
+    fixture_payload = fetched.pop(0) if want_fixture else None
+    standings_payload = fetched.pop(0) if want_standings else None
+
+    if want_fixture:
+        try:
+            if isinstance(fixture_payload, BaseException):
+                raise fixture_payload
             response = fixture_payload.get("response") or []
             item = response[0] if isinstance(response, list) and response else {}
             fx = (item or {}).get("fixture") if isinstance(item, dict) else None
@@ -2730,67 +2913,66 @@ async def _fetch_image_visual_context(session: AsyncSession, fixture: Any) -> Im
             venue = (fx or {}).get("venue") if isinstance(fx, dict) else None
 
             if isinstance(lg, dict):
-                ctx.league_country = _clean_text(lg.get("country"))
-                ctx.league_round = _clean_text(lg.get("round"))
+                ctx.league_country = clean(lg.get("country"))
+                ctx.league_round = clean(lg.get("round"))
             if isinstance(venue, dict):
-                ctx.venue_name = _clean_text(venue.get("name"))
-                ctx.venue_city = _clean_text(venue.get("city"))
+                ctx.venue_name = clean(venue.get("name"))
+                ctx.venue_city = clean(venue.get("city"))
         except Exception:
+            complete = False
             log.exception("image_visual_fixture_context_failed fixture=%s", fixture_id)
 
-    if league_id and season and home_team_id and away_team_id:
+    if want_standings:
         try:
-            standings_payload = await get_standings(session, int(league_id), int(season))
-            home_row = _extract_standing_row(standings_payload, int(home_team_id))
-            away_row = _extract_standing_row(standings_payload, int(away_team_id))
+            if isinstance(standings_payload, BaseException):
+                raise standings_payload
+            standing_index = _build_standing_index(standings_payload)
+            home_row = standing_index.get(int(home_team_id))
+            away_row = standing_index.get(int(away_team_id))
 
             if isinstance(home_row, dict):
                 all_stats = home_row.get("all") or {}
-                ctx.home_rank = _to_int_or_none(home_row.get("rank"))
-                ctx.home_points = _to_int_or_none(home_row.get("points"))
-                ctx.home_goal_diff = _to_int_or_none(home_row.get("goalsDiff"))
-                ctx.home_form = _clean_text(home_row.get("form"))
+                ctx.home_rank = to_int(home_row.get("rank"))
+                ctx.home_points = to_int(home_row.get("points"))
+                ctx.home_goal_diff = to_int(home_row.get("goalsDiff"))
+                ctx.home_form = clean(home_row.get("form"))
                 if isinstance(all_stats, dict):
-                    ctx.home_played = _to_int_or_none(all_stats.get("played"))
+                    ctx.home_played = to_int(all_stats.get("played"))
 
             if isinstance(away_row, dict):
                 all_stats = away_row.get("all") or {}
-                ctx.away_rank = _to_int_or_none(away_row.get("rank"))
-                ctx.away_points = _to_int_or_none(away_row.get("points"))
-                ctx.away_goal_diff = _to_int_or_none(away_row.get("goalsDiff"))
-                ctx.away_form = _clean_text(away_row.get("form"))
+                ctx.away_rank = to_int(away_row.get("rank"))
+                ctx.away_points = to_int(away_row.get("points"))
+                ctx.away_goal_diff = to_int(away_row.get("goalsDiff"))
+                ctx.away_form = clean(away_row.get("form"))
                 if isinstance(all_stats, dict):
-                    ctx.away_played = _to_int_or_none(all_stats.get("played"))
+                    ctx.away_played = to_int(all_stats.get("played"))
         except Exception:
+            complete = False
             log.exception("image_visual_standings_context_failed fixture=%s league=%s", fixture_id, league_id)
 
-    return ctx
+    return ctx, complete
 
 
+@lru_cache(maxsize=512)
 def _translate_reason(reason: str, lang: str | None) -> str:
     pack = _lang_pack(lang)
     raw = (reason or "").strip()
     if not raw:
         return raw
-    if raw == "нет отчёта качества":
-        return pack["reason_no_report"]
-    if raw == "нет сводки качества":
-        return pack["reason_no_summary"]
-    if raw == "CLV coverage 0%":
-        return pack["reason_clv_zero"]
-    match = re.search(r"\(([^)]+)\)", raw)
-    if raw.startswith("малый объём"):
-        bets = match.group(1) if match else raw
-        return pack["reason_low_sample"].format(bets=bets)
-    if raw.startswith("CLV coverage низкий"):
-        pct = match.group(1) if match else raw
-        return pack["reason_clv_low"].format(pct=pct)
-    m_brier = re.search(r"Brier\s+([0-9.]+)", raw)
+    exact_key = _REASON_EXACT.get(raw)
+    if exact_key:
+        return pack[exact_key]
+    for prefix, pack_key, field in _REASON_PREFIX:
+        if raw.startswith(prefix):
+            match = _REASON_PAREN_RE.search(raw)
+            return _format_template(pack[pack_key], **{field: match.group(1) if match else raw})
+    m_brier = _REASON_BRIER_RE.search(raw)
     if m_brier:
-        return pack["reason_brier"].format(value=m_brier.group(1))
-    m_logloss = re.search(r"LogLoss\s+([0-9.]+)", raw)
+        return _format_template(pack["reason_brier"], value=m_brier.group(1))
+    m_logloss = _REASON_LOGLOSS_RE.search(raw)
     if m_logloss:
-        return pack["reason_logloss"].format(value=m_logloss.group(1))
+        return _format_template(pack["reason_logloss"], value=m_logloss.group(1))
     return raw
 
 
@@ -2798,80 +2980,72 @@ def _translate_reasons(reasons: list[str], lang: str | None) -> list[str]:
     return [_translate_reason(reason, lang) for reason in reasons or [] if reason]
 
 
-def _fmt_float(value: Any, digits: int = 2) -> str:
+def _fmt_float2(value: Any) -> str:
     if value is None:
         return "—"
     try:
-        return f"{float(value):.{digits}f}"
+        return f"{float(value):.2f}"
     except Exception:
         return "—"
 
 
-def _fmt_percent(value: Any, digits: int = 1) -> str:
+def _fmt_percent1(value: Any) -> str:
     if value is None:
         return "—"
     try:
-        return f"{float(value) * 100:.{digits}f}%"
+        return f"{float(value) * 100:.1f}%"
     except Exception:
         return "—"
 
 
-def _fmt_percent100(value: Any, digits: int = 1) -> str:
+def _fmt_percent100_1(value: Any) -> str:
     if value is None:
         return "—"
     try:
-        return f"{float(value):.{digits}f}%"
+        return f"{float(value):.1f}%"
     except Exception:
         return "—"
 
 
+@lru_cache(maxsize=256)
 def _plain_indicator_text(value: str | None) -> str:
     text = str(value or "").strip()
-    text = re.sub(r"^[^\wА-Яа-я0-9]+", "", text)
-    text = re.sub(r"\s{2,}", " ", text)
+    text = _INDICATOR_PREFIX_RE.sub("", text)
+    text = _WHITESPACE_RUN_RE.sub(" ", text)
     return text.strip()
 
 
 def _split_message(text: str, max_len: int = 3900) -> list[str]:
     if len(text) <= max_len:
         return [text]
+    return list(_split_long_message(text, max_len))
+
+
+@lru_cache(maxsize=256)
+def _split_long_message(text: str, max_len: int) -> tuple[str, ...]:
+    # Memoized: the preview and every retry/channel of a language split the same text.
     parts: list[str] = []
-    current = ""
-    paragraphs = text.split("\n\n")
-    for para in paragraphs:
-        chunk = para.strip("\n")
-        if not chunk:
-            continue
-        candidate = f"{current}\n\n{chunk}" if current else chunk
-        if len(candidate) <= max_len:
-            current = candidate
-            continue
-        if current:
-            parts.append(current)
-            current = ""
-        if len(chunk) <= max_len:
-            current = chunk
-            continue
-        lines = chunk.split("\n")
-        line_buf = ""
-        for line in lines:
-            cand = f"{line_buf}\n{line}" if line_buf else line
-            if len(cand) <= max_len:
-                line_buf = cand
-                continue
-            if line_buf:
-                parts.append(line_buf)
-                line_buf = ""
-            if len(line) <= max_len:
-                line_buf = line
-                continue
-            for i in range(0, len(line), max_len):
-                parts.append(line[i : i + max_len])
-        if line_buf:
-            current = line_buf
-    if current:
-        parts.append(current)
-    return [p for p in parts if p]
+    n = len(text)
+    pos = 0
+    while pos < n:
+        # Separators left over from the previous cut never start a part.
+        while pos < n and text[pos] == "\n":
+            pos += 1
+        if pos >= n:
+            break
+        end = pos + max_len
+        if end >= n:
+            parts.append(text[pos:].rstrip("\n"))
+            break
+        # Prefer a paragraph break, then a line break, then a hard cut.
+        cut = text.rfind("\n\n", pos, end)
+        if cut <= pos:
+            cut = text.rfind("\n", pos, end)
+            if cut <= pos:
+                cut = end
+        parts.append(text[pos:cut].rstrip("\n"))
+        pos = cut
+    return tuple(p for p in parts if p)
 
 
 _SELECTION_LABEL_MAP = {
@@ -2922,11 +3096,11 @@ def _selection_phrase(selection: str, market: str, home: str, away: str, lang: s
     pack = _lang_pack(lang)
     if market == "1X2":
         if selection == "HOME_WIN":
-            return pack["selection_home_win"].format(team=home)
+            return _format_template(pack["selection_home_win"], team=home)
         if selection == "DRAW":
             return pack["selection_draw"]
         if selection == "AWAY_WIN":
-            return pack["selection_away_win"].format(team=away)
+            return _format_template(pack["selection_away_win"], team=away)
     pack_key = _SELECTION_LABEL_MAP.get(selection)
     if pack_key and pack_key in pack:
         return pack[pack_key]
@@ -2963,7 +3137,7 @@ def _prediction_label(pack: dict[str, Any], tier: str, seed: str) -> str:
     if isinstance(variant_map, dict):
         variants = variant_map.get(tier)
         if isinstance(variants, list) and variants:
-            return _variant_from_list(variants, pack.get("hot_prediction", "HOT PREDICTION"), f"{seed}:title:{tier}")
+            return _variant_from_list(variants, pack.get("hot_prediction", "HOT PREDICTION"), seed, "title", tier)
     labels = pack.get("prediction_label") or {}
     if isinstance(labels, dict):
         label = labels.get(tier)
@@ -2972,20 +3146,55 @@ def _prediction_label(pack: dict[str, Any], tier: str, seed: str) -> str:
     return pack.get("hot_prediction", "HOT PREDICTION")
 
 
-def _variant_text(pack: dict[str, Any], key: str, default: str, seed: str) -> str:
+@lru_cache(maxsize=2048)
+def _compile_template(template: str) -> Callable[..., str]:
+    segments: list[tuple[str, str | None, str]] = []
+    for literal, field, spec, conversion in _TEMPLATE_FORMATTER.parse(template):
+        if field is not None and (conversion or not field.isidentifier() or "{" in (spec or "")):
+            return template.format
+        segments.append((literal, field, spec or ""))
+    fields = [seg for seg in segments if seg[1] is not None]
+    if not fields:
+        constant = "".join(literal for literal, _, _ in segments)
+        return lambda **_kwargs: constant
+    if len(fields) == 1 and segments[0][1] is not None and len(segments) <= 2:
+        prefix, name, spec = segments[0]
+        suffix = segments[1][0] if len(segments) == 2 else ""
+        return lambda **kwargs: prefix + format(kwargs[name], spec) + suffix
+    frozen = tuple(segments)
+
+    def _render(**kwargs: Any) -> str:
+        return "".join(
+            [literal if name is None else literal + format(kwargs[name], spec) for literal, name, spec in frozen]
+        )
+
+    return _render
+
+
+def _format_template(template: str, **kwargs: Any) -> str:
+    return _compile_template(template)(**kwargs)
+
+
+def _pick_variant(variants: list[str], *seed_parts: Any) -> str:
+    n = len(variants)
+    if n == 1:
+        return variants[0]
+    seed = "\x1f".join(str(part) for part in seed_parts).encode("utf-8", errors="ignore")
+    return variants[zlib.crc32(seed) % n]
+
+
+def _variant_text(pack: dict[str, Any], key: str, default: str, *seed_parts: Any) -> str:
     variants = pack.get(key)
     if isinstance(variants, list) and variants:
-        idx = int(hashlib.sha256(seed.encode("utf-8", errors="ignore")).hexdigest(), 16) % len(variants)
-        return variants[idx]
+        return _pick_variant(variants, *seed_parts)
     if isinstance(variants, str) and variants:
         return variants
     return default
 
 
-def _variant_from_list(variants: list[str] | None, default: str, seed: str) -> str:
+def _variant_from_list(variants: list[str] | None, default: str, *seed_parts: Any) -> str:
     if isinstance(variants, list) and variants:
-        idx = int(hashlib.sha256(seed.encode("utf-8", errors="ignore")).hexdigest(), 16) % len(variants)
-        return variants[idx]
+        return _pick_variant(variants, *seed_parts)
     return default
 
 
@@ -3029,7 +3238,7 @@ def _recommendation_line(
         pct = ev * 100
     except Exception:
         return pack["value_unknown"]
-    odd_val = _fmt_float(odd, 2)
+    odd_val = _fmt_float2(odd)
     kind = "neg"
     if pct >= _VALUE_STRONG_PCT:
         kind = "strong"
@@ -3041,8 +3250,8 @@ def _recommendation_line(
         kind = "edge"
     fallback = recommend.get(kind, pack["recommend"].get(kind, pack["value_unknown"]))
     variants = recommend_variants.get(kind) if isinstance(recommend_variants, dict) else None
-    template = _variant_from_list(variants, fallback, f"{seed}:recommend:{kind}")
-    return template.format(odd=odd_val)
+    template = _variant_from_list(variants, fallback, seed, "recommend", kind)
+    return _format_template(template, odd=odd_val)
 
 
 def _signal_line(signal: Any, lang: str | None, seed: str) -> str | None:
@@ -3053,7 +3262,7 @@ def _signal_line(signal: Any, lang: str | None, seed: str) -> str | None:
     except Exception:
         return None
     pack = _lang_pack(lang)
-    label = _variant_text(pack, "signal_variants", pack["signal"], f"{seed}:signal")
+    label = _variant_text(pack, "signal_variants", pack["signal"], seed, "signal")
     note = (
         pack["signal_notes"]["strong"]
         if pct >= _SIGNAL_STRONG_PCT
@@ -3070,80 +3279,72 @@ def _edge_line(edge: float | None, lang: str | None, seed: str) -> str | None:
     pct = edge * 100
     pack = _lang_pack(lang)
     if pct >= 5:
-        template = _variant_text(pack, "edge_strong_variants", pack["edge_strong"], f"{seed}:edge:strong")
-        return template.format(pct=pct)
+        template = _variant_text(pack, "edge_strong_variants", pack["edge_strong"], seed, "edge", "strong")
+        return _format_template(template, pct=pct)
     if pct >= 2:
-        template = _variant_text(pack, "edge_good_variants", pack["edge_good"], f"{seed}:edge:good")
-        return template.format(pct=pct)
+        template = _variant_text(pack, "edge_good_variants", pack["edge_good"], seed, "edge", "good")
+        return _format_template(template, pct=pct)
     if pct > 0:
-        template = _variant_text(pack, "edge_thin_variants", pack["edge_thin"], f"{seed}:edge:thin")
-        return template.format(pct=pct)
-    template = _variant_text(pack, "edge_none_variants", pack["edge_none"], f"{seed}:edge:none")
-    return template.format(pct=pct)
+        template = _variant_text(pack, "edge_thin_variants", pack["edge_thin"], seed, "edge", "thin")
+        return _format_template(template, pct=pct)
+    template = _variant_text(pack, "edge_none_variants", pack["edge_none"], seed, "edge", "none")
+    return _format_template(template, pct=pct)
+
+
+_COMMENT_KEYS: dict[str, tuple[tuple[str, str], ...]] = {
+    kind: tuple((key, f"{key}_variants") for key in keys)
+    for kind, keys in {
+        # (similar, slight_home, slight_away, strong_home, strong_away)
+        "attack": ("attack_similar", "attack_slight", "attack_slight", "attack_strong", "attack_strong"),
+        "defense": ("defense_similar", "defense_slight", "defense_slight", "defense_strong", "defense_strong"),
+        "venue": ("venue_even", "venue_slight_home", "venue_slight_away", "venue_strong_home", "venue_strong_away"),
+    }.items()
+}
 
 
-def _comment_attack(home_for: Any, away_for: Any, home: str, away: str, lang: str | None) -> str | None:
-    if home_for is None or away_for is None:
+def _comment_diff(
+    kind: str,
+    home_value: Any,
+    away_value: Any,
+    home: str,
+    away: str,
+    lang: str | None,
+    *,
+    flip: bool = False,
+) -> str | None:
+    if home_value is None or away_value is None:
         return None
     try:
-        diff = float(home_for) - float(away_for)
+        diff = float(home_value) - float(away_value)
     except Exception:
         return None
+    if flip:
+        diff = -diff
     pack = _lang_pack(lang)
-    seed_base = f"attack:{home}:{away}:{home_for}:{away_for}:{lang}"
-    if abs(diff) < _STAT_DIFF_MINOR:
-        return _variant_text(pack, "attack_similar_variants", pack["attack_similar"], seed_base)
-    if abs(diff) < _STAT_DIFF_MAJOR:
-        team = home if diff > 0 else away
-        text = _variant_text(pack, "attack_slight_variants", pack["attack_slight"], seed_base)
-        return text.format(team=team)
-    team = home if diff > 0 else away
-    text = _variant_text(pack, "attack_strong_variants", pack["attack_strong"], seed_base)
-    return text.format(team=team)
+    seed = (kind, home, away, home_value, away_value, lang)
+    similar, slight_home, slight_away, strong_home, strong_away = _COMMENT_KEYS[kind]
+    magnitude = abs(diff)
+    if magnitude < _STAT_DIFF_MINOR:
+        key, variants_key = similar
+        return _variant_text(pack, variants_key, pack[key], *seed)
+    if magnitude < _STAT_DIFF_MAJOR:
+        key, variants_key = slight_home if diff > 0 else slight_away
+    else:
+        key, variants_key = strong_home if diff > 0 else strong_away
+    text = _variant_text(pack, variants_key, pack[key], *seed)
+    return _format_template(text, team=home if diff > 0 else away)
+
+
+def _comment_attack(home_for: Any, away_for: Any, home: str, away: str, lang: str | None) -> str | None:
+    return _comment_diff("attack", home_for, away_for, home, away, lang)
 
 
 def _comment_defense(home_against: Any, away_against: Any, home: str, away: str, lang: str | None) -> str | None:
-    if home_against is None or away_against is None:
-        return None
-    try:
-        diff = float(away_against) - float(home_against)
-    except Exception:
-        return None
-    pack = _lang_pack(lang)
-    seed_base = f"defense:{home}:{away}:{home_against}:{away_against}:{lang}"
-    if abs(diff) < _STAT_DIFF_MINOR:
-        return _variant_text(pack, "defense_similar_variants", pack["defense_similar"], seed_base)
-    if abs(diff) < _STAT_DIFF_MAJOR:
-        team = home if diff > 0 else away
-        text = _variant_text(pack, "defense_slight_variants", pack["defense_slight"], seed_base)
-        return text.format(team=team)
-    team = home if diff > 0 else away
-    text = _variant_text(pack, "defense_strong_variants", pack["defense_strong"], seed_base)
-    return text.format(team=team)
+    return _comment_diff("defense", home_against, away_against, home, away, lang, flip=True)
 
 
 def _comment_venue(home_for: Any, away_for: Any, home: str, away: str, lang: str | None) -> str | None:
-    if home_for is None or away_for is None:
-        return None
-    try:
-        diff = float(home_for) - float(away_for)
-    except Exception:
-        return None
-    pack = _lang_pack(lang)
-    seed_base = f"venue:{home}:{away}:{home_for}:{away_for}:{lang}"
-    if abs(diff) < _STAT_DIFF_MINOR:
-        return _variant_text(pack, "venue_even_variants", pack["venue_even"], seed_base)
-    if abs(diff) < _STAT_DIFF_MAJOR:
-        if diff > 0:
-            text = _variant_text(pack, "venue_slight_home_variants", pack["venue_slight_home"], seed_base)
-            return text.format(team=home)
-        text = _variant_text(pack, "venue_slight_away_variants", pack["venue_slight_away"], seed_base)
-        return text.format(team=away)
-    if diff > 0:
-        text = _variant_text(pack, "venue_strong_home_variants", pack["venue_strong_home"], seed_base)
-        return text.format(team=home)
-    text = _variant_text(pack, "venue_strong_away_variants", pack["venue_strong_away"], seed_base)
-    return text.format(team=away)
+    return _comment_diff("venue", home_for, away_for, home, away, lang)
 
 
 def _comment_rest(home_rest: Any, away_rest: Any, home: str, away: str, lang: str | None) -> str | None:
@@ -3154,21 +3355,41 @@ def _comment_rest(home_rest: Any, away_rest: Any, home: str, away: str, lang: st
     except Exception:
         return None
     pack = _lang_pack(lang)
-    seed_base = f"rest:{home}:{away}:{home_rest}:{away_rest}:{lang}"
+    seed = ("rest", home, away, home_rest, away_rest, lang)
     if abs(diff) < 6:
-        return _variant_text(pack, "rest_even_variants", pack["rest_even"], seed_base)
+        return _variant_text(pack, "rest_even_variants", pack["rest_even"], *seed)
     if diff > 0:
-        text = _variant_text(pack, "rest_more_variants", pack["rest_more"], seed_base)
-        return text.format(team=home, a=int(home_rest), b=int(away_rest))
-    text = _variant_text(pack, "rest_more_variants", pack["rest_more"], seed_base)
-    return text.format(team=away, a=int(away_rest), b=int(home_rest))
+        text = _variant_text(pack, "rest_more_variants", pack["rest_more"], *seed)
+        return _format_template(text, team=home, a=int(home_rest), b=int(away_rest))
+    text = _variant_text(pack, "rest_more_variants", pack["rest_more"], *seed)
+    return _format_template(text, team=away, a=int(away_rest), b=int(home_rest))
 
 
 def _market_key(market: str) -> str:
     return "1x2" if market == "1X2" else "total"
 
 
+_QUALITY_CACHE_MAX_ENTRIES = 64
+_quality_cache: dict[tuple[str, str], tuple[int, tuple[str, ...]]] = {}
+
+
 def _quality_from_report(report: dict | None, market: str) -> tuple[int, list[str]]:
+    # The report is re-read from api_cache for every fixture but only changes when
+    # the quality job regenerates it, so results are memoized per generated_at.
+    version = report.get("generated_at") if isinstance(report, dict) else None
+    if not isinstance(version, str):
+        return _compute_quality(report, market)
+    cache_key = (version, _market_key(market))
+    cached = _quality_cache.get(cache_key)
+    if cached is None:
+        level, reasons = _compute_quality(report, market)
+        if len(_quality_cache) >= _QUALITY_CACHE_MAX_ENTRIES:
+            _quality_cache.clear()
+        cached = _quality_cache[cache_key] = (level, tuple(reasons))
+    return cached[0], list(cached[1])
+
+
+def _compute_quality(report: dict | None, market: str) -> tuple[int, list[str]]:
     if not report:
         return 1, ["нет отчёта качества"]
     key = _market_key(market)
@@ -3188,7 +3409,7 @@ def _quality_from_report(report: dict | None, market: str) -> tuple[int, list[st
         reasons.append("CLV coverage 0%")
         level = max(level, 1)
     elif 0 < clv_cov_pct < 30:
-        reasons.append(f"CLV coverage низкий ({_fmt_percent100(clv_cov_pct, 1)})")
+        reasons.append(f"CLV coverage низкий ({_fmt_percent100_1(clv_cov_pct)})")
         level = max(level, 1 if clv_cov_pct >= 10 else 2)
     if bets >= 100 and calibration:
         brier = float(calibration.get("brier") or 0.0)
@@ -3218,111 +3439,178 @@ def _calc_ev(prob: Decimal | None, odd: Decimal | None) -> float | None:
     if prob is None or odd is None:
         return None
     try:
+        # Decimal, not float: the result is compared against the tier thresholds,
+        # and float products land just below them (0.70 @ 1.60 -> 0.11999...).
         return float(Decimal(prob) * Decimal(odd) - Decimal(1))
     except Exception:
         return None
 
 
+_PRED_1X2_FIELDS = ("selection_code", "confidence", "initial_odd", "value_index", "signal_score")
+_PRED_TOTAL_FIELDS = ("selection", "confidence", "initial_odd", "value_index")
+_INDICES_FIELDS = (
+    "home_form_for",
+    "home_form_against",
+    "away_form_for",
+    "away_form_against",
+    "home_class_for",
+    "home_class_against",
+    "away_class_for",
+    "away_class_against",
+    "home_venue_for",
+    "home_venue_against",
+    "away_venue_for",
+    "away_venue_against",
+    "home_rest_hours",
+    "away_rest_hours",
+)
+
+
+def _lateral_columns(alias: str, prefix: str, fields: tuple[str, ...]) -> str:
+    return ",\n".join(f"  {alias}.{name} AS {prefix}{name}" for name in fields)
+
+
+_FIXTURE_DATA_SQL = text(f"""
+SELECT
+  f.id,
+  f.league_id,
+  f.season,
+  f.kickoff,
+  f.status,
+  f.home_team_id,
+  f.away_team_id,
+  l.name AS league_name,
+  l.logo_url AS league_logo_url,
+  th.name AS home_name,
+  th.logo_url AS home_logo_url,
+  ta.name AS away_name,
+  ta.logo_url AS away_logo_url,
+  p.fixture_id IS NOT NULL AS p1_found,
+{_lateral_columns("p", "p1_", _PRED_1X2_FIELDS)},
+  pt.fixture_id IS NOT NULL AS pt_found,
+{_lateral_columns("pt", "pt_", _PRED_TOTAL_FIELDS)},
+  mi.fixture_id IS NOT NULL AS mi_found,
+{_lateral_columns("mi", "mi_", _INDICES_FIELDS)},
+  d.payload AS decision_1x2_payload
+FROM fixtures f
+JOIN teams th ON th.id=f.home_team_id
+JOIN teams ta ON ta.id=f.away_team_id
+LEFT JOIN leagues l ON l.id=f.league_id
+LEFT JOIN LATERAL (
+  SELECT fixture_id, {", ".join(_PRED_1X2_FIELDS)}
+  FROM predictions
+  WHERE fixture_id=f.id
+  LIMIT 1
+) p ON TRUE
+LEFT JOIN LATERAL (
+  SELECT fixture_id, {", ".join(_PRED_TOTAL_FIELDS)}
+  FROM predictions_totals
+  WHERE fixture_id=f.id AND market='TOTAL'
+  LIMIT 1
+) pt ON TRUE
+LEFT JOIN LATERAL (
+  SELECT fixture_id, {", ".join(_INDICES_FIELDS)}
+  FROM match_indices
+  WHERE fixture_id=f.id
+  LIMIT 1
+) mi ON TRUE
+LEFT JOIN LATERAL (
+  SELECT payload
+  FROM prediction_decisions
+  WHERE fixture_id=f.id AND market='1X2'
+  ORDER BY updated_at DESC
+  LIMIT 1
+) d ON TRUE
+WHERE f.id=:fid
+""")
+
+_FIXTURE_FIELDS = (
+    "id",
+    "league_id",
+    "season",
+    "kickoff",
+    "status",
+    "home_team_id",
+    "away_team_id",
+    "league_name",
+    "league_logo_url",
+    "home_name",
+    "home_logo_url",
+    "away_name",
+    "away_logo_url",
+)
+
+
+def _row_group(row: Any, prefix: str, fields: tuple[str, ...]) -> SimpleNamespace | None:
+    if prefix and not row[f"{prefix}found"]:
+        return None
+    return SimpleNamespace(**{name: row[f"{prefix}{name}"] for name in fields})
+
+
 async def _fetch_fixture_data(session: AsyncSession, fixture_id: int) -> dict:
-    fixture_row = (
-        await session.execute(
-            text(
-                """
-                SELECT
-                  f.id,
-                  f.league_id,
-                  f.season,
-                  f.kickoff,
-                  f.status,
-                  f.home_team_id,
-                  f.away_team_id,
-                  l.name AS league_name,
-                  l.logo_url AS league_logo_url,
-                  th.name AS home_name,
-                  th.logo_url AS home_logo_url,
-                  ta.name AS away_name,
-                  ta.logo_url AS away_logo_url
-                FROM fixtures f
-                JOIN teams th ON th.id=f.home_team_id
-                JOIN teams ta ON ta.id=f.away_team_id
-                LEFT JOIN leagues l ON l.id=f.league_id
-                WHERE f.id=:fid
-                """
-            ),
-            {"fid": fixture_id},
-        )
-    ).first()
-    if not fixture_row:
+    # One round-trip: predictions, totals, indices and the latest 1X2 decision
+    # ride along as LATERAL subqueries instead of four follow-up SELECTs.
+    row = (await session.execute(_FIXTURE_DATA_SQL, {"fid": fixture_id})).mappings().first()
+    if not row:
         raise ValueError("fixture not found")
 
-    pred_row = (
-        await session.execute(
-            text(
-                """
-                SELECT selection_code, confidence, initial_odd, value_index, signal_score
-                FROM predictions
-                WHERE fixture_id=:fid
-                """
-            ),
-            {"fid": fixture_id},
-        )
-    ).first()
+    return {
+        "fixture": _row_group(row, "", _FIXTURE_FIELDS),
+        "pred_1x2": _row_group(row, "p1_", _PRED_1X2_FIELDS),
+        "pred_total": _row_group(row, "pt_", _PRED_TOTAL_FIELDS),
+        "indices": _row_group(row, "mi_", _INDICES_FIELDS),
+        "decision_1x2": row["decision_1x2_payload"],
+    }
 
-    totals_row = (
-        await session.execute(
-            text(
-                """
-                SELECT selection, confidence, initial_odd, value_index
-                FROM predictions_totals
-                WHERE fixture_id=:fid AND market='TOTAL'
-                """
-            ),
-            {"fid": fixture_id},
-        )
-    ).first()
 
-    indices_row = (
-        await session.execute(
-            text(
-                """
-                SELECT
-                  home_form_for, home_form_against,
-                  away_form_for, away_form_against,
-                  home_class_for, home_class_against,
-                  away_class_for, away_class_against,
-                  home_venue_for, home_venue_against,
-                  away_venue_for, away_venue_against,
-                  home_rest_hours, away_rest_hours
-                FROM match_indices
-                WHERE fixture_id=:fid
-                """
-            ),
-            {"fid": fixture_id},
-        )
-    ).first()
+class _MarketDerived(NamedTuple):
+    selection: str
+    odd: Any
+    prob: Any
+    signal: Any
+    implied: float | None
+    ev: float | None
+    edge: float | None
+    tier: str
 
-    decision_1x2_row = (
-        await session.execute(
-            text(
-                """
-                SELECT payload
-                FROM prediction_decisions
-                WHERE fixture_id=:fid AND market='1X2'
-                ORDER BY updated_at DESC
-                LIMIT 1
-                """
-            ),
-            {"fid": fixture_id},
-        )
-    ).first()
 
-    return {
-        "fixture": fixture_row,
-        "pred_1x2": pred_row,
-        "pred_total": totals_row,
-        "indices": indices_row,
-        "decision_1x2": getattr(decision_1x2_row, "payload", None) if decision_1x2_row else None,
-    }
+def _derive_market(pred: Any, experimental: bool) -> _MarketDerived:
+    odd = getattr(pred, "initial_odd", None)
+    prob = getattr(pred, "confidence", None)
+    signal = getattr(pred, "signal_score", None)
+    ev = _calc_ev(prob, odd)
+    implied = _calc_implied_prob(odd)
+    edge = (float(prob) - implied) if prob is not None and implied is not None else None
+    tier = _prediction_tier(ev, signal, experimental)
+    return _MarketDerived(_extract_selection(pred), odd, prob, signal, implied, ev, edge, tier)
+
+
+class _MarketTitles(NamedTuple):
+    why: str
+    value: str
+    risks: str
+    recommendation: str
+    value_profile: str
+    no_risks: str
+    line_watch: str
+
+
+@lru_cache(maxsize=4096)
+def _resolve_titles(lang: str | None, seed_base: str) -> _MarketTitles:
+    pack = _lang_pack(lang)
+    return _MarketTitles(
+        why=_variant_text(pack, "why_variants", pack["why"], seed_base, "why"),
+        value=_variant_text(pack, "value_variants", pack["value_indicators"], seed_base, "value"),
+        risks=_variant_text(pack, "risks_variants", pack["risks"], seed_base, "risks"),
+        recommendation=_variant_text(
+            pack, "recommendation_variants", pack["recommendation"], seed_base, "rec"
+        ),
+        value_profile=_variant_text(
+            pack, "value_profile_variants", pack["value_profile"], seed_base, "value_profile"
+        ),
+        no_risks=_variant_text(pack, "no_risks_variants", pack["no_risks"], seed_base, "no_risks"),
+        line_watch=_variant_text(pack, "line_watch_variants", pack["line_watch"], seed_base, "line_watch"),
+    )
 
 
 def _build_market_text(
@@ -3333,39 +3621,35 @@ def _build_market_text(
     experimental: bool,
     reasons: list[str],
     lang: str | None,
+    *,
+    derived: _MarketDerived | None = None,
 ) -> tuple[str, str]:
     pack = _lang_pack(lang)
-    league_name = str(getattr(fixture, "league_name", "") or "")
-    home_name = str(getattr(fixture, "home_name", "") or "")
-    away_name = str(getattr(fixture, "away_name", "") or "")
-    league_tag = _protect(league_name)
-    home_tag = _protect(home_name)
-    away_tag = _protect(away_name)
-    kickoff = getattr(fixture, "kickoff", None)
-    kickoff_str = _format_kickoff(kickoff, lang)
-
-    selection = _extract_selection(pred)
+    fixture_id = getattr(fixture, "id", "")
+    league_tag = _protect(str(getattr(fixture, "league_name", "") or ""))
+    home_tag = _protect(str(getattr(fixture, "home_name", "") or ""))
+    away_tag = _protect(str(getattr(fixture, "away_name", "") or ""))
+    kickoff_str = _format_kickoff(getattr(fixture, "kickoff", None), lang)
+    hff, hfa, aff, afa, hcf, hca, acf, aca, hvf, hva, avf, ava, hrh, arh = (
+        getattr(indices, name, None) for name in _INDICES_FIELDS
+    )
+
+    if derived is None:
+        derived = _derive_market(pred, experimental)
+    selection, odd, prob, signal, implied, ev, edge, tier = derived
     selection_label = _protect(_selection_label(selection, market, lang))
     selection_phrase = _selection_phrase(selection, market, home_tag, away_tag, lang) or selection_label
-    odd = getattr(pred, "initial_odd", None)
-    prob = getattr(pred, "confidence", None)
-    ev = _calc_ev(prob, odd)
-    implied = _calc_implied_prob(odd)
-    edge = (float(prob) - implied) if prob is not None and implied is not None else None
-    signal = getattr(pred, "signal_score", None)
 
     experimental_tag = "⚠️ EXPERIMENTAL" if experimental else ""
-    tier = _prediction_tier(ev, signal, experimental)
-    seed_base = f"{getattr(fixture, 'id', '')}:{market}:{tier}:{lang}"
+    seed_base = f"{fixture_id}:{market}:{tier}:{lang}"
     title_label = _prediction_label(pack, tier, seed_base)
     bet_label = _bet_label(pack, tier)
-    why_title = _variant_text(pack, "why_variants", pack["why"], f"{seed_base}:why")
-    value_title = _variant_text(pack, "value_variants", pack["value_indicators"], f"{seed_base}:value")
-    risks_title = _variant_text(pack, "risks_variants", pack["risks"], f"{seed_base}:risks")
-    recommendation_title = _variant_text(pack, "recommendation_variants", pack["recommendation"], f"{seed_base}:rec")
-    value_profile_label = _variant_text(
-        pack, "value_profile_variants", pack["value_profile"], f"{seed_base}:value_profile"
-    )
+    titles = _resolve_titles(lang, seed_base)
+    why_title = titles.why
+    value_title = titles.value
+    risks_title = titles.risks
+    recommendation_title = titles.recommendation
+    value_profile_label = titles.value_profile
 
     headline_lines = [
         f"<b>{title_label}</b>",
@@ -3375,29 +3659,23 @@ def _build_market_text(
         "",
         f"<b>{bet_label}</b>",
         f"{selection_phrase}",
-        f"@ {_protect(_fmt_float(odd, 2))}",
-        f"🎯 {pack['model_probability']}: {_fmt_percent(prob, 1)} | Value: {_fmt_value(ev)} {experimental_tag}".strip(),
+        f"@ {_protect(_fmt_float2(odd))}",
+        f"🎯 {pack['model_probability']}: {_fmt_percent1(prob)} | Value: {_fmt_value(ev)} {experimental_tag}".strip(),
     ]
-    headline = "\n".join(line for line in headline_lines if line is not None)
+    headline = "\n".join(headline_lines)
 
-    model_line = f"{pack['our_model']}: {_fmt_percent(prob, 1)}"
+    model_line = f"{pack['our_model']}: {_fmt_percent1(prob)}"
     if edge is not None:
         model_line = f"{model_line} ({edge * 100:+.1f}% {pack['edge_short']})"
 
-    def _fmt_stats(team: str, value_for: Any, value_against: Any) -> str:
-        return (
-            f"{team}: {_fmt_float(value_for, 2)} {pack['for']} / "
-            f"{_fmt_float(value_against, 2)} {pack['against']}"
-        )
+    stats_tail = f" {pack['for']} / "
+    stats_end = f" {pack['against']}"
 
-    def _fmt_venue(team: str, label: str, value_for: Any, value_against: Any) -> str:
-        return (
-            f"{team} {label}: {_fmt_float(value_for, 2)} {pack['for']} / "
-            f"{_fmt_float(value_against, 2)} {pack['against']}"
-        )
+    def _fmt_stats(team: str, value_for: Any, value_against: Any) -> str:
+        return f"{team}: {_fmt_float2(value_for)}{stats_tail}{_fmt_float2(value_against)}{stats_end}"
 
     translated_reasons = _translate_reasons(reasons, lang)
-    risk_line = _variant_text(pack, "no_risks_variants", pack["no_risks"], f"{seed_base}:no_risks")
+    risk_line = titles.no_risks
     if experimental:
         if translated_reasons:
             risk_line = pack["experimental_prefix"] + "; ".join(translated_reasons)
@@ -3405,109 +3683,194 @@ def _build_market_text(
             risk_line = pack["experimental_prefix"].strip()
 
     compact = tier in {"cautious", "experimental"}
-    if compact:
-        analysis_lines = [
-            value_title,
-            f"{pack['bookmakers_give']}: {_fmt_percent(implied, 1)}",
-            model_line,
-            _edge_line(edge, lang, seed_base),
-            _signal_line(signal, lang, seed_base),
-            "",
-            risks_title,
-            risk_line,
-            "",
-            recommendation_title,
-            f"{value_profile_label}: {_value_strength(ev, lang)}",
-            _recommendation_line(ev, odd, lang, tier, seed_base),
-        ]
-    else:
-        analysis_lines = [
+    lines: list[str] = []
+    add = lines.append
+    if not compact:
+        lines += (
             f"<b>{why_title}</b>",
             pack["current_form"],
-            _fmt_stats(home_tag, getattr(indices, "home_form_for", None), getattr(indices, "home_form_against", None)),
-            _fmt_stats(away_tag, getattr(indices, "away_form_for", None), getattr(indices, "away_form_against", None)),
-            _comment_defense(
-                getattr(indices, "home_form_against", None),
-                getattr(indices, "away_form_against", None),
-                home_tag,
-                away_tag,
-                lang,
-            ),
-            "",
-            pack["team_class"],
-            _fmt_stats(home_tag, getattr(indices, "home_class_for", None), getattr(indices, "home_class_against", None)),
-            _fmt_stats(away_tag, getattr(indices, "away_class_for", None), getattr(indices, "away_class_against", None)),
-            _comment_attack(
-                getattr(indices, "home_class_for", None),
-                getattr(indices, "away_class_for", None),
-                home_tag,
-                away_tag,
-                lang,
-            ),
+            _fmt_stats(home_tag, hff, hfa),
+            _fmt_stats(away_tag, aff, afa),
+        )
+        comment = _comment_defense(hfa, afa, home_tag, away_tag, lang)
+        if comment is not None:
+            add(comment)
+        lines += ("", pack["team_class"], _fmt_stats(home_tag, hcf, hca), _fmt_stats(away_tag, acf, aca))
+        comment = _comment_attack(hcf, acf, home_tag, away_tag, lang)
+        if comment is not None:
+            add(comment)
+        lines += (
             "",
             pack["home_away_stats"],
-            _fmt_venue(
-                home_tag,
-                pack["home"],
-                getattr(indices, "home_venue_for", None),
-                getattr(indices, "home_venue_against", None),
-            ),
-            _fmt_venue(
-                away_tag,
-                pack["away"],
-                getattr(indices, "away_venue_for", None),
-                getattr(indices, "away_venue_against", None),
-            ),
-            _comment_venue(
-                getattr(indices, "home_venue_for", None),
-                getattr(indices, "away_venue_for", None),
-                home_tag,
-                away_tag,
-                lang,
-            ),
-            "",
-            pack["fatigue_factor"],
-            _comment_rest(
-                getattr(indices, "home_rest_hours", None),
-                getattr(indices, "away_rest_hours", None),
-                home_tag,
-                away_tag,
-                lang,
-            ),
-            "",
-            value_title,
-            f"{pack['bookmakers_give']}: {_fmt_percent(implied, 1)}",
-            model_line,
-            _edge_line(edge, lang, seed_base),
-            _signal_line(signal, lang, seed_base),
-            "",
-            risks_title,
-            risk_line,
-            "",
-            recommendation_title,
-            f"{value_profile_label}: {_value_strength(ev, lang)}",
-            _recommendation_line(ev, odd, lang, tier, seed_base),
-        ]
+            _fmt_stats(f"{home_tag} {pack['home']}", hvf, hva),
+            _fmt_stats(f"{away_tag} {pack['away']}", avf, ava),
+        )
+        comment = _comment_venue(hvf, avf, home_tag, away_tag, lang)
+        if comment is not None:
+            add(comment)
+        lines += ("", pack["fatigue_factor"])
+        comment = _comment_rest(hrh, arh, home_tag, away_tag, lang)
+        if comment is not None:
+            add(comment)
+        add("")
+    lines += (value_title, f"{pack['bookmakers_give']}: {_fmt_percent1(implied)}", model_line)
+    edge_line = _edge_line(edge, lang, seed_base)
+    if edge_line is not None:
+        add(edge_line)
+    signal_line = _signal_line(signal, lang, seed_base)
+    if signal_line is not None:
+        add(signal_line)
+    lines += (
+        "",
+        risks_title,
+        risk_line,
+        "",
+        recommendation_title,
+        f"{value_profile_label}: {_value_strength(ev, lang)}",
+    )
+    recommendation = _recommendation_line(ev, odd, lang, tier, seed_base)
+    if recommendation is not None:
+        add(recommendation)
     if not compact and prob is not None:
         try:
             fair_odd = 1 / float(prob) if float(prob) > 0 else None
         except Exception:
             fair_odd = None
         if fair_odd:
-            line_watch = _variant_text(pack, "line_watch_variants", pack["line_watch"], f"{seed_base}:line_watch")
-            analysis_lines.append(line_watch.format(odd=f"{fair_odd:.2f}"))
-    analysis_lines.extend(["", pack["disclaimer"]])
-    analysis = "\n".join(line for line in analysis_lines if line is not None)
+            add(_format_template(titles.line_watch, odd=f"{fair_odd:.2f}"))
+    lines += ("", pack["disclaimer"])
+    analysis = "\n".join(lines)
     return headline, analysis
 
 
+_PREVIEW_LANG = "ru"
+
+
+# The HTML renderer drives a sync Playwright browser, which is bound to the thread
+# that launched it, so renders get one dedicated worker instead of the shared pool.
+_IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="headline-img")
+
+
+async def _run_image_job(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_IMAGE_EXECUTOR, partial(func, *args, **kwargs))
+
+
+def _encode_data_url(image_bytes: bytes, mime: str) -> str:
+    return f"data:{mime};base64,{base64.b64encode(image_bytes).decode('ascii')}"
+
+
+_RENDER_CACHE_MAX_ENTRIES = 32
+
+# Only touched from the single _IMAGE_EXECUTOR worker, which serializes access.
+_render_cache: OrderedDict[tuple[Any, str], bytes] = OrderedDict()
+
+
+def _render_cache_key(image_text: str, kwargs: dict[str, Any]) -> str:
+    digest = hashlib.blake2b(image_text.encode("utf-8"), digest_size=16)
+    for name in sorted(kwargs):
+        value = kwargs[name]
+        digest.update(b"\0" + name.encode("ascii") + b"=")
+        if isinstance(value, bytes):
+            digest.update(struct.pack(">Q", len(value)))
+            digest.update(value)
+        else:
+            digest.update(repr(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _render_headline_png(image_text: str, **kwargs: Any) -> tuple[str, bytes]:
+    """Render a headline card, reusing the PNG when the same inputs were drawn recently.
+
+    Returns ``(cache_key, png_bytes)``; the key also lets Telegram re-send an
+    already uploaded photo by file_id.
+    """
+    key = _render_cache_key(image_text, kwargs)
+    renderer = render_headline_image_html
+    cached = _render_cache.get((renderer, key))
+    if cached is not None:
+        _render_cache.move_to_end((renderer, key))
+        return key, cached
+    image_bytes = renderer(image_text, **kwargs)
+    _render_cache[(renderer, key)] = image_bytes
+    while len(_render_cache) > _RENDER_CACHE_MAX_ENTRIES:
+        _render_cache.popitem(last=False)
+    return key, image_bytes
+
+
+def _render_headline_data_url(image_text: str, **kwargs: Any) -> str:
+    # Runs in a worker thread: render and base64 both stay off the event loop.
+    return _encode_data_url(_render_headline_png(image_text, **kwargs)[1], "image/png")
+
+
+_PREVIEW_CACHE_TTL_SECONDS = 300
+_PREVIEW_CACHE_MAX_ENTRIES = 256
+
+# Entries are frozen: MarketPreview is a frozen dataclass only read through asdict()
+# (a deep copy) and _MarketDerived is a NamedTuple, held in a read-only mapping.
+_preview_cache: dict[
+    tuple, tuple[tuple[MarketPreview, ...], MappingProxyType[str, _MarketDerived], float]
+] = {}
+
+
+def _preview_settings_key() -> tuple:
+    # Settings the cached market texts depend on (AI enrichment on/off and its model),
+    # plus the publish mode so a mode switch never serves a preview built under the old one.
+    return (
+        bool(settings.groq_enabled),
+        bool(settings.groq_api_key),
+        settings.groq_model,
+        (settings.publish_mode or "manual").strip().lower(),
+    )
+
+
+def _preview_fingerprint(data: dict) -> bytes:
+    # Every input the market texts are built from; any change in the fetched row
+    # (new odds, a rebuilt prediction, fresh indices) yields a different key.
+    parts = (data["fixture"], data["pred_1x2"], data["pred_total"], data["indices"], data["decision_1x2"])
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).digest()
+
+
 async def _build_preview_internal(session: AsyncSession, fixture_id: int) -> tuple[dict, dict]:
     data = await _fetch_fixture_data(session, fixture_id)
+    cached_report = await quality_report.get_cached(session)
+    mode = (settings.publish_mode or "manual").strip().lower()
+    cache_key = (
+        int(fixture_id),
+        _preview_fingerprint(data),
+        (cached_report or {}).get("generated_at"),
+        _preview_settings_key(),
+    )
+    now = time.monotonic()
+    cached = _preview_cache.get(cache_key)
+    if cached is not None and cached[2] > now:
+        markets, derived_by_market, _ = cached
+    else:
+        built_markets, built_derived = await _build_preview_markets(session, data, cached_report)
+        markets, derived_by_market = tuple(built_markets), MappingProxyType(built_derived)
+        if len(_preview_cache) >= _PREVIEW_CACHE_MAX_ENTRIES:
+            _preview_cache.clear()
+        _preview_cache[cache_key] = (markets, derived_by_market, now + _PREVIEW_CACHE_TTL_SECONDS)
+
+    # Odds/EV/tier per market, reused by build_post_preview and publish_fixture.
+    data["derived"] = dict(derived_by_market)
+    preview = {
+        "fixture_id": int(fixture_id),
+        "mode": mode,
+        "markets": [asdict(m) for m in markets],
+    }
+    return preview, data
+
+
+async def _build_preview_markets(
+    session: AsyncSession,
+    data: dict,
+    cached_report: dict | None,
+) -> tuple[list[MarketPreview], dict[str, _MarketDerived]]:
     fixture = data["fixture"]
     indices = data["indices"]
-
-    cached_report = await quality_report.get_cached(session)
     markets: list[MarketPreview] = []
+    derived_by_market: dict[str, _MarketDerived] = {}
 
     for market, pred in (("1X2", data["pred_1x2"]), ("TOTAL", data["pred_total"])):
         if not pred:
@@ -3541,6 +3904,7 @@ async def _build_preview_internal(session: AsyncSession, fixture_id: int) -> tup
             continue
         level, reasons = _quality_from_report(cached_report, market)
         experimental = level > 0
+        derived = derived_by_market[market] = _derive_market(pred, experimental)
         headline_raw, analysis_raw = _build_market_text(
             fixture,
             pred,
@@ -3548,7 +3912,8 @@ async def _build_preview_internal(session: AsyncSession, fixture_id: int) -> tup
             market,
             experimental,
             reasons,
-            "ru",
+            _PREVIEW_LANG,
+            derived=derived,
         )
         if settings.groq_enabled:
             analysis_raw = await enrich_analysis(
@@ -3566,13 +3931,7 @@ async def _build_preview_internal(session: AsyncSession, fixture_id: int) -> tup
                 reasons=reasons,
             )
         )
-
-    preview = {
-        "fixture_id": int(fixture_id),
-        "mode": (settings.publish_mode or "manual").strip().lower(),
-        "markets": [m.__dict__ for m in markets],
-    }
-    return preview, data
+    return markets, derived_by_market
 
 
 async def build_preview(session: AsyncSession, fixture_id: int) -> dict:
@@ -3594,32 +3953,123 @@ def _preview_language(lang: str | None) -> str:
     return "ru"
 
 
+class _ImagePackLabels(NamedTuple):
+    bookmakers: str
+    model: str
+    edge_suffix: str
+
+
+@lru_cache(maxsize=16)
+def _image_labels(lang: str) -> _ImagePackLabels:
+    pack = _lang_pack(lang)
+    return _ImagePackLabels(
+        bookmakers=_plain_indicator_text(pack.get("bookmakers_give", "Bookmakers give")) or "Bookmakers give",
+        model=_plain_indicator_text(pack.get("our_model", "Our model")) or "Our model",
+        edge_suffix=_plain_indicator_text(pack.get("edge_short", "edge")) or "edge",
+    )
+
+
+@lru_cache(maxsize=128)
+def _tier_bet_label(lang: str, tier: str) -> str:
+    return _bet_label(_lang_pack(lang), tier)
+
+
+@lru_cache(maxsize=1024)
+def _indicator_title(lang: str, fixture_id: int, market: str) -> str:
+    pack = _lang_pack(lang)
+    return _plain_indicator_text(
+        _variant_text(
+            pack,
+            "value_variants",
+            pack.get("value_indicators", "VALUE INDICATORS"),
+            fixture_id, market, lang, "signal_title",
+        )
+    ) or "VALUE INDICATORS"
+
+
+# Keyed on the exact values: bucketing them first would double-round at .x5 boundaries
+# and change the printed percentages.
+@lru_cache(maxsize=1024)
+def _indicator_lines(
+    lang: str,
+    implied_prob: float | None,
+    prob: Any,
+    model_edge: float | None,
+) -> tuple[str, str]:
+    labels = _image_labels(lang)
+    line_1 = f"{labels.bookmakers}: {_fmt_percent1(implied_prob)}"
+    line_2 = f"{labels.model}: {_fmt_percent1(prob)}"
+    if model_edge is not None:
+        line_2 = f"{line_2} ({model_edge * 100:+.1f}% {labels.edge_suffix})"
+    return line_1, line_2
+
+
+def _empty_post(
+    market: str,
+    lang: str,
+    status: str,
+    reason: str,
+    experimental: bool,
+    quality_level: int,
+    reasons: list[str],
+) -> dict[str, Any]:
+    return {
+        "market": market,
+        "lang": lang,
+        "status": status,
+        "reason": reason,
+        "publish_allowed": False,
+        "experimental": experimental,
+        "quality_level": quality_level,
+        "reasons": reasons,
+        "headline": "",
+        "analysis": "",
+        "headline_parts": [],
+        "analysis_parts": [],
+        "uses_image": False,
+        "image_data_url": None,
+        "image_fallback_reason": None,
+        "render_time_ms": None,
+        "messages": [],
+    }
+
+
 async def build_post_preview(
     session: AsyncSession,
     fixture_id: int,
     *,
     image_theme: str | None = None,
     lang: str | None = None,
+    include_blocked_bodies: bool | None = None,
 ) -> dict:
+    generated_at = datetime.now(timezone.utc).isoformat()
     preview, data = await _build_preview_internal(session, fixture_id)
     image_theme_norm = _normalize_image_theme(image_theme)
     mode = preview.get("mode") or "manual"
+    if include_blocked_bodies is None:
+        # Auto mode never publishes blocked markets, so skip rendering them unless asked.
+        include_blocked_bodies = mode != "auto"
     lang_key = _preview_language(lang)
+    local_lang = lang_key if lang_key in _LANG_TEXT else "ru"
 
     fixture = data["fixture"]
     indices = data["indices"]
     home_win_prob, draw_prob, away_win_prob = _extract_1x2_chances(data.get("decision_1x2"))
     pred_by_market = {"1X2": data.get("pred_1x2"), "TOTAL": data.get("pred_total")}
+    derived_by_market = data.get("derived") or {}
 
     home_logo_bytes: bytes | None = None
     away_logo_bytes: bytes | None = None
     league_logo_bytes: bytes | None = None
     image_visual_context = ImageVisualContext()
     if settings.publish_headline_image:
-        home_logo_bytes = await _fetch_logo_bytes(getattr(fixture, "home_logo_url", None))
-        away_logo_bytes = await _fetch_logo_bytes(getattr(fixture, "away_logo_url", None))
-        league_logo_bytes = await _fetch_logo_bytes(getattr(fixture, "league_logo_url", None))
-        image_visual_context = await _fetch_image_visual_context(session, fixture)
+        # Logos never touch the session, so only the visual context uses it here.
+        home_logo_bytes, away_logo_bytes, league_logo_bytes, image_visual_context = await asyncio.gather(
+            _fetch_logo_bytes(getattr(fixture, "home_logo_url", None)),
+            _fetch_logo_bytes(getattr(fixture, "away_logo_url", None)),
+            _fetch_logo_bytes(getattr(fixture, "league_logo_url", None)),
+            _fetch_image_visual_context(session, fixture),
+        )
 
     posts: list[dict[str, Any]] = []
     for market in preview.get("markets", []):
@@ -3632,79 +4082,33 @@ async def build_post_preview(
 
         if not headline_raw_preview or not analysis_raw_preview:
             posts.append(
-                {
-                    "market": market_name,
-                    "lang": lang_key,
-                    "status": "unavailable",
-                    "reason": "no_data",
-                    "publish_allowed": False,
-                    "experimental": experimental,
-                    "quality_level": quality_level,
-                    "reasons": reasons,
-                    "headline": "",
-                    "analysis": "",
-                    "headline_parts": [],
-                    "analysis_parts": [],
-                    "uses_image": False,
-                    "image_data_url": None,
-                    "image_fallback_reason": None,
-                    "render_time_ms": None,
-                    "messages": [],
-                }
+                _empty_post(market_name, lang_key, "unavailable", "no_data", experimental, quality_level, reasons)
             )
             continue
 
         pred = pred_by_market.get(market_name)
         if not pred:
             posts.append(
-                {
-                    "market": market_name,
-                    "lang": lang_key,
-                    "status": "unavailable",
-                    "reason": "no_pred",
-                    "publish_allowed": False,
-                    "experimental": experimental,
-                    "quality_level": quality_level,
-                    "reasons": reasons,
-                    "headline": "",
-                    "analysis": "",
-                    "headline_parts": [],
-                    "analysis_parts": [],
-                    "uses_image": False,
-                    "image_data_url": None,
-                    "image_fallback_reason": None,
-                    "render_time_ms": None,
-                    "messages": [],
-                }
+                _empty_post(market_name, lang_key, "unavailable", "no_pred", experimental, quality_level, reasons)
             )
             continue
 
-        odd = getattr(pred, "initial_odd", None)
-        prob = getattr(pred, "confidence", None)
-        signal = getattr(pred, "signal_score", None)
-        implied_prob = _calc_implied_prob(odd)
-        model_edge = (float(prob) - implied_prob) if prob is not None and implied_prob is not None else None
-        ev = _calc_ev(prob, odd)
-        tier = _prediction_tier(ev, signal, experimental)
-
-        local_lang = lang_key if lang_key in _LANG_TEXT else "ru"
-        pack = _lang_pack(local_lang)
-        bet_label = _bet_label(pack, tier)
-        indicator_title = _plain_indicator_text(
-            _variant_text(
-                pack,
-                "value_variants",
-                pack.get("value_indicators", "VALUE INDICATORS"),
-                f"{fixture_id}:{market_name}:{local_lang}:signal_title",
+        publish_allowed = not (mode == "auto" and quality_level >= 2)
+        if not publish_allowed and not include_blocked_bodies:
+            posts.append(
+                _empty_post(market_name, lang_key, "blocked", "quality_risk", experimental, quality_level, reasons)
             )
-        ) or "VALUE INDICATORS"
-        bookmakers_label = _plain_indicator_text(pack.get("bookmakers_give", "Bookmakers give")) or "Bookmakers give"
-        model_label = _plain_indicator_text(pack.get("our_model", "Our model")) or "Our model"
-        edge_suffix = _plain_indicator_text(pack.get("edge_short", "edge")) or "edge"
-        indicator_line_1 = f"{bookmakers_label}: {_fmt_percent(implied_prob, 1)}"
-        indicator_line_2 = f"{model_label}: {_fmt_percent(prob, 1)}"
-        if model_edge is not None:
-            indicator_line_2 = f"{indicator_line_2} ({model_edge * 100:+.1f}% {edge_suffix})"
+            continue
+
+        derived = derived_by_market.get(market_name) or _derive_market(pred, experimental)
+        prob = derived.prob
+        implied_prob = derived.implied
+        model_edge = derived.edge
+        tier = derived.tier
+
+        bet_label = _tier_bet_label(local_lang, tier)
+        indicator_title = _indicator_title(local_lang, fixture_id, market_name)
+        indicator_line_1, indicator_line_2 = _indicator_lines(local_lang, implied_prob, prob, model_edge)
         indicator_line_3 = None
 
         use_deepl = bool(
@@ -3713,19 +4117,26 @@ async def build_post_preview(
             and lang_key not in _LANG_TEXT
             and lang_key != "ru"
         )
-        headline_raw, analysis_raw = _build_market_text(
-            fixture,
-            pred,
-            indices,
-            market_name,
-            experimental,
-            reasons,
-            local_lang,
-        )
-        # AI enrichment (Russian source text only)
-        if settings.groq_enabled and local_lang == "ru":
-            analysis_raw = await enrich_analysis(
-                session, analysis_raw, fixture, pred, indices, market_name,
+        headline: str | None = None
+        analysis: str | None = None
+        if local_lang == _PREVIEW_LANG:
+            # _build_preview_internal already rendered (and enriched) this text.
+            headline_raw = str(market.get("headline_raw") or "")
+            analysis_raw = str(market.get("analysis_raw") or "")
+            if lang_key == local_lang:
+                # No translation follows, so its tag-stripped copies are final too.
+                headline = market.get("headline")
+                analysis = market.get("analysis")
+        else:
+            headline_raw, analysis_raw = _build_market_text(
+                fixture,
+                pred,
+                indices,
+                market_name,
+                experimental,
+                reasons,
+                local_lang,
+                derived=derived,
             )
 
         # Translation: Groq (if enabled) or DeepL (fallback)
@@ -3742,11 +4153,12 @@ async def build_post_preview(
             headline_raw = _restore_translated_html(headline_raw)
             analysis_raw = _restore_translated_html(analysis_raw)
 
-        headline = _strip_protect_tags(headline_raw)
-        analysis = _strip_protect_tags(analysis_raw)
-        if use_deepl and not settings.groq_enabled:
-            headline = _normalize_translated_text(headline, protected)
-            analysis = _normalize_translated_text(analysis, protected)
+        if headline is None or analysis is None:
+            headline = _strip_protect_tags(headline_raw)
+            analysis = _strip_protect_tags(analysis_raw)
+            if use_deepl and not settings.groq_enabled:
+                headline = _normalize_translated_text(headline, protected)
+                analysis = _normalize_translated_text(analysis, protected)
 
         headline_parts = _split_message(headline)
         analysis_parts = _split_message(analysis)
@@ -3807,9 +4219,8 @@ async def build_post_preview(
                         indicator_lines=[indicator_line_1, indicator_line_2, indicator_line_3],
                     )
                     image_bytes = await _card_gen_v2_render(v2_card)
+                    image_data_url = await asyncio.to_thread(_encode_data_url, image_bytes, "image/jpeg")
                     render_time_ms = int((time.perf_counter() - render_started) * 1000)
-                    encoded = base64.b64encode(image_bytes).decode("ascii")
-                    image_data_url = f"data:image/jpeg;base64,{encoded}"
                     uses_image = True
                 except Exception:
                     render_time_ms = int((time.perf_counter() - render_started) * 1000)
@@ -3823,14 +4234,12 @@ async def build_post_preview(
             elif render_headline_image_html is not None:
                 render_started = time.perf_counter()
                 try:
-                    image_bytes = await asyncio.to_thread(
-                        render_headline_image_html,
+                    image_data_url = await _run_image_job(
+                        _render_headline_data_url,
                         image_text,
                         **html_image_kwargs,
                     )
                     render_time_ms = int((time.perf_counter() - render_started) * 1000)
-                    encoded = base64.b64encode(image_bytes).decode("ascii")
-                    image_data_url = f"data:image/png;base64,{encoded}"
                     uses_image = True
                 except Exception:
                     render_time_ms = int((time.perf_counter() - render_started) * 1000)
@@ -3888,7 +4297,6 @@ async def build_post_preview(
                 )
                 order += 1
 
-        publish_allowed = not (mode == "auto" and quality_level >= 2)
         status = "ready" if publish_allowed else "blocked"
         reason = None if publish_allowed else "quality_risk"
         posts.append(
@@ -3919,11 +4327,68 @@ async def build_post_preview(
         "lang": lang_key,
         "image_theme": image_theme_norm,
         "image_enabled": bool(settings.publish_headline_image),
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": generated_at,
         "posts": posts,
     }
 
 
+# One statement per batch: each column travels as a single array parameter and
+# unnest() zips them back into rows in buffer order.
+_INSERT_PUBLICATIONS_SQL = text("""
+INSERT INTO prediction_publications(
+  fixture_id, market, language, channel_id, status,
+  experimental, headline_message_id, analysis_message_id,
+  content_hash, idempotency_key, payload, error, published_at
+)
+SELECT
+  fid, market, lang, cid, status,
+  exp, mid_head, mid_analysis,
+  hash, idempotency_key, CAST(payload AS jsonb), error, published_at
+FROM unnest(
+  CAST(:fid AS bigint[]), CAST(:market AS text[]), CAST(:lang AS text[]),
+  CAST(:cid AS bigint[]), CAST(:status AS text[]), CAST(:exp AS boolean[]),
+  CAST(:mid_head AS bigint[]), CAST(:mid_analysis AS bigint[]), CAST(:hash AS text[]),
+  CAST(:idempotency_key AS text[]), CAST(:payload AS text[]), CAST(:error AS text[]),
+  CAST(:published_at AS timestamptz[])
+) AS t(
+  fid, market, lang, cid, status, exp, mid_head, mid_analysis,
+  hash, idempotency_key, payload, error, published_at
+)
+""")
+_PUBLICATION_COLUMNS = (
+    "fid", "market", "lang", "cid", "status", "exp", "mid_head", "mid_analysis",
+    "hash", "idempotency_key", "payload", "error", "published_at",
+)
+
+_PUBLISHED_FOR_FIXTURE_SQL = text("""
+SELECT market, language, idempotency_key FROM prediction_publications
+WHERE fixture_id=:fid AND status IN ('ok', 'published')
+""")
+
+_TRY_PUBLISH_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(:k) AS ok")
+
+
+_PUBLICATION_BATCH_SIZE = 1000
+
+
+def _dump_payload(payload: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False)
+
+
+async def _record_publications(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    for start in range(0, len(rows), _PUBLICATION_BATCH_SIZE):
+        batch = rows[start : start + _PUBLICATION_BATCH_SIZE]
+        await session.execute(
+            _INSERT_PUBLICATIONS_SQL,
+            {column: [row[column] for row in batch] for column in _PUBLICATION_COLUMNS},
+        )
+
+
 async def _record_publication(
     session: AsyncSession,
     fixture_id: int,
@@ -3939,6 +4404,7 @@ async def _record_publication(
     idempotency_key: str | None = None,
     payload: dict | None = None,
     error: str | None = None,
+    buffer: list[dict[str, Any]] | None = None,
 ) -> None:
     published_at = datetime.now(timezone.utc) if status in {"ok", "published"} else None
     payload_json = None
@@ -3946,46 +4412,33 @@ async def _record_publication(
         if isinstance(payload, str):
             payload_json = payload
         else:
-            payload_json = json.dumps(payload, ensure_ascii=False)
-    await session.execute(
-        text(
-            """
-            INSERT INTO prediction_publications(
-              fixture_id, market, language, channel_id, status,
-              experimental, headline_message_id, analysis_message_id,
-              content_hash, idempotency_key, payload, error, published_at
-            )
-            VALUES(
-              :fid, :market, :lang, :cid, :status,
-              :exp, :mid_head, :mid_analysis,
-              :hash, :idempotency_key, CAST(:payload AS jsonb), :error,
-              :published_at
-            )
-            """
-        ),
-        {
-            "fid": fixture_id,
-            "market": market,
-            "lang": language,
-            "cid": channel_id,
-            "status": status,
-            "exp": bool(experimental),
-            "mid_head": headline_message_id,
-            "mid_analysis": analysis_message_id,
-            "hash": content_hash,
-            "idempotency_key": idempotency_key,
-            "payload": payload_json,
-            "error": error,
-            "published_at": published_at,
-        },
-    )
+            payload_json = _dump_payload(payload)
+    row = {
+        "fid": fixture_id,
+        "market": market,
+        "lang": language,
+        "cid": channel_id,
+        "status": status,
+        "exp": bool(experimental),
+        "mid_head": headline_message_id,
+        "mid_analysis": analysis_message_id,
+        "hash": content_hash,
+        "idempotency_key": idempotency_key,
+        "payload": payload_json,
+        "error": error,
+        "published_at": published_at,
+    }
+    if buffer is not None:
+        buffer.append(row)
+        return
+    await _record_publications(session, [row])
 
 
 def _hash_content(headline: str, analysis: str) -> str:
-    h = hashlib.sha256()
-    h.update(headline.encode("utf-8", errors="ignore"))
-    h.update(analysis.encode("utf-8", errors="ignore"))
-    return h.hexdigest()
+    # Internal fingerprint only; 32-byte BLAKE2b keeps the 64-char hex width of content_hash.
+    digest = hashlib.blake2b(headline.encode("utf-8", errors="ignore"), digest_size=32)
+    digest.update(analysis.encode("utf-8", errors="ignore"))
+    return digest.hexdigest()
 
 
 def _build_idempotency_key(
@@ -3995,12 +4448,26 @@ def _build_idempotency_key(
     channel_id: int,
     content_hash: str,
 ) -> str:
-    payload = f"{fixture_id}:{market}:{language}:{channel_id}:{content_hash}"
-    return hashlib.sha256(payload.encode("utf-8", errors="ignore")).hexdigest()
+    # Keyed BLAKE2b: the content digest is the key and the packed fixture/channel
+    # ids the 16-byte personalization, so only market and language are hashed.
+    return hashlib.blake2b(
+        market.encode("utf-8", errors="ignore") + b"\x1f" + language.encode("utf-8", errors="ignore"),
+        digest_size=16,
+        key=bytes.fromhex(content_hash),
+        person=struct.pack(">Qq", fixture_id, channel_id),
+    ).hexdigest()
+
 
+_PUBLISH_RESERVATION_PERSON = b"pred1:publish"
 
+
+@lru_cache(maxsize=4096)
 def _publish_reservation_key(fixture_id: int) -> int:
-    digest = hashlib.blake2b(f"pred1:publish:{int(fixture_id)}".encode("utf-8"), digest_size=8).digest()
+    digest = hashlib.blake2b(
+        int(fixture_id).to_bytes(8, "big", signed=True),
+        digest_size=8,
+        person=_PUBLISH_RESERVATION_PERSON,
+    ).digest()
     return int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF
 
 
@@ -4008,7 +4475,7 @@ async def _try_publish_reservation(session: AsyncSession, fixture_id: int) -> bo
     try:
         row = (
             await session.execute(
-                text("SELECT pg_try_advisory_xact_lock(:k) AS ok"),
+                _TRY_PUBLISH_LOCK_SQL,
                 {"k": _publish_reservation_key(int(fixture_id))},
             )
         ).first()
@@ -4064,15 +4531,38 @@ async def publish_fixture(
     indices = data["indices"]
     home_win_prob, draw_prob, away_win_prob = _extract_1x2_chances(data.get("decision_1x2"))
     pred_by_market = {"1X2": data["pred_1x2"], "TOTAL": data["pred_total"]}
+    derived_by_market = data.get("derived") or {}
+    # Skip/dry-run rows don't gate anything later in this run; insert them in one batch.
+    pending_records: list[dict[str, Any]] = []
+    deliveries: list[dict[str, Any]] = []
     home_logo_bytes: bytes | None = None
     away_logo_bytes: bytes | None = None
     league_logo_bytes: bytes | None = None
     image_visual_context = ImageVisualContext()
     if settings.publish_headline_image and not dry_run:
-        home_logo_bytes = await _fetch_logo_bytes(getattr(fixture, "home_logo_url", None))
-        away_logo_bytes = await _fetch_logo_bytes(getattr(fixture, "away_logo_url", None))
-        league_logo_bytes = await _fetch_logo_bytes(getattr(fixture, "league_logo_url", None))
-        image_visual_context = await _fetch_image_visual_context(session, fixture)
+        # Logos never touch the session, so only the visual context uses it here.
+        home_logo_bytes, away_logo_bytes, league_logo_bytes, image_visual_context = await asyncio.gather(
+            _fetch_logo_bytes(getattr(fixture, "home_logo_url", None)),
+            _fetch_logo_bytes(getattr(fixture, "away_logo_url", None)),
+            _fetch_logo_bytes(getattr(fixture, "league_logo_url", None)),
+            _fetch_image_visual_context(session, fixture),
+        )
+
+    # One lookup covers every (market, language) and idempotency check below; the
+    # idempotency key embeds the fixture id, so scoping it to this fixture is exact.
+    published_pairs: set[tuple[str, str]] = set()
+    published_keys: set[str] = set()
+    if not force:
+        for row in (await session.execute(_PUBLISHED_FOR_FIXTURE_SQL, {"fid": fixture_id})).all():
+            published_pairs.add((row[0], row[1]))
+            if row[2]:
+                published_keys.add(row[2])
+
+    # Language routing depends only on the channel, so resolve it once for all markets.
+    channel_langs: list[tuple[str, int, str, str]] = []
+    for lang, channel_id in channels.items():
+        lang_key = (lang or "ru").strip().lower()
+        channel_langs.append((lang, channel_id, lang_key, lang_key if lang_key in _LANG_TEXT else "ru"))
 
     for market in preview.get("markets", []):
         if not market.get("headline_raw") or not market.get("analysis_raw"):
@@ -4085,29 +4575,14 @@ async def publish_fixture(
         quality_level = int(market.get("quality_level") or 0)
         experimental = bool(market.get("experimental"))
         reasons = market.get("reasons") or []
-        odd = getattr(pred, "initial_odd", None)
-        prob = getattr(pred, "confidence", None)
-        signal = getattr(pred, "signal_score", None)
-        ev = _calc_ev(prob, odd)
-        implied_prob = _calc_implied_prob(odd)
-        model_edge = (float(prob) - implied_prob) if prob is not None and implied_prob is not None else None
-        tier = _prediction_tier(ev, signal, experimental)
-
-        for lang, channel_id in channels.items():
-            existing = (
-                await session.execute(
-                    text(
-                        """
-                        SELECT id FROM prediction_publications
-                        WHERE fixture_id=:fid AND market=:market AND language=:lang AND status IN ('ok', 'published')
-                        ORDER BY created_at DESC
-                        LIMIT 1
-                        """
-                    ),
-                    {"fid": fixture_id, "market": market["market"], "lang": lang},
-                )
-            ).first()
-            if existing and not force:
+        derived = derived_by_market.get(market["market"]) or _derive_market(pred, experimental)
+        prob = derived.prob
+        implied_prob = derived.implied
+        model_edge = derived.edge
+        tier = derived.tier
+
+        for lang, channel_id, lang_key, local_lang in channel_langs:
+            if not force and (market["market"], lang) in published_pairs:
                 await _record_publication(
                     session,
                     fixture_id,
@@ -4117,6 +4592,7 @@ async def publish_fixture(
                     "skipped",
                     experimental=experimental,
                     payload={"reason": "already_published"},
+                    buffer=pending_records,
                 )
                 results.append({"market": market["market"], "lang": lang, "status": "skipped", "reason": "already_published"})
                 continue
@@ -4131,29 +4607,14 @@ async def publish_fixture(
                     "skipped",
                     experimental=experimental,
                     payload={"reason": "quality_risk", "reasons": reasons},
+                    buffer=pending_records,
                 )
                 results.append({"market": market["market"], "lang": lang, "status": "skipped", "reason": "quality_risk"})
                 continue
 
-            lang_key = (lang or "ru").strip().lower()
-            local_lang = lang_key if lang_key in _LANG_TEXT else "ru"
-            pack = _lang_pack(local_lang)
-            bet_label = _bet_label(pack, tier)
-            indicator_title = _plain_indicator_text(
-                _variant_text(
-                    pack,
-                    "value_variants",
-                    pack.get("value_indicators", "VALUE INDICATORS"),
-                    f"{fixture_id}:{market['market']}:{local_lang}:signal_title",
-                )
-            ) or "VALUE INDICATORS"
-            bookmakers_label = _plain_indicator_text(pack.get("bookmakers_give", "Bookmakers give")) or "Bookmakers give"
-            model_label = _plain_indicator_text(pack.get("our_model", "Our model")) or "Our model"
-            edge_suffix = _plain_indicator_text(pack.get("edge_short", "edge")) or "edge"
-            indicator_line_1 = f"{bookmakers_label}: {_fmt_percent(implied_prob, 1)}"
-            indicator_line_2 = f"{model_label}: {_fmt_percent(prob, 1)}"
-            if model_edge is not None:
-                indicator_line_2 = f"{indicator_line_2} ({model_edge * 100:+.1f}% {edge_suffix})"
+            bet_label = _tier_bet_label(local_lang, tier)
+            indicator_title = _indicator_title(local_lang, fixture_id, market["market"])
+            indicator_line_1, indicator_line_2 = _indicator_lines(local_lang, implied_prob, prob, model_edge)
             indicator_line_3 = None
             use_deepl = bool(
                 settings.publish_deepl_fallback
@@ -4169,6 +4630,7 @@ async def publish_fixture(
                 experimental,
                 reasons,
                 local_lang,
+                derived=derived,
             )
             # AI enrichment (Russian source text only)
             if settings.groq_enabled and local_lang == "ru":
@@ -4196,6 +4658,28 @@ async def publish_fixture(
                 headline = _normalize_translated_text(headline, protected)
                 analysis = _normalize_translated_text(analysis, protected)
 
+            # Dry runs are never deduplicated against, so they skip hashing; the
+            # payload still carries the full text.
+            if dry_run:
+                await _record_publication(
+                    session,
+                    fixture_id,
+                    market["market"],
+                    lang,
+                    channel_id,
+                    "dry_run",
+                    experimental=experimental,
+                    payload={
+                        "dry_run": True,
+                        "headline": headline,
+                        "analysis": analysis,
+                        "image_theme": image_theme_norm,
+                    },
+                    buffer=pending_records,
+                )
+                results.append({"market": market["market"], "lang": lang, "status": "dry_run"})
+                continue
+
             content_hash = _hash_content(headline, analysis)
             idempotency_key = None
             if not force:
@@ -4207,172 +4691,169 @@ async def publish_fixture(
                     content_hash,
                 )
 
-            if dry_run:
+            if not force and idempotency_key in published_keys:
                 await _record_publication(
                     session,
                     fixture_id,
                     market["market"],
                     lang,
                     channel_id,
-                    "dry_run",
+                    "skipped",
                     experimental=experimental,
                     content_hash=content_hash,
                     idempotency_key=idempotency_key,
-                    payload={
-                        "dry_run": True,
-                        "headline": headline,
-                        "analysis": analysis,
-                        "image_theme": image_theme_norm,
-                    },
+                    payload={"reason": "idempotent_duplicate"},
+                    buffer=pending_records,
+                )
+                results.append(
+                    {
+                        "market": market["market"],
+                        "lang": lang,
+                        "status": "skipped",
+                        "reason": "idempotent_duplicate",
+                    }
                 )
-                results.append({"market": market["market"], "lang": lang, "status": "dry_run"})
                 continue
 
-            try:
-                if not force:
-                    existing_idempotent = (
-                        await session.execute(
-                            text(
-                                """
-                                SELECT id FROM prediction_publications
-                                WHERE idempotency_key=:key AND status IN ('ok', 'published')
-                                ORDER BY created_at DESC
-                                LIMIT 1
-                                """
-                            ),
-                            {"key": idempotency_key},
-                        )
-                    ).first()
-                    if existing_idempotent:
-                        await _record_publication(
-                            session,
-                            fixture_id,
-                            market["market"],
-                            lang,
-                            channel_id,
-                            "skipped",
-                            experimental=experimental,
-                            content_hash=content_hash,
-                            idempotency_key=idempotency_key,
-                            payload={"reason": "idempotent_duplicate"},
-                        )
-                        results.append(
-                            {
-                                "market": market["market"],
-                                "lang": lang,
-                                "status": "skipped",
-                                "reason": "idempotent_duplicate",
-                            }
+            # Rendering and sending never touch the session, so channels run concurrently
+            # below; the slot keeps the per-market/per-language order of ``results``.
+            deliveries.append(
+                {
+                    "slot": len(results),
+                    "market": market["market"],
+                    "lang": lang,
+                    "channel_id": channel_id,
+                    "experimental": experimental,
+                    "content_hash": content_hash,
+                    "idempotency_key": idempotency_key,
+                    "headline": headline,
+                    "analysis": analysis,
+                    "bet_label": bet_label,
+                    "indicator_title": indicator_title,
+                    "indicator_lines": (indicator_line_1, indicator_line_2, indicator_line_3),
+                }
+            )
+            results.append({})
+
+    send_limiter = asyncio.Semaphore(max(1, int(settings.publish_concurrency or 1)))
+
+    async def _deliver(job: dict[str, Any]) -> tuple[dict, list[tuple[str, dict[str, Any]]]]:
+        """Render and send one (market, language) post.
+
+        Returns the result entry plus the publication rows to record as
+        ``(status, _record_publication kwargs)`` pairs; the caller writes them to
+        the session once every delivery has finished.
+        """
+        market_name = job["market"]
+        lang = job["lang"]
+        channel_id = job["channel_id"]
+        headline = job["headline"]
+        analysis = job["analysis"]
+        bet_label = job["bet_label"]
+        indicator_title = job["indicator_title"]
+        indicator_line_1, indicator_line_2, indicator_line_3 = job["indicator_lines"]
+        records: list[tuple[str, dict[str, Any]]] = []
+        try:
+            headline_parts = _split_message(headline)
+            analysis_parts = _split_message(analysis)
+            headline_ids: list[int]
+            analysis_ids: list[int]
+            used_headline_image = False
+            image_fallback_reason: str | None = None
+            html_attempted = False
+            html_render_failed = False
+            render_time_ms: int | None = None
+            if settings.publish_headline_image:
+                html_attempted = True
+                image_text = _strip_image_probability_line(headline)
+                common_image_kwargs = {
+                    "home_logo": home_logo_bytes,
+                    "away_logo": away_logo_bytes,
+                    "league_logo": league_logo_bytes,
+                    "league_label": str(getattr(fixture, "league_name", "") or ""),
+                    "market_label": (
+                        "1X2" if market_name == "1X2" else "TOTAL" if market_name == "TOTAL" else str(market_name)
+                    ),
+                    "bet_label": bet_label,
+                }
+                html_image_kwargs = {
+                    **common_image_kwargs,
+                    "style_variant": image_theme_norm,
+                    "league_country": image_visual_context.league_country,
+                    "league_round": image_visual_context.league_round,
+                    "venue_name": image_visual_context.venue_name,
+                    "venue_city": image_visual_context.venue_city,
+                    "home_rank": image_visual_context.home_rank,
+                    "away_rank": image_visual_context.away_rank,
+                    "home_points": image_visual_context.home_points,
+                    "away_points": image_visual_context.away_points,
+                    "home_played": image_visual_context.home_played,
+                    "away_played": image_visual_context.away_played,
+                    "home_goal_diff": image_visual_context.home_goal_diff,
+                    "away_goal_diff": image_visual_context.away_goal_diff,
+                    "home_form": image_visual_context.home_form,
+                    "away_form": image_visual_context.away_form,
+                    "home_win_prob": home_win_prob,
+                    "draw_prob": draw_prob,
+                    "away_win_prob": away_win_prob,
+                    "signal_title": indicator_title,
+                    "signal_line_1": indicator_line_1,
+                    "signal_line_2": indicator_line_2,
+                    "signal_line_3": indicator_line_3,
+                }
+                if settings.card_gen_v2 and _card_gen_v2_render is not None and _build_v2_card is not None:
+                    render_started = time.perf_counter()
+                    try:
+                        v2_card = _build_v2_card(
+                            fixture=fixture,
+                            image_visual_context=image_visual_context,
+                            image_text=image_text,
+                            html_image_kwargs=html_image_kwargs,
+                            home_win_prob=home_win_prob,
+                            draw_prob=draw_prob,
+                            away_win_prob=away_win_prob,
+                            indicator_title=indicator_title,
+                            indicator_lines=[indicator_line_1, indicator_line_2, indicator_line_3],
                         )
-                        continue
-
-                headline_parts = _split_message(headline)
-                analysis_parts = _split_message(analysis)
-                headline_ids: list[int]
-                analysis_ids: list[int]
-                used_headline_image = False
-                image_fallback_reason: str | None = None
-                html_attempted = False
-                html_render_failed = False
-                render_time_ms: int | None = None
-                if settings.publish_headline_image:
-                    html_attempted = True
-                    image_text = _strip_image_probability_line(headline)
-                    common_image_kwargs = {
-                        "home_logo": home_logo_bytes,
-                        "away_logo": away_logo_bytes,
-                        "league_logo": league_logo_bytes,
-                        "league_label": str(getattr(fixture, "league_name", "") or ""),
-                        "market_label": (
-                            "1X2" if market["market"] == "1X2" else "TOTAL" if market["market"] == "TOTAL" else str(market["market"])
-                        ),
-                        "bet_label": bet_label,
-                    }
-                    html_image_kwargs = {
-                        **common_image_kwargs,
-                        "style_variant": image_theme_norm,
-                        "league_country": image_visual_context.league_country,
-                        "league_round": image_visual_context.league_round,
-                        "venue_name": image_visual_context.venue_name,
-                        "venue_city": image_visual_context.venue_city,
-                        "home_rank": image_visual_context.home_rank,
-                        "away_rank": image_visual_context.away_rank,
-                        "home_points": image_visual_context.home_points,
-                        "away_points": image_visual_context.away_points,
-                        "home_played": image_visual_context.home_played,
-                        "away_played": image_visual_context.away_played,
-                        "home_goal_diff": image_visual_context.home_goal_diff,
-                        "away_goal_diff": image_visual_context.away_goal_diff,
-                        "home_form": image_visual_context.home_form,
-                        "away_form": image_visual_context.away_form,
-                        "home_win_prob": home_win_prob,
-                        "draw_prob": draw_prob,
-                        "away_win_prob": away_win_prob,
-                        "signal_title": indicator_title,
-                        "signal_line_1": indicator_line_1,
-                        "signal_line_2": indicator_line_2,
-                        "signal_line_3": indicator_line_3,
-                    }
-                    if settings.card_gen_v2 and _card_gen_v2_render is not None and _build_v2_card is not None:
-                        render_started = time.perf_counter()
-                        try:
-                            v2_card = _build_v2_card(
-                                fixture=fixture,
-                                image_visual_context=image_visual_context,
-                                image_text=image_text,
-                                html_image_kwargs=html_image_kwargs,
-                                home_win_prob=home_win_prob,
-                                draw_prob=draw_prob,
-                                away_win_prob=away_win_prob,
-                                indicator_title=indicator_title,
-                                indicator_lines=[indicator_line_1, indicator_line_2, indicator_line_3],
+                        image_bytes = await _card_gen_v2_render(v2_card)
+                        render_time_ms = int((time.perf_counter() - render_started) * 1000)
+                        # Caption mode: image + text in ONE Telegram message
+                        caption_text = "\n".join(analysis_parts)
+                        if len(caption_text) <= 1024:
+                            photo_id = await send_photo(
+                                channel_id, image_bytes, caption=caption_text,
                             )
-                            image_bytes = await _card_gen_v2_render(v2_card)
-                            render_time_ms = int((time.perf_counter() - render_started) * 1000)
-                            # Caption mode: image + text in ONE Telegram message
-                            caption_text = "\n".join(analysis_parts)
-                            if len(caption_text) <= 1024:
-                                photo_id = await send_photo(
-                                    channel_id, image_bytes, caption=caption_text,
-                                )
-                                headline_ids = [photo_id]
-                                analysis_ids = []
-                            else:
-                                # Caption too long — send photo with truncated
-                                # caption, then remainder as reply
-                                photo_id = await send_photo(
-                                    channel_id, image_bytes,
-                                    caption=caption_text[:1024],
-                                )
-                                headline_ids = [photo_id]
-                                remainder = caption_text[1024:]
-                                analysis_ids = await send_message_parts(
-                                    channel_id,
-                                    [remainder],
-                                    reply_to_message_id=photo_id,
-                                )
-                            used_headline_image = True
-                        except Exception:
-                            render_time_ms = int((time.perf_counter() - render_started) * 1000)
-                            html_render_failed = True
-                            log.exception(
-                                "card_gen_v2_failed fixture=%s market=%s lang=%s fallback=text",
-                                fixture_id,
-                                market["market"],
-                                lang,
+                            headline_ids = [photo_id]
+                            analysis_ids = []
+                        else:
+                            # Caption too long — send photo with truncated
+                            # caption, then remainder as reply
+                            photo_id = await send_photo(
+                                channel_id, image_bytes,
+                                caption=caption_text[:1024],
                             )
-                            image_fallback_reason = "card_gen_v2_failed"
-                            await _record_publication(
-                                session,
-                                fixture_id,
-                                market["market"],
-                                lang,
+                            headline_ids = [photo_id]
+                            remainder = caption_text[1024:]
+                            analysis_ids = await send_message_parts(
                                 channel_id,
+                                [remainder],
+                                reply_to_message_id=photo_id,
+                            )
+                        used_headline_image = True
+                    except Exception:
+                        render_time_ms = int((time.perf_counter() - render_started) * 1000)
+                        html_render_failed = True
+                        log.exception(
+                            "card_gen_v2_failed fixture=%s market=%s lang=%s fallback=text",
+                            fixture_id,
+                            market_name,
+                            lang,
+                        )
+                        image_fallback_reason = "card_gen_v2_failed"
+                        records.append(
+                            (
                                 "render_failed",
-                                experimental=experimental,
-                                content_hash=content_hash,
-                                idempotency_key=idempotency_key,
-                                payload={
+                                {"payload": {
                                     "reason": "card_gen_v2_failed",
                                     "headline_image": False,
                                     "headline_image_fallback": image_fallback_reason,
@@ -4380,59 +4861,54 @@ async def publish_fixture(
                                     "html_render_failed": True,
                                     "render_time_ms": render_time_ms,
                                     "image_theme": image_theme_norm,
-                                },
+                                }},
                             )
-                    elif render_headline_image_html is not None:
-                        render_started = time.perf_counter()
-                        try:
-                            image_bytes = await asyncio.to_thread(
-                                render_headline_image_html,
-                                image_text,
-                                **html_image_kwargs,
+                        )
+                elif render_headline_image_html is not None:
+                    render_started = time.perf_counter()
+                    try:
+                        render_key, image_bytes = await _run_image_job(
+                            _render_headline_png,
+                            image_text,
+                            **html_image_kwargs,
+                        )
+                        render_time_ms = int((time.perf_counter() - render_started) * 1000)
+                        # Caption mode: image + text in ONE Telegram message
+                        caption_text = "\n".join(analysis_parts)
+                        if len(caption_text) <= 1024:
+                            photo_id = await send_photo(
+                                channel_id, image_bytes, caption=caption_text, cache_key=render_key,
                             )
-                            render_time_ms = int((time.perf_counter() - render_started) * 1000)
-                            # Caption mode: image + text in ONE Telegram message
-                            caption_text = "\n".join(analysis_parts)
-                            if len(caption_text) <= 1024:
-                                photo_id = await send_photo(
-                                    channel_id, image_bytes, caption=caption_text,
-                                )
-                                headline_ids = [photo_id]
-                                analysis_ids = []
-                            else:
-                                photo_id = await send_photo(
-                                    channel_id, image_bytes,
-                                    caption=caption_text[:1024],
-                                )
-                                headline_ids = [photo_id]
-                                remainder = caption_text[1024:]
-                                analysis_ids = await send_message_parts(
-                                    channel_id,
-                                    [remainder],
-                                    reply_to_message_id=photo_id,
-                                )
-                            used_headline_image = True
-                        except Exception:
-                            render_time_ms = int((time.perf_counter() - render_started) * 1000)
-                            html_render_failed = True
-                            log.exception(
-                                "headline_image_html_failed fixture=%s market=%s lang=%s fallback=text",
-                                fixture_id,
-                                market["market"],
-                                lang,
+                            headline_ids = [photo_id]
+                            analysis_ids = []
+                        else:
+                            photo_id = await send_photo(
+                                channel_id, image_bytes,
+                                caption=caption_text[:1024],
+                                cache_key=render_key,
                             )
-                            image_fallback_reason = "html_render_failed"
-                            await _record_publication(
-                                session,
-                                fixture_id,
-                                market["market"],
-                                lang,
+                            headline_ids = [photo_id]
+                            remainder = caption_text[1024:]
+                            analysis_ids = await send_message_parts(
                                 channel_id,
+                                [remainder],
+                                reply_to_message_id=photo_id,
+                            )
+                        used_headline_image = True
+                    except Exception:
+                        render_time_ms = int((time.perf_counter() - render_started) * 1000)
+                        html_render_failed = True
+                        log.exception(
+                            "headline_image_html_failed fixture=%s market=%s lang=%s fallback=text",
+                            fixture_id,
+                            market_name,
+                            lang,
+                        )
+                        image_fallback_reason = "html_render_failed"
+                        records.append(
+                            (
                                 "render_failed",
-                                experimental=experimental,
-                                content_hash=content_hash,
-                                idempotency_key=idempotency_key,
-                                payload={
+                                {"payload": {
                                     "reason": "html_render_failed",
                                     "headline_image": False,
                                     "headline_image_fallback": image_fallback_reason,
@@ -4440,28 +4916,22 @@ async def publish_fixture(
                                     "html_render_failed": True,
                                     "render_time_ms": render_time_ms,
                                     "image_theme": image_theme_norm,
-                                },
+                                }},
                             )
-                    else:
-                        html_render_failed = True
-                        log.warning(
-                            "headline_image_html_unavailable fixture=%s market=%s lang=%s fallback=text",
-                            fixture_id,
-                            market["market"],
-                            lang,
                         )
-                        image_fallback_reason = "html_renderer_unavailable"
-                        await _record_publication(
-                            session,
-                            fixture_id,
-                            market["market"],
-                            lang,
-                            channel_id,
+                else:
+                    html_render_failed = True
+                    log.warning(
+                        "headline_image_html_unavailable fixture=%s market=%s lang=%s fallback=text",
+                        fixture_id,
+                        market_name,
+                        lang,
+                    )
+                    image_fallback_reason = "html_renderer_unavailable"
+                    records.append(
+                        (
                             "render_failed",
-                            experimental=experimental,
-                            content_hash=content_hash,
-                            idempotency_key=idempotency_key,
-                            payload={
+                            {"payload": {
                                 "reason": "html_renderer_unavailable",
                                 "headline_image": False,
                                 "headline_image_fallback": image_fallback_reason,
@@ -4469,68 +4939,78 @@ async def publish_fixture(
                                 "html_render_failed": True,
                                 "render_time_ms": render_time_ms,
                                 "image_theme": image_theme_norm,
-                            },
+                            }},
                         )
+                    )
 
-                if not used_headline_image:
-                    headline_ids = await send_message_parts(channel_id, headline_parts)
-                    analysis_ids = await send_message_parts(channel_id, analysis_parts)
-
+            if not used_headline_image:
+                # Kept sequential on purpose: Telegram orders channel posts by arrival,
+                # so overlapping these could put the analysis above its headline.
+                headline_ids = await send_message_parts(channel_id, headline_parts)
+                analysis_ids = await send_message_parts(channel_id, analysis_parts)
+        except Exception as exc:
+            log.exception("publish_failed fixture=%s market=%s lang=%s", fixture_id, market_name, lang)
+            failed = {"market": market_name, "lang": lang, "status": "failed", "error": str(exc)}
+            return failed, [("send_failed", {"payload": {"reason": "send_failed"}, "error": str(exc)})]
+        published = {
+            "headline_message_id": headline_ids[0] if headline_ids else None,
+            "analysis_message_id": analysis_ids[0] if analysis_ids else None,
+            "payload": {
+                "headline": headline,
+                "analysis": analysis,
+                "headline_ids": headline_ids,
+                "analysis_ids": analysis_ids,
+                "headline_image": used_headline_image,
+                "headline_image_fallback": image_fallback_reason,
+                "html_attempted": html_attempted,
+                "html_render_failed": html_render_failed,
+                "render_time_ms": render_time_ms,
+                "image_theme": image_theme_norm,
+            },
+        }
+        records.append(("published", published))
+        return {"market": market_name, "lang": lang, "status": "ok"}, records
+
+    async def _deliver_channel(jobs: list[dict[str, Any]]) -> list[tuple[dict, list[tuple[str, dict[str, Any]]]]]:
+        """Send one channel's posts in order; channels overlap under ``send_limiter``."""
+        async with send_limiter:
+            return [await _deliver(job) for job in jobs]
+
+    # Telegram orders a channel's posts by arrival, so each channel's markets go out
+    # one after another (h1, a1, h2, a2); only different channels run concurrently.
+    by_channel: dict[Any, list[dict[str, Any]]] = {}
+    for job in deliveries:
+        by_channel.setdefault(job["channel_id"], []).append(job)
+    channel_outputs = await asyncio.gather(*(_deliver_channel(jobs) for jobs in by_channel.values()))
+    delivered_by_slot = {
+        job["slot"]: output
+        for jobs, outputs in zip(by_channel.values(), channel_outputs)
+        for job, output in zip(jobs, outputs)
+    }
+    for job in deliveries:
+        result, records = delivered_by_slot[job["slot"]]
+        try:
+            for status, fields in records:
                 await _record_publication(
                     session,
                     fixture_id,
-                    market["market"],
-                    lang,
-                    channel_id,
-                    "published",
-                    experimental=experimental,
-                    headline_message_id=headline_ids[0] if headline_ids else None,
-                    analysis_message_id=analysis_ids[0] if analysis_ids else None,
-                    content_hash=content_hash,
-                    idempotency_key=idempotency_key,
-                    payload={
-                        "headline": headline,
-                        "analysis": analysis,
-                        "headline_ids": headline_ids,
-                        "analysis_ids": analysis_ids,
-                        "headline_image": used_headline_image,
-                        "headline_image_fallback": image_fallback_reason,
-                        "html_attempted": html_attempted,
-                        "html_render_failed": html_render_failed,
-                        "render_time_ms": render_time_ms,
-                        "image_theme": image_theme_norm,
-                    },
+                    job["market"],
+                    job["lang"],
+                    job["channel_id"],
+                    status,
+                    experimental=job["experimental"],
+                    content_hash=job["content_hash"],
+                    idempotency_key=job["idempotency_key"],
+                    buffer=pending_records,
+                    **fields,
                 )
-                results.append({"market": market["market"], "lang": lang, "status": "ok"})
-            except Exception as exc:
-                log.exception("publish_failed fixture=%s market=%s lang=%s", fixture_id, market["market"], lang)
-                try:
-                    await session.rollback()
-                except Exception:
-                    pass
-                try:
-                    await _record_publication(
-                        session,
-                        fixture_id,
-                        market["market"],
-                        lang,
-                        channel_id,
-                        "send_failed",
-                        experimental=experimental,
-                        content_hash=content_hash,
-                        idempotency_key=idempotency_key,
-                        payload={"reason": "send_failed"},
-                        error=str(exc),
-                    )
-                except Exception:
-                    log.exception("record_failed_publication_error fixture=%s", fixture_id)
-                    try:
-                        await session.rollback()
-                    except Exception:
-                        pass
-                results.append({"market": market["market"], "lang": lang, "status": "failed", "error": str(exc)})
+        except Exception:
+            log.exception("record_publication_error fixture=%s", fixture_id)
+        results[job["slot"]] = result
 
     try:
+        if pending_records:
+            await _record_publications(session, pending_records)
         await session.commit()
     except Exception:
         log.exception("publish_final_commit_failed fixture=%s", fixture_id)
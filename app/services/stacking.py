@@ -18,24 +18,71 @@ import numpy as np
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.decimalutils import D, q_prob
+from app.core.decimalutils import q_prob
 from app.core.logger import get_logger
 
 log = get_logger("services.stacking")
 
 
+_PROB_EPS = 0.0001
+
+
 def _to_probs_decimal(probs: np.ndarray) -> tuple[Decimal, Decimal, Decimal]:
     """Clamp, normalize, convert to Decimal triple."""
-    eps = 0.0001
-    probs = np.clip(probs, eps, 1.0 - eps)
-    probs = probs / probs.sum()
+    probs = np.clip(probs, _PROB_EPS, 1.0 - _PROB_EPS)
+    p_home, p_draw, p_away = (probs / probs.sum()).tolist()
+    # "%.6f" rounds like round(p, 6) and yields the Decimal string in one step.
     return (
-        q_prob(D(str(round(probs[0], 6)))),
-        q_prob(D(str(round(probs[1], 6)))),
-        q_prob(D(str(round(probs[2], 6)))),
+        q_prob(Decimal(f"{p_home:.6f}")),
+        q_prob(Decimal(f"{p_draw:.6f}")),
+        q_prob(Decimal(f"{p_away:.6f}")),
     )
 
 
+def _softmax_logits(
+    coefficients: np.ndarray,
+    intercept: np.ndarray,
+    x: np.ndarray,
+    temperature: float,
+) -> np.ndarray:
+    """Linear → temperature scaling → softmax (numerically stable)."""
+    logits = (coefficients @ x + intercept) / temperature
+    logits -= logits.max()
+    exp_logits = np.exp(logits)
+    return exp_logits / exp_logits.sum()
+
+
+def _feature_vector(buffer: np.ndarray, index: dict[str, int], features: dict[str, float]) -> np.ndarray:
+    """Fill ``buffer`` from a feature dict; features the model doesn't know are ignored."""
+    buffer.fill(0.0)
+    for name, value in features.items():
+        i = index.get(name)
+        if i is not None:
+            buffer[i] = value
+    return buffer
+
+
+def _feature_matrix(index: dict[str, int], n_features: int, feats: list[dict[str, float]]) -> np.ndarray:
+    """Stack feature dicts into an (N, F) matrix in model column order."""
+    x = np.zeros((len(feats), n_features), dtype=np.float64)
+    for row, features in enumerate(feats):
+        for name, value in features.items():
+            i = index.get(name)
+            if i is not None:
+                x[row, i] = value
+    return x
+
+
+def _softmax_rows(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax, then the same clamp + renormalize as _to_probs_decimal."""
+    logits = logits - logits.max(axis=1, keepdims=True)
+    probs = np.exp(logits)
+    probs /= probs.sum(axis=1, keepdims=True)
+    np.clip(probs, _PROB_EPS, 1.0 - _PROB_EPS, out=probs)
+    probs /= probs.sum(axis=1, keepdims=True)
+    return probs
+
+
 def _apply_scaler(x: np.ndarray, scaler_mean, scaler_scale) -> np.ndarray:
     """Apply StandardScaler if available (backward-compatible)."""
     if scaler_mean is not None and scaler_scale is not None:
@@ -61,20 +108,27 @@ class StackingModel:
         self.temperature = max(temperature, 0.01)
         self.scaler_mean = np.asarray(scaler_mean, dtype=np.float64) if scaler_mean is not None else None
         self.scaler_scale = np.asarray(scaler_scale, dtype=np.float64) if scaler_scale is not None else None
+        # Name -> column lookup plus a reusable input row, so predict() never rebuilds either.
+        self._feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        self._x = np.zeros(len(self.feature_names), dtype=np.float64)
 
     def predict(self, features: dict[str, float]) -> tuple[Decimal, Decimal, Decimal]:
         """Predict 1X2 probabilities from feature dict."""
-        x = np.array([features.get(name, 0.0) for name in self.feature_names], dtype=np.float64)
+        x = _feature_vector(self._x, self._feature_index, features)
         x = _apply_scaler(x, self.scaler_mean, self.scaler_scale)
+        probs = _softmax_logits(self.coefficients, self.intercept, x, self.temperature)
+        return _to_probs_decimal(probs)
 
-        # Linear → temperature scaling → softmax (numerically stable)
-        logits = self.coefficients @ x + self.intercept
-        logits = logits / self.temperature
-        logits -= logits.max()
-        exp_logits = np.exp(logits)
-        probs = exp_logits / exp_logits.sum()
+    def predict_batch(self, feats: list[dict[str, float]]) -> np.ndarray:
+        """Predict 1X2 probabilities for many feature dicts at once.
 
-        return _to_probs_decimal(probs)
+        Returns an (N, 3) float64 array of clamped, normalized probabilities;
+        callers convert rows to Decimal only where they need to.
+        """
+        x = _feature_matrix(self._feature_index, len(self.feature_names), feats)
+        x = _apply_scaler(x, self.scaler_mean, self.scaler_scale)
+        logits = x @ self.coefficients.T + self.intercept
+        return _softmax_rows(logits / self.temperature)
 
 
 class XGBoostStackingModel:
@@ -98,6 +152,9 @@ class XGBoostStackingModel:
         self.temperature = max(temperature, 0.01)
         self.scaler_mean = np.asarray(scaler_mean, dtype=np.float64) if scaler_mean is not None else None
         self.scaler_scale = np.asarray(scaler_scale, dtype=np.float64) if scaler_scale is not None else None
+        # Name -> column lookup plus a reusable input row, so predict() never rebuilds either.
+        self._feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        self._x = np.zeros(len(self.feature_names), dtype=np.float64)
 
         # Load booster from JSON string via temp file
         fd, path = tempfile.mkstemp(suffix=".json")
@@ -113,7 +170,7 @@ class XGBoostStackingModel:
         """Predict 1X2 probabilities from feature dict."""
         import xgboost as xgb
 
-        x = np.array([features.get(name, 0.0) for name in self.feature_names], dtype=np.float64)
+        x = _feature_vector(self._x, self._feature_index, features)
         x = _apply_scaler(x, self.scaler_mean, self.scaler_scale)
 
         dmatrix = xgb.DMatrix(x.reshape(1, -1), feature_names=self.feature_names)
@@ -127,6 +184,16 @@ class XGBoostStackingModel:
 
         return _to_probs_decimal(probs)
 
+    def predict_batch(self, feats: list[dict[str, float]]) -> np.ndarray:
+        """Predict 1X2 probabilities for many feature dicts in one booster call."""
+        import xgboost as xgb
+
+        x = _feature_matrix(self._feature_index, len(self.feature_names), feats)
+        x = _apply_scaler(x, self.scaler_mean, self.scaler_scale)
+        dmatrix = xgb.DMatrix(x, feature_names=self.feature_names)
+        margins = self.booster.predict(dmatrix, output_margin=True)  # shape (N, 3)
+        return _softmax_rows(margins / self.temperature)
+
 
 # Union type for both model types
 AnyStackingModel = Union[StackingModel, XGBoostStackingModel]
@@ -27,13 +27,20 @@ import logging
 import math
 import os
 import sys
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from datetime import date, datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
 import numpy as np
 from dotenv import load_dotenv
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional JIT, NumPy is the fallback
+    njit = None
+
 load_dotenv()
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -48,8 +55,6 @@ from app.services.math_utils import (
     DEFAULT_ELO,
     ELO_K,
     elo_expected as _elo_expected,
-    match_probs_poisson as _match_probs_poisson,
-    poisson_pmf as _poisson_pmf,
 )
 
 logging.basicConfig(
@@ -66,6 +71,8 @@ log = logging.getLogger("ablation")
 
 DC_REFIT_INTERVAL = 50   # refit DC every N matches
 DC_MIN_MATCHES = 30      # minimum matches to fit DC
+REFIT_PREFETCH = 4       # refits kept in flight per DC model when a refit pool is given
+XG_WINDOW = 5            # rolling xG window for the baseline (L5)
 
 
 def _get_conn(dsn: str):
@@ -84,6 +91,102 @@ def compute_outcome(goals_home: int, goals_away: int) -> int:
         return 2
 
 
+def _match_day(md) -> date:
+    """Calendar day of a hist_fixtures match_date (datetime, date or ISO string)."""
+    if isinstance(md, datetime):
+        return md.date()
+    if isinstance(md, date):
+        return md
+    return datetime.strptime(str(md)[:10], "%Y-%m-%d").date()
+
+
+def _match_time_us(md) -> int | None:
+    """match_date as integer microseconds on a common timeline, for rest-hour deltas.
+
+    Naive values count from 0001-01-01 as-is; aware ones are shifted to UTC so
+    deltas across offsets match datetime subtraction. Dates are midnight.
+    """
+    if md is None:
+        return None
+    if isinstance(md, str):
+        md = datetime.strptime(md[:19], "%Y-%m-%d %H:%M:%S" if len(md) > 10 else "%Y-%m-%d")
+    if not isinstance(md, datetime):
+        return md.toordinal() * 86_400_000_000
+    seconds = md.toordinal() * 86_400 + md.hour * 3600 + md.minute * 60 + md.second
+    offset = md.utcoffset()
+    if offset is not None:
+        seconds -= offset.days * 86_400 + offset.seconds
+        return (seconds * 1_000_000 + md.microsecond) - offset.microseconds
+    return seconds * 1_000_000 + md.microsecond
+
+
+class FixtureColumns(NamedTuple):
+    """Struct-of-arrays view of a fixture list: one list per field, same order."""
+    fixture_id: list
+    league_id: list
+    home_id: list
+    away_id: list
+    goals_home: list
+    goals_away: list
+    xg_home: list
+    xg_away: list
+    match_date: list
+    match_day: list    # datetime.date, parsed once
+    match_us: list     # int microseconds (see _match_time_us), for rest hours
+
+
+def fixtures_to_columns(fixtures: list[dict]) -> FixtureColumns:
+    """Split hist_fixtures dicts into parallel columns once, before walk-forward.
+
+    Plain lists rather than ndarrays: the walk-forward loop reads one scalar
+    at a time and uses team ids as dict keys, which is faster on Python ints
+    than on numpy scalars.
+    """
+    match_date = [m["match_date"] for m in fixtures]
+    return FixtureColumns(
+        fixture_id=[m["fixture_id"] for m in fixtures],
+        league_id=[m["league_id"] for m in fixtures],
+        home_id=[m["home_team_id"] for m in fixtures],
+        away_id=[m["away_team_id"] for m in fixtures],
+        goals_home=[m.get("goals_home") for m in fixtures],
+        goals_away=[m.get("goals_away") for m in fixtures],
+        xg_home=[m.get("xg_home") for m in fixtures],
+        xg_away=[m.get("xg_away") for m in fixtures],
+        match_date=match_date,
+        match_day=[_match_day(md) if md is not None else None for md in match_date],
+        match_us=[_match_time_us(md) for md in match_date],
+    )
+
+
+def _column_match_data(cols: FixtureColumns, i: int) -> MatchData:
+    """MatchData for fixture i, built from the precomputed columns (xG kept for DC-xG)."""
+    xg_h = cols.xg_home[i]
+    xg_a = cols.xg_away[i]
+    return MatchData(
+        home_id=cols.home_id[i],
+        away_id=cols.away_id[i],
+        home_goals=int(cols.goals_home[i]),
+        away_goals=int(cols.goals_away[i]),
+        date=cols.match_day[i],
+        home_xg=float(xg_h) if xg_h is not None else None,
+        away_xg=float(xg_a) if xg_a is not None else None,
+    )
+
+
+def odds_columns(
+    fixture_ids: list[int],
+    odds_map: dict[int, dict],
+) -> tuple[list[float], list[float], list[float]]:
+    """Join fair odds onto fixture positions: (fair_home, fair_draw, fair_away), 0.0 if missing."""
+    missing = {"fair_home": 0.0, "fair_draw": 0.0, "fair_away": 0.0}
+    rows = [odds_map.get(fid, missing) for fid in fixture_ids]
+    return (
+        [r.get("fair_home", 0.0) for r in rows],
+        [r.get("fair_draw", 0.0) for r in rows],
+        [r.get("fair_away", 0.0) for r in rows],
+    )
+
+
 def matches_to_dc_input(matches: list[dict]) -> list[MatchData]:
     """Convert hist_fixtures dicts to MatchData for dixon_coles.fit_dixon_coles."""
     result = []
@@ -95,12 +198,7 @@ def matches_to_dc_input(matches: list[dict]) -> list[MatchData]:
         md = m.get("match_date")
         if md is None:
             continue
-        if isinstance(md, datetime):
-            d = md.date()
-        elif isinstance(md, date):
-            d = md
-        else:
-            d = datetime.strptime(str(md)[:10], "%Y-%m-%d").date()
+        d = _match_day(md)
         result.append(MatchData(
             home_id=m["home_team_id"],
             away_id=m["away_team_id"],
@@ -122,12 +220,7 @@ def matches_to_dc_input_xg(matches: list[dict]) -> list[MatchData]:
         md = m.get("match_date")
         if md is None:
             continue
-        if isinstance(md, datetime):
-            d = md.date()
-        elif isinstance(md, date):
-            d = md
-        else:
-            d = datetime.strptime(str(md)[:10], "%Y-%m-%d").date()
+        d = _match_day(md)
         h_xg = float(m["xg_home"]) if m.get("xg_home") is not None else None
         a_xg = float(m["xg_away"]) if m.get("xg_away") is not None else None
         result.append(MatchData(
@@ -223,40 +316,136 @@ STACKING_FEATURE_NAMES = [
 ]
 
 
-def _stacking_predict(features: dict[str, float], model: dict) -> tuple[float, float, float]:
-    """Apply stacking model: logits → softmax → probs (float version)."""
-    x = np.array([features.get(name, 0.0) for name in model["feature_names"]], dtype=np.float64)
-    logits = model["coefficients"] @ x + model["intercept"]
-    logits -= logits.max()
-    exp_logits = np.exp(logits)
-    probs = exp_logits / exp_logits.sum()
-    probs = np.clip(probs, 1e-4, 1.0 - 1e-4)
-    probs = probs / probs.sum()
-    return float(probs[0]), float(probs[1]), float(probs[2])
+# Features walk-forward can reproduce, in the column order of its feature rows.
+# Anything else the model was trained on stays 0.
+WALK_FORWARD_FEATURES = STACKING_FEATURE_NAMES[:11]
+
+
+def _stacking_design_matrix(rows: np.ndarray, model: dict) -> np.ndarray:
+    """Scatter (N, len(WALK_FORWARD_FEATURES)) rows into model["feature_names"] column order."""
+    index = {name: i for i, name in enumerate(WALK_FORWARD_FEATURES)}
+    X = np.zeros((rows.shape[0], len(model["feature_names"])), dtype=np.float64)
+    for j, name in enumerate(model["feature_names"]):
+        i = index.get(name)
+        if i is not None:
+            X[:, j] = rows[:, i]
+    return X
+
+
+def _stacking_predict_batch(X: np.ndarray, model: dict) -> np.ndarray:
+    """Apply stacking model to a (N, n_features) matrix: logits → softmax → probs.
+
+    Rows follow model["feature_names"] order. Returns an (N, 3) array.
+    """
+    logits = X @ model["coefficients"].T + model["intercept"]
+    logits -= logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    np.clip(logits, 1e-4, 1.0 - 1e-4, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
 
 
 # ---------------------------------------------------------------------------
 # Poisson helpers (shared with backtest.py)
 # ---------------------------------------------------------------------------
 
-def _match_probs_dc(lam: float, mu: float, rho: float, k_max: int = 8) -> tuple[float, float, float]:
-    """Dixon-Coles 1X2 probs with tau correction."""
-    p_h, p_d, p_a = 0.0, 0.0, 0.0
+# Log-factorials for goals 0..15 (same table as app.services.dixon_coles)
+_LOG_FACT = np.array([math.lgamma(k + 1) for k in range(16)])
+
+
+def _log_fact_table(k_max: int) -> np.ndarray:
+    if k_max < len(_LOG_FACT):
+        return _LOG_FACT[: k_max + 1]
+    return np.array([math.lgamma(k + 1) for k in range(k_max + 1)])
+
+
+def _dc_outcome_sums(lam: float, mu: float, rho: float, log_fact: np.ndarray) -> tuple[float, float, float]:
+    """Unnormalised DC home/draw/away mass, cell by cell with tau inlined.
+
+    Only used when numba is available (compiled below); as plain Python the
+    NumPy path in _match_probs_dc is faster.
+    """
     log_lam = math.log(max(lam, 0.01))
     log_mu = math.log(max(mu, 0.01))
-    for i in range(k_max + 1):
-        log_pi = i * log_lam - lam - math.lgamma(i + 1)
-        for j in range(k_max + 1):
-            log_pj = j * log_mu - mu - math.lgamma(j + 1)
-            p_ij = math.exp(log_pi + log_pj) * tau_value(i, j, lam, mu, rho)
-            if p_ij < 0:
-                p_ij = 0.0
+    p_h = 0.0
+    p_d = 0.0
+    p_a = 0.0
+    n = log_fact.shape[0]
+    for i in range(n):
+        log_pi = i * log_lam - lam - log_fact[i]
+        for j in range(n):
+            pij = math.exp(log_pi + j * log_mu - mu - log_fact[j])
+            if i == 0 and j == 0:
+                pij *= 1.0 - lam * mu * rho
+            elif i == 0 and j == 1:
+                pij *= 1.0 + lam * rho
+            elif i == 1 and j == 0:
+                pij *= 1.0 + mu * rho
+            elif i == 1 and j == 1:
+                pij *= 1.0 - rho
+            if pij < 0.0:
+                pij = 0.0
             if i > j:
-                p_h += p_ij
+                p_h += pij
             elif i == j:
-                p_d += p_ij
+                p_d += pij
             else:
-                p_a += p_ij
+                p_a += pij
+    return p_h, p_d, p_a
+
+
+if njit is not None:  # pragma: no cover - exercised only where numba is installed
+    # 81 cells per call: compiled scalar loops beat even the dot-product path,
+    # whose cost is NumPy dispatch. Cached on disk so only the first run JITs.
+    _dc_outcome_sums = njit(cache=True)(_dc_outcome_sums)
+
+
+@lru_cache(maxsize=16384)
+def _poisson_pmf_vec(lam: float, k_max: int) -> np.ndarray:
+    """Poisson PMF for goals 0..k_max (read-only, memoised).
+
+    Keyed on the exact λ: every config of a league run refits the same DC
+    params and the same baseline xG means, so identical λ values recur
+    across configs (and across _predict_dc/_predict_dc_xg within 2/3).
+    """
+    goals = np.arange(k_max + 1)
+    pmf = np.exp(goals * math.log(max(lam, 0.01)) - lam - _log_fact_table(k_max))
+    pmf.flags.writeable = False
+    return pmf
+
+
+def _match_probs_dc(lam: float, mu: float, rho: float, k_max: int = 8) -> tuple[float, float, float]:
+    """Dixon-Coles 1X2 probs with tau correction.
+
+    Vectorised over the (k_max+1)² score grid without materialising it:
+    each outcome is a dot product of one PMF against the other's CDF, and
+    tau (1 everywhere except the four low-score cells) is applied as a
+    correction to those cells afterwards. With numba installed the
+    compiled cell-by-cell kernel is used instead.
+    """
+    if njit is not None:  # pragma: no cover - exercised only where numba is installed
+        p_h, p_d, p_a = _dc_outcome_sums(float(lam), float(mu), float(rho), _log_fact_table(k_max))
+    else:
+        pmf_h = _poisson_pmf_vec(float(lam), k_max)
+        pmf_a = _poisson_pmf_vec(float(mu), k_max)
+
+        p_h = float(pmf_h[1:] @ np.cumsum(pmf_a)[:-1])
+        p_d = float(pmf_h @ pmf_a)
+        p_a = float(pmf_a[1:] @ np.cumsum(pmf_h)[:-1])
+        # rho=0 (plain Poisson, DC-xG): tau is 1 everywhere, nothing to patch
+        low = min(k_max, 1) + 1 if rho != 0.0 else 0
+        for i in range(low):
+            for j in range(low):
+                cell = float(pmf_h[i] * pmf_a[j])
+                delta = cell * max(tau_value(i, j, lam, mu, rho), 0.0) - cell
+                if i > j:
+                    p_h += delta
+                elif i == j:
+                    p_d += delta
+                else:
+                    p_a += delta
+
     total = p_h + p_d + p_a
     if total > 0:
         p_h /= total
@@ -265,6 +454,11 @@ def _match_probs_dc(lam: float, mu: float, rho: float, k_max: int = 8) -> tuple[
     return p_h, p_d, p_a
 
 
+def _match_probs_poisson(lam: float, mu: float, k_max: int = 8) -> tuple[float, float, float]:
+    """Independent Poisson 1X2 probs: the DC grid with rho=0 (shares the PMF cache)."""
+    return _match_probs_dc(lam, mu, 0.0, k_max)
+
+
 def _fatigue_factor(rest_hours: float | None) -> float:
     """Piecewise linear fatigue multiplier (float version of build_predictions._fatigue_factor).
 
@@ -290,27 +484,25 @@ def _fatigue_factor(rest_hours: float | None) -> float:
 # ---------------------------------------------------------------------------
 
 def _predict_baseline(
-    match: dict,
+    h: int,
+    a: int,
     state: dict,
 ) -> tuple[float, float, float]:
     """Predict 1X2 using baseline model: rolling xG L5 + Elo adjustment."""
-    h = match["home_team_id"]
-    a = match["away_team_id"]
-
     elo_h = state["ratings"].get(h, DEFAULT_ELO)
     elo_a = state["ratings"].get(a, DEFAULT_ELO)
     elo_diff = elo_h - elo_a
 
-    # Rolling xG L5
-    h_xg_for = state["xg_for"].get(h, [])
-    a_xg_for = state["xg_for"].get(a, [])
-    h_xg_l5 = np.mean(h_xg_for[-5:]) if len(h_xg_for) >= 3 else None
-    a_xg_l5 = np.mean(a_xg_for[-5:]) if len(a_xg_for) >= 3 else None
+    # Rolling xG L5 (histories are deques capped at XG_WINDOW)
+    h_xg_for = state["xg_for"].get(h, ())
+    a_xg_for = state["xg_for"].get(a, ())
+    h_xg_l5 = sum(h_xg_for) / len(h_xg_for) if len(h_xg_for) >= 3 else None
+    a_xg_l5 = sum(a_xg_for) / len(a_xg_for) if len(a_xg_for) >= 3 else None
 
-    h_def = state["xg_against"].get(h, [])
-    a_def = state["xg_against"].get(a, [])
-    h_def_l5 = np.mean(h_def[-5:]) if len(h_def) >= 3 else None
-    a_def_l5 = np.mean(a_def[-5:]) if len(a_def) >= 3 else None
+    h_def = state["xg_against"].get(h, ())
+    a_def = state["xg_against"].get(a, ())
+    h_def_l5 = sum(h_def) / len(h_def) if len(h_def) >= 3 else None
+    a_def_l5 = sum(a_def) / len(a_def) if len(a_def) >= 3 else None
 
     if h_xg_l5 is not None and a_def_l5 is not None:
         lam_h = max(0.1, 0.6 * h_xg_l5 + 0.4 * a_def_l5)
@@ -329,12 +521,20 @@ def _predict_baseline(
     return _match_probs_poisson(lam_h, lam_a)
 
 
-def _update_baseline_state(match: dict, state: dict) -> None:
+def _xg_window() -> deque:
+    return deque(maxlen=XG_WINDOW)
+
+
+def _update_baseline_state(
+    h: int,
+    a: int,
+    gh: int,
+    ga: int,
+    xg_home: float | None,
+    xg_away: float | None,
+    state: dict,
+) -> None:
     """Update Elo, xG history after observing match result."""
-    h = match["home_team_id"]
-    a = match["away_team_id"]
-    gh = match["goals_home"]
-    ga = match["goals_away"]
 
     # Elo update
     elo_h = state["ratings"].get(h, DEFAULT_ELO)
@@ -345,12 +545,12 @@ def _update_baseline_state(match: dict, state: dict) -> None:
     state["ratings"][a] = elo_a + ELO_K * ((1.0 - sh) - (1.0 - exp_h))
 
     # xG history
-    h_xg = float(match["xg_home"]) if match.get("xg_home") is not None else float(gh)
-    a_xg = float(match["xg_away"]) if match.get("xg_away") is not None else float(ga)
-    state["xg_for"].setdefault(h, []).append(h_xg)
-    state["xg_against"].setdefault(h, []).append(a_xg)
-    state["xg_for"].setdefault(a, []).append(a_xg)
-    state["xg_against"].setdefault(a, []).append(h_xg)
+    h_xg = float(xg_home) if xg_home is not None else float(gh)
+    a_xg = float(xg_away) if xg_away is not None else float(ga)
+    state["xg_for"][h].append(h_xg)
+    state["xg_against"][h].append(a_xg)
+    state["xg_for"][a].append(a_xg)
+    state["xg_against"][a].append(h_xg)
 
 
 # ---------------------------------------------------------------------------
@@ -358,7 +558,8 @@ def _update_baseline_state(match: dict, state: dict) -> None:
 # ---------------------------------------------------------------------------
 
 def _predict_dc(
-    match: dict,
+    h: int,
+    a: int,
     state: dict,
 ) -> Optional[tuple[float, float, float]]:
     """Predict 1X2 using Dixon-Coles model.
@@ -369,9 +570,6 @@ def _predict_dc(
     if dc_params is None:
         return None
 
-    h = match["home_team_id"]
-    a = match["away_team_id"]
-
     att_h = dc_params.attack.get(h)
     def_h = dc_params.defense.get(h)
     att_a = dc_params.attack.get(a)
@@ -387,9 +585,66 @@ def _predict_dc(
     return _match_probs_dc(lam, mu, dc_params.rho)
 
 
-def _maybe_refit_dc(state: dict, match_date) -> None:
+def _fit_dc_job(dc_input: list[MatchData], ref: date, fit_kwargs: dict):
+    """Fit DC on a history prefix (module-level so it pickles to workers)."""
+    return fit_dixon_coles(dc_input, ref_date=ref, **fit_kwargs)
+
+
+def _refit_params(state: dict, prefix: str, ref: date, fit_kwargs: dict):
+    """Fit on the current history, or collect the prefetched fit for exactly this point.
+
+    Raises ValueError like fit_dixon_coles; the caller keeps the old params then.
+    """
+    history = state["dc_input"]
+    pending = state.get(f"{prefix}_pending")
+    job = pending.pop(len(history), None) if pending is not None else None
+    if job is not None and job[0] == ref:
+        return job[1].result()
+    return _fit_dc_job(history, ref, fit_kwargs)
+
+
+def _prefetch_refits(state: dict, prefix: str, n_fit: int, fit_kwargs: dict) -> None:
+    """After a successful fit on n_fit matches, start the next refits in the pool.
+
+    Refit points are deterministic while fits succeed: every DC_REFIT_INTERVAL
+    matches, on the history prefix up to that point and dated by the fixture
+    that triggers it (state["refit_schedule"]). Each prefetched fit therefore
+    sees exactly the data and ref date the inline refit would, and results
+    stay identical; only the fitting overlaps with the walk-forward loop.
+    """
+    pool = state.get("refit_pool")
+    if pool is None:
+        return
+    pending = state[f"{prefix}_pending"]
+    schedule = state["refit_schedule"]
+    for k in range(1, REFIT_PREFETCH + 1):
+        n = n_fit + k * DC_REFIT_INTERVAL
+        if n >= len(schedule):
+            break
+        if n in pending or schedule[n] is None:
+            continue
+        pending[n] = (
+            schedule[n],
+            pool.submit(_fit_dc_job, state["refit_inputs"][:n], schedule[n], fit_kwargs),
+        )
+
+
+def _drop_prefetched(state: dict, prefix: str) -> None:
+    """A refit failed: the planned refit points no longer hold, fall back to inline fits."""
+    pending = state.get(f"{prefix}_pending")
+    if pending:
+        for _, fut in pending.values():
+            fut.cancel()
+        pending.clear()
+
+
+_DC_FIT_KWARGS = {"xi": 0.005, "rho_grid_steps": 21}
+_DC_XG_FIT_KWARGS = {"xi": 0.005, "rho_grid_steps": 1, "use_xg": True}
+
+
+def _maybe_refit_dc(state: dict, ref: date) -> None:
     """Refit DC if enough new matches since last fit."""
-    history = state["dc_history"]
+    history = state["dc_input"]
     last_fit_count = state.get("dc_last_fit_count", 0)
 
     if len(history) < DC_MIN_MATCHES:
@@ -398,27 +653,21 @@ def _maybe_refit_dc(state: dict, match_date) -> None:
     if len(history) - last_fit_count < DC_REFIT_INTERVAL and state.get("dc_params") is not None:
         return
 
-    if isinstance(match_date, datetime):
-        ref = match_date.date()
-    elif isinstance(match_date, date):
-        ref = match_date
-    else:
-        ref = datetime.strptime(str(match_date)[:10], "%Y-%m-%d").date()
-
-    dc_input = matches_to_dc_input(history)
     try:
-        params = fit_dixon_coles(dc_input, ref_date=ref, xi=0.005, rho_grid_steps=21)
+        params = _refit_params(state, "dc", ref, _DC_FIT_KWARGS)
         state["dc_params"] = params
         state["dc_last_fit_count"] = len(history)
         log.debug("DC refit: %d matches, %d teams, rho=%.4f",
                   params.n_matches, params.n_teams, params.rho)
+        _prefetch_refits(state, "dc", len(history), _DC_FIT_KWARGS)
     except ValueError as e:
         log.debug("DC refit skipped: %s", e)
+        _drop_prefetched(state, "dc")
 
 
-def _maybe_refit_dc_xg(state: dict, match_date) -> None:
+def _maybe_refit_dc_xg(state: dict, ref: date) -> None:
     """Refit DC-xG if enough new matches since last fit."""
-    history = state["dc_xg_history"]
+    history = state["dc_input"]
     last_fit_count = state.get("dc_xg_last_fit_count", 0)
 
     if len(history) < DC_MIN_MATCHES:
@@ -427,27 +676,21 @@ def _maybe_refit_dc_xg(state: dict, match_date) -> None:
     if len(history) - last_fit_count < DC_REFIT_INTERVAL and state.get("dc_xg_params") is not None:
         return
 
-    if isinstance(match_date, datetime):
-        ref = match_date.date()
-    elif isinstance(match_date, date):
-        ref = match_date
-    else:
-        ref = datetime.strptime(str(match_date)[:10], "%Y-%m-%d").date()
-
-    dc_input = matches_to_dc_input_xg(history)
     try:
-        params = fit_dixon_coles(dc_input, ref_date=ref, xi=0.005,
-                                 rho_grid_steps=1, use_xg=True)
+        params = _refit_params(state, "dc_xg", ref, _DC_XG_FIT_KWARGS)
         state["dc_xg_params"] = params
         state["dc_xg_last_fit_count"] = len(history)
         log.debug("DC-xG refit: %d matches, %d teams, HA=%.4f",
                   params.n_matches, params.n_teams, params.home_advantage)
+        _prefetch_refits(state, "dc_xg", len(history), _DC_XG_FIT_KWARGS)
     except ValueError as e:
         log.debug("DC-xG refit skipped: %s", e)
+        _drop_prefetched(state, "dc_xg")
 
 
 def _predict_dc_xg(
-    match: dict,
+    h: int,
+    a: int,
     state: dict,
 ) -> Optional[tuple[float, float, float]]:
     """Predict 1X2 using DC-xG model (rho=0, no tau correction).
@@ -458,9 +701,6 @@ def _predict_dc_xg(
     if dc_xg_params is None:
         return None
 
-    h = match["home_team_id"]
-    a = match["away_team_id"]
-
     att_h = dc_xg_params.attack.get(h)
     def_h = dc_xg_params.defense.get(h)
     att_a = dc_xg_params.attack.get(a)
@@ -505,6 +745,33 @@ def _logloss(p_h: float, p_d: float, p_a: float, outcome: int) -> float:
     return -math.log(probs[outcome])
 
 
+def _score_batch(probs: np.ndarray, outcomes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorised _rps/_brier/_logloss over (N, 3) probs and (N,) outcome indices."""
+    actual = np.zeros_like(probs)
+    actual[np.arange(len(outcomes)), outcomes] = 1.0
+    diff = probs - actual
+    rps = 0.5 * (diff[:, 0] ** 2 + (diff[:, 0] + diff[:, 1]) ** 2)
+    brier = (diff ** 2).sum(axis=1)
+    logloss = -np.log(np.maximum(probs[np.arange(len(outcomes)), outcomes], 1e-15))
+    return rps, brier, logloss
+
+
+def _attach_scores(results: list[dict], probs: np.ndarray, outcomes: np.ndarray) -> None:
+    """Set p_h/p_d/p_a and rps/brier/logloss on each result dict, in row order."""
+    if not results:
+        return
+    rps, brier, logloss = _score_batch(probs, outcomes)
+    for r, (p_h, p_d, p_a), s_rps, s_brier, s_ll in zip(
+        results, probs.tolist(), rps.tolist(), brier.tolist(), logloss.tolist(),
+    ):
+        r["p_h"] = p_h
+        r["p_d"] = p_d
+        r["p_a"] = p_a
+        r["rps"] = s_rps
+        r["brier"] = s_brier
+        r["logloss"] = s_ll
+
+
 # ---------------------------------------------------------------------------
 # Walk-forward evaluation
 # ---------------------------------------------------------------------------
@@ -515,6 +782,7 @@ def walk_forward_evaluate(
     warmup: int = 50,
     odds_map: dict[int, dict] | None = None,
     stacking_model: dict | None = None,
+    refit_executor: Executor | None = None,
 ) -> list[dict]:
     """Walk-forward evaluation for a given config.
 
@@ -527,71 +795,92 @@ def walk_forward_evaluate(
         warmup: Number of matches to skip before scoring.
         odds_map: {fixture_id: {fair_home, fair_draw, fair_away}} for stacking.
         stacking_model: {coefficients, intercept, feature_names} for configs 2,3.
+        refit_executor: Optional pool for DC refits. Upcoming refits are fitted
+            ahead in it; results are identical to inline refits.
 
     Returns:
         List of per-match result dicts with p_h, p_d, p_a, outcome, rps, etc.
     """
     state = {
         "ratings": {},
-        "xg_for": {},
-        "xg_against": {},
-        "last_match_dt": {},  # team_id → datetime of last match (for rest hours)
+        "xg_for": defaultdict(_xg_window),
+        "xg_against": defaultdict(_xg_window),
+        "last_match_us": {},  # team_id → _match_time_us of last match (for rest hours)
     }
 
+    # MatchData of every observed result, appended as the walk-forward goes;
+    # DC and DC-xG both fit on it (xG fields are ignored by the goals fit)
+    use_dc = config_id in (1, 10, 11, 2, 3)
+    if use_dc:
+        state["dc_input"] = []
+
     if config_id in (1, 10, 2, 3):
-        state["dc_history"] = []
         state["dc_params"] = None
         state["dc_last_fit_count"] = 0
 
     if config_id in (11, 2, 3):
-        state["dc_xg_history"] = []
         state["dc_xg_params"] = None
         state["dc_xg_last_fit_count"] = 0
 
-    if odds_map is None:
-        odds_map = {}
+    cols = fixtures_to_columns(fixtures)
+
+    if refit_executor is not None and use_dc:
+        # DC history is every fixture with a result, in order; refit_schedule[n]
+        # is the ref date of the scored fixture that sees exactly n of them.
+        scored = [i for i in range(len(fixtures))
+                  if cols.goals_home[i] is not None and cols.goals_away[i] is not None
+                  and cols.match_day[i] is not None]
+        state["refit_pool"] = refit_executor
+        state["refit_inputs"] = [_column_match_data(cols, i) for i in scored]
+        state["refit_schedule"] = [cols.match_day[i] if i >= warmup else None for i in scored]
+        state["dc_pending"] = {}
+        state["dc_xg_pending"] = {}
 
     results = []
     use_rest = (config_id == 10)
 
-    for idx, match in enumerate(fixtures):
-        gh = match.get("goals_home")
-        ga = match.get("goals_away")
+    probs_buf = np.empty((len(fixtures), 3), dtype=np.float64)
+    outcomes_buf = np.empty(len(fixtures), dtype=np.intp)
+
+    # Configs 2/3: stacking feature rows, predicted in one batch after the loop
+    stacked_rows: list[int] = []
+    n_stacked = 0
+    if config_id in (2, 3) and stacking_model is not None:
+        feat_buf = np.empty((len(fixtures), len(WALK_FORWARD_FEATURES)), dtype=np.float64)
+
+    if config_id in (2, 3):
+        fair_home, _, fair_away = odds_columns(cols.fixture_id, odds_map or {})
+
+    for idx in range(len(fixtures)):
+        gh = cols.goals_home[idx]
+        ga = cols.goals_away[idx]
         if gh is None or ga is None:
             continue
 
+        h = cols.home_id[idx]
+        a = cols.away_id[idx]
         outcome = compute_outcome(int(gh), int(ga))
 
         # --- Prediction phase (before observing result) ---
         if idx >= warmup:
             if config_id == 0:
-                p_h, p_d, p_a = _predict_baseline(match, state)
+                p_h, p_d, p_a = _predict_baseline(h, a, state)
 
             elif config_id in (1, 10):
                 # Try DC, fallback to baseline
-                _maybe_refit_dc(state, match["match_date"])
-                dc_probs = _predict_dc(match, state)
+                _maybe_refit_dc(state, cols.match_day[idx])
+                dc_probs = _predict_dc(h, a, state)
                 if dc_probs is not None:
                     p_h, p_d, p_a = dc_probs
 
                     # Config 10: apply fatigue adjustment to DC lambda/mu
                     if use_rest:
-                        h = match["home_team_id"]
-                        a = match["away_team_id"]
-                        md = match["match_date"]
-                        if isinstance(md, str):
-                            md = datetime.strptime(md[:19], "%Y-%m-%d %H:%M:%S" if len(md) > 10 else "%Y-%m-%d")
-
-                        h_rest = None
-                        a_rest = None
-                        h_last = state["last_match_dt"].get(h)
-                        a_last = state["last_match_dt"].get(a)
-                        if h_last is not None:
-                            delta = md - h_last
-                            h_rest = delta.total_seconds() / 3600.0
-                        if a_last is not None:
-                            delta = md - a_last
-                            a_rest = delta.total_seconds() / 3600.0
+                        # Same rounding as timedelta.total_seconds() / 3600
+                        md_us = cols.match_us[idx]
+                        h_last = state["last_match_us"].get(h)
+                        a_last = state["last_match_us"].get(a)
+                        h_rest = (md_us - h_last) / 1_000_000 / 3600.0 if h_last is not None else None
+                        a_rest = (md_us - a_last) / 1_000_000 / 3600.0 if a_last is not None else None
 
                         h_fatigue = _fatigue_factor(h_rest)
                         a_fatigue = _fatigue_factor(a_rest)
@@ -612,96 +901,85 @@ def walk_forward_evaluate(
                                     mu = max(0.01, min(10.0, mu * a_fatigue))
                                     p_h, p_d, p_a = _match_probs_dc(lam, mu, dc_params.rho)
                 else:
-                    p_h, p_d, p_a = _predict_baseline(match, state)
+                    p_h, p_d, p_a = _predict_baseline(h, a, state)
 
             elif config_id == 11:
                 # DC-xG: fit on xG, rho=0
-                _maybe_refit_dc_xg(state, match["match_date"])
-                dc_xg_probs = _predict_dc_xg(match, state)
+                _maybe_refit_dc_xg(state, cols.match_day[idx])
+                dc_xg_probs = _predict_dc_xg(h, a, state)
                 if dc_xg_probs is not None:
                     p_h, p_d, p_a = dc_xg_probs
                 else:
-                    p_h, p_d, p_a = _predict_baseline(match, state)
+                    p_h, p_d, p_a = _predict_baseline(h, a, state)
 
             elif config_id in (2, 3):
                 # DC + Stacking (and optionally Dirichlet for config 3, applied post-hoc)
-                _maybe_refit_dc(state, match["match_date"])
-                _maybe_refit_dc_xg(state, match["match_date"])
+                _maybe_refit_dc(state, cols.match_day[idx])
+                _maybe_refit_dc_xg(state, cols.match_day[idx])
 
                 # Get DC probs (goals + xG)
-                dc_probs = _predict_dc(match, state)
-                dc_xg_probs = _predict_dc_xg(match, state)
+                dc_probs = _predict_dc(h, a, state)
+                dc_xg_probs = _predict_dc_xg(h, a, state)
                 # Get Poisson probs
-                pois_probs = _predict_baseline(match, state)
+                pois_probs = _predict_baseline(h, a, state)
                 # Elo diff
-                h = match["home_team_id"]
-                a = match["away_team_id"]
                 elo_h = state["ratings"].get(h, DEFAULT_ELO)
                 elo_a = state["ratings"].get(a, DEFAULT_ELO)
                 elo_diff = elo_h - elo_a
-                # Fair odds
-                fid = match["fixture_id"]
-                odds = odds_map.get(fid, {})
 
                 if dc_probs is not None and stacking_model is not None:
                     # DC-xG: fallback to DC-goals if unavailable
                     dc_xg = dc_xg_probs if dc_xg_probs is not None else dc_probs
-                    features = {
-                        "p_home_poisson": pois_probs[0],
-                        "p_draw_poisson": pois_probs[1],
-                        "p_away_poisson": pois_probs[2],
-                        "p_home_dc": dc_probs[0],
-                        "p_draw_dc": dc_probs[1],
-                        "p_away_dc": dc_probs[2],
-                        "p_home_dc_xg": dc_xg[0],
-                        "p_draw_dc_xg": dc_xg[1],
-                        "p_away_dc_xg": dc_xg[2],
-                        "elo_diff": elo_diff,
-                        "fair_delta": odds.get("fair_home", 0.0) - odds.get("fair_away", 0.0),
-                    }
-                    p_h, p_d, p_a = _stacking_predict(features, stacking_model)
+                    # Positional row in WALK_FORWARD_FEATURES order; the model's
+                    # column order is applied once for the whole batch after the loop
+                    feat_buf[n_stacked] = (
+                        pois_probs[0], pois_probs[1], pois_probs[2],
+                        dc_probs[0], dc_probs[1], dc_probs[2],
+                        dc_xg[0], dc_xg[1], dc_xg[2],
+                        elo_diff,
+                        fair_home[idx] - fair_away[idx],
+                    )
+                    stacked_rows.append(len(results))
+                    n_stacked += 1
+                    p_h, p_d, p_a = dc_probs
                 elif dc_probs is not None:
                     p_h, p_d, p_a = dc_probs
                 else:
                     p_h, p_d, p_a = pois_probs
 
             else:
-                p_h, p_d, p_a = _predict_baseline(match, state)
-
-            rps = _rps(p_h, p_d, p_a, outcome)
-            brier = _brier(p_h, p_d, p_a, outcome)
-            logloss = _logloss(p_h, p_d, p_a, outcome)
+                p_h, p_d, p_a = _predict_baseline(h, a, state)
 
+            # Probs and metrics are attached in one batch after the loop
+            probs_buf[len(results)] = (p_h, p_d, p_a)
+            outcomes_buf[len(results)] = outcome
             results.append({
-                "fixture_id": match["fixture_id"],
-                "league_id": match["league_id"],
-                "match_date": str(match["match_date"])[:10],
+                "fixture_id": cols.fixture_id[idx],
+                "league_id": cols.league_id[idx],
+                "match_date": str(cols.match_date[idx])[:10],
                 "outcome": outcome,
-                "p_h": p_h,
-                "p_d": p_d,
-                "p_a": p_a,
-                "rps": rps,
-                "brier": brier,
-                "logloss": logloss,
             })
 
         # --- Update phase (observe result) ---
-        _update_baseline_state(match, state)
+        _update_baseline_state(h, a, gh, ga, cols.xg_home[idx], cols.xg_away[idx], state)
 
-        if config_id in (1, 10, 2, 3):
-            state["dc_history"].append(match)
-        if config_id in (11, 2, 3):
-            state["dc_xg_history"].append(match)
+        if use_dc and cols.match_day[idx] is not None:
+            state["dc_input"].append(_column_match_data(cols, idx))
 
         # Track last match datetime for rest hours
-        h = match["home_team_id"]
-        a = match["away_team_id"]
-        md = match["match_date"]
-        if isinstance(md, str):
-            md = datetime.strptime(md[:19], "%Y-%m-%d %H:%M:%S" if len(md) > 10 else "%Y-%m-%d")
-        state["last_match_dt"][h] = md
-        state["last_match_dt"][a] = md
+        md_us = cols.match_us[idx]
+        state["last_match_us"][h] = md_us
+        state["last_match_us"][a] = md_us
 
+    if n_stacked:
+        X = _stacking_design_matrix(feat_buf[:n_stacked], stacking_model)
+        probs_buf[stacked_rows] = _stacking_predict_batch(X, stacking_model)
+
+    for prefix in ("dc", "dc_xg"):
+        _drop_prefetched(state, prefix)
+
+    n = len(results)
+    _attach_scores(results, probs_buf[:n], outcomes_buf[:n])
     return results
 
 
@@ -734,23 +1012,70 @@ def apply_dirichlet_calibration(results: list[dict], calib_split: float = 0.7) -
     probs_test = np.array([[r["p_h"], r["p_d"], r["p_a"]] for r in results[split_idx:]])
     probs_cal = calibrator.calibrate(probs_test)
 
-    calibrated_results = []
-    for i, r in enumerate(results[split_idx:]):
-        p_h, p_d, p_a = float(probs_cal[i, 0]), float(probs_cal[i, 1]), float(probs_cal[i, 2])
-        outcome = r["outcome"]
-        calibrated_results.append({
-            **r,
-            "p_h": p_h,
-            "p_d": p_d,
-            "p_a": p_a,
-            "rps": _rps(p_h, p_d, p_a, outcome),
-            "brier": _brier(p_h, p_d, p_a, outcome),
-            "logloss": _logloss(p_h, p_d, p_a, outcome),
-        })
-
+    calibrated_results = [dict(r) for r in results[split_idx:]]
+    outcomes_test = np.array([r["outcome"] for r in calibrated_results], dtype=np.intp)
+    _attach_scores(calibrated_results, np.asarray(probs_cal, dtype=np.float64), outcomes_test)
     return calibrated_results
 
 
+def run_config(
+    fixtures: list[dict],
+    config_id: int,
+    warmup: int,
+    odds_map: dict[int, dict] | None,
+    stacking_model: dict | None,
+    refit_workers: int = 0,
+) -> list[dict]:
+    """Walk-forward for one config, including the post-hoc Dirichlet step of config 3.
+
+    With refit_workers > 0, DC refits of the DC-based configs are fitted ahead
+    in a process pool of that size.
+    """
+    if refit_workers > 0 and config_id in (1, 10, 11, 2, 3):
+        with ProcessPoolExecutor(max_workers=refit_workers) as pool:
+            results = walk_forward_evaluate(
+                fixtures, config_id, warmup=warmup,
+                odds_map=odds_map, stacking_model=stacking_model,
+                refit_executor=pool,
+            )
+    else:
+        results = walk_forward_evaluate(
+            fixtures, config_id, warmup=warmup,
+            odds_map=odds_map, stacking_model=stacking_model,
+        )
+    if config_id == 3:
+        results = apply_dirichlet_calibration(results)
+    return results
+
+
+def submit_configs(
+    executor: ProcessPoolExecutor | None,
+    fixtures: list[dict],
+    config_ids: list[int],
+    warmup: int,
+    odds_map: dict[int, dict] | None,
+    stacking_model: dict | None,
+    refit_workers: int = 0,
+) -> dict[int, Future]:
+    """Start every config on the same fixtures; {config_id: future of results}.
+
+    Configs share no state, so with an executor they run in parallel worker
+    processes. Without one they run here, one after another.
+    """
+    futures: dict[int, Future] = {}
+    for cfg_id in config_ids:
+        log.info("  Running config %d: %s ...", cfg_id, CONFIG_NAMES.get(cfg_id, f"Config {cfg_id}"))
+        if executor is not None:
+            futures[cfg_id] = executor.submit(
+                run_config, fixtures, cfg_id, warmup, odds_map, stacking_model, refit_workers,
+            )
+        else:
+            fut: Future = Future()
+            fut.set_result(run_config(fixtures, cfg_id, warmup, odds_map, stacking_model, refit_workers))
+            futures[cfg_id] = fut
+    return futures
+
+
 # ---------------------------------------------------------------------------
 # Aggregation & comparison
 # ---------------------------------------------------------------------------
@@ -861,6 +1186,12 @@ def main():
                         help="Run ablation per league and aggregate (default: true)")
     parser.add_argument("--no-per-league", dest="per_league", action="store_false",
                         help="Run all leagues in single walk-forward (slower for DC)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for running configs in parallel "
+                             "(default: one per config, up to CPU count; 1 = sequential)")
+    parser.add_argument("--refit-workers", type=int, default=0,
+                        help="Extra processes per DC config that fit upcoming DC refits "
+                             "ahead of the walk-forward loop (default: 0 = inline refits)")
     args = parser.parse_args()
 
     database_url = os.environ.get("DATABASE_URL", "")
@@ -885,6 +1216,9 @@ def main():
         log.error("No valid config IDs specified")
         sys.exit(1)
 
+    workers = args.workers if args.workers is not None else min(len(config_ids), os.cpu_count() or 1)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
     conn = _get_conn(database_url)
 
     # Load stacking model if needed
@@ -900,6 +1234,7 @@ def main():
         # Run per-league and aggregate
         all_results: dict[int, dict[int, list[dict]]] = {cfg: {} for cfg in config_ids}
         per_league_metrics: dict[int, dict[int, dict]] = {cfg: {} for cfg in config_ids}
+        league_jobs: dict[int, dict[int, Future]] = {}
 
         for lid in leagues:
             log.info("\n===== League %d =====", lid)
@@ -914,23 +1249,22 @@ def main():
                 odds_map = load_hist_odds(conn, fids)
                 log.info("  Loaded odds for %d fixtures", len(odds_map))
 
-            for cfg_id in config_ids:
-                name = CONFIG_NAMES.get(cfg_id, f"Config {cfg_id}")
-                log.info("  Running config %d: %s ...", cfg_id, name)
-                results = walk_forward_evaluate(
-                    league_fixtures, cfg_id, warmup=args.warmup,
-                    odds_map=odds_map, stacking_model=stacking_model_data,
-                )
-                if cfg_id == 3:
-                    results = apply_dirichlet_calibration(results)
+            # Later leagues load while earlier ones are still running in the pool
+            league_jobs[lid] = submit_configs(
+                executor, league_fixtures, config_ids, args.warmup,
+                odds_map, stacking_model_data, args.refit_workers,
+            )
+
+        conn.close()
 
+        for lid, jobs in league_jobs.items():
+            for cfg_id, job in jobs.items():
+                results = job.result()
                 all_results[cfg_id][lid] = results
                 metrics = aggregate_metrics(results)
                 per_league_metrics[cfg_id][lid] = metrics
-                log.info("    Config %d: %d matches, RPS=%.4f",
-                         cfg_id, metrics["n"], metrics["rps"] or 0)
-
-        conn.close()
+                log.info("  League %d config %d: %d matches, RPS=%.4f",
+                         lid, cfg_id, metrics["n"], metrics["rps"] or 0)
 
         # Aggregate across leagues (weighted by N)
         all_metrics: dict[int, dict] = {}
@@ -978,21 +1312,20 @@ def main():
             sys.exit(1)
 
         all_metrics = {}
-        for cfg_id in config_ids:
-            name = CONFIG_NAMES.get(cfg_id, f"Config {cfg_id}")
-            log.info("\nRunning config %d: %s ...", cfg_id, name)
-            results = walk_forward_evaluate(
-                fixtures, cfg_id, warmup=args.warmup,
-                odds_map=odds_map, stacking_model=stacking_model_data,
-            )
-            if cfg_id == 3:
-                results = apply_dirichlet_calibration(results)
-            metrics = aggregate_metrics(results)
+        jobs = submit_configs(
+            executor, fixtures, config_ids, args.warmup,
+            odds_map, stacking_model_data, args.refit_workers,
+        )
+        for cfg_id, job in jobs.items():
+            metrics = aggregate_metrics(job.result())
             all_metrics[cfg_id] = metrics
             log.info("  Config %d: %d scored matches, RPS=%.4f, Brier=%.4f, LogLoss=%.4f",
                      cfg_id, metrics["n"],
                      metrics["rps"] or 0, metrics["brier"] or 0, metrics["logloss"] or 0)
 
+    if executor is not None:
+        executor.shutdown()
+
     # Global comparison table
     rows = build_comparison_table(all_metrics)
     print_comparison_table(rows)
@@ -8,18 +8,29 @@ import os
 import sys
 import tempfile
 
+import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scripts.ablation_study import (
     _brier,
+    _dc_outcome_sums,
+    _log_fact_table,
     _logloss,
+    _match_probs_dc,
+    _match_probs_poisson,
+    _match_time_us,
+    _poisson_pmf_vec,
+    _stacking_design_matrix,
     _rps,
+    _score_batch,
     aggregate_metrics,
     build_comparison_table,
     compute_outcome,
     matches_to_dc_input,
+    odds_columns,
+    submit_configs,
     walk_forward_evaluate,
 )
 
@@ -137,6 +148,15 @@ class TestScoring:
         ll = _logloss(0.01, 0.01, 0.98, 0)
         assert ll > 3.0
 
+    def test_batch_matches_scalar(self):
+        probs = np.array([[0.5, 0.3, 0.2], [0.1, 0.2, 0.7], [0.0, 1.0, 0.0], [0.4, 0.4, 0.2]])
+        outcomes = np.array([0, 2, 0, 1])
+        rps, brier, logloss = _score_batch(probs, outcomes)
+        for i, (p, o) in enumerate(zip(probs.tolist(), outcomes.tolist())):
+            assert rps[i] == pytest.approx(_rps(*p, o))
+            assert brier[i] == pytest.approx(_brier(*p, o))
+            assert logloss[i] == pytest.approx(_logloss(*p, o))
+
 
 # ---------------------------------------------------------------------------
 # aggregate_metrics / empty results
@@ -184,6 +204,107 @@ class TestComparisonTable:
         assert rows[0]["delta_rps"] is None
 
 
+# ---------------------------------------------------------------------------
+# _match_probs_dc
+# ---------------------------------------------------------------------------
+
+class TestMatchProbsDc:
+    @staticmethod
+    def _reference(lam: float, mu: float, rho: float, k_max: int = 8) -> tuple[float, float, float]:
+        """Cell-by-cell score grid the vectorised version must reproduce."""
+        from app.services.dixon_coles import tau_value
+
+        p = [0.0, 0.0, 0.0]
+        for i in range(k_max + 1):
+            for j in range(k_max + 1):
+                pij = (
+                    math.exp(i * math.log(lam) - lam - math.lgamma(i + 1))
+                    * math.exp(j * math.log(mu) - mu - math.lgamma(j + 1))
+                    * tau_value(i, j, lam, mu, rho)
+                )
+                p[0 if i > j else 1 if i == j else 2] += max(pij, 0.0)
+        total = sum(p)
+        return p[0] / total, p[1] / total, p[2] / total
+
+    @pytest.mark.parametrize("lam,mu,rho", [
+        (1.4, 1.1, -0.08),
+        (0.3, 2.7, 0.1),
+        (2.2, 0.4, -1.2),  # tau clipped at zero on a low-score cell
+        (1.0, 1.0, 0.0),
+    ])
+    def test_matches_reference_grid(self, lam, mu, rho):
+        got = _match_probs_dc(lam, mu, rho)
+        for g, e in zip(got, self._reference(lam, mu, rho)):
+            assert g == pytest.approx(e, abs=1e-12)
+
+    def test_small_k_max(self):
+        for k in (0, 1, 2):
+            got = _match_probs_dc(1.3, 1.1, -0.05, k_max=k)
+            for g, e in zip(got, self._reference(1.3, 1.1, -0.05, k_max=k)):
+                assert g == pytest.approx(e, abs=1e-12)
+
+    def test_poisson_is_rho_zero_grid(self):
+        from app.services.math_utils import match_probs_poisson
+
+        for lam, mu in [(1.3, 1.1), (0.1, 2.4), (3.2, 0.6)]:
+            assert _match_probs_poisson(lam, mu) == pytest.approx(match_probs_poisson(lam, mu), abs=1e-12)
+
+    def test_scalar_kernel_matches(self):
+        """The numba kernel body (run here as plain Python) agrees with the NumPy path."""
+        kernel = getattr(_dc_outcome_sums, "py_func", _dc_outcome_sums)
+        for lam, mu, rho in [(1.4, 1.1, -0.08), (2.2, 0.4, -1.2), (0.05, 3.0, 0.2)]:
+            sums = kernel(lam, mu, rho, _log_fact_table(8))
+            total = sum(sums)
+            got = tuple(x / total for x in sums)
+            for g, e in zip(got, self._reference(lam, mu, rho)):
+                assert g == pytest.approx(e, abs=1e-12)
+
+    def test_pmf_vectors_are_memoised(self):
+        _poisson_pmf_vec.cache_clear()
+        first = _poisson_pmf_vec(1.37, 8)
+        assert _poisson_pmf_vec(1.37, 8) is first
+        info = _poisson_pmf_vec.cache_info()
+        assert info.misses == 1 and info.hits == 1
+        assert not first.flags.writeable
+
+
+# ---------------------------------------------------------------------------
+# stacking features
+# ---------------------------------------------------------------------------
+
+class TestStackingDesignMatrix:
+    def test_scatters_into_model_order(self):
+        rows = np.arange(22, dtype=np.float64).reshape(2, 11)
+        model = {"feature_names": ["fair_delta", "h2h_draw_rate", "p_home_poisson", "elo_diff"]}
+        X = _stacking_design_matrix(rows, model)
+        assert X.tolist() == [[10.0, 0.0, 0.0, 9.0], [21.0, 0.0, 11.0, 20.0]]
+
+
+class TestMatchTimeUs:
+    def test_deltas_match_datetime_subtraction(self):
+        from datetime import datetime, timedelta, timezone
+
+        a = datetime(2024, 3, 31, 0, 30, tzinfo=timezone(timedelta(hours=1)))
+        b = datetime(2024, 4, 3, 20, 0, 0, 250_000, tzinfo=timezone(timedelta(hours=2)))
+        assert (_match_time_us(b) - _match_time_us(a)) / 1_000_000 == (b - a).total_seconds()
+
+    def test_strings_and_dates(self):
+        from datetime import date
+
+        assert _match_time_us("2024-03-01 15:30:00") - _match_time_us("2024-02-27") == 87.5 * 3600 * 1_000_000
+        assert _match_time_us(date(2024, 3, 1)) == _match_time_us("2024-03-01")
+        assert _match_time_us(None) is None
+
+
+class TestOddsColumns:
+    def test_joins_by_position_with_zero_default(self):
+        odds_map = {2: {"fair_home": 0.5, "fair_draw": 0.3, "fair_away": 0.2}}
+        fair_h, fair_d, fair_a = odds_columns([1, 2, 3], odds_map)
+        assert fair_h == [0.0, 0.5, 0.0]
+        assert fair_d == [0.0, 0.3, 0.0]
+        assert fair_a == [0.0, 0.2, 0.0]
+
+
 # ---------------------------------------------------------------------------
 # walk_forward_evaluate with synthetic data
 # ---------------------------------------------------------------------------
@@ -240,3 +361,45 @@ class TestWalkForward:
         assert len(results) > 0
         for r in results:
             assert r["p_h"] + r["p_d"] + r["p_a"] == pytest.approx(1.0, abs=0.01)
+
+    def test_config_2_stacking_batch(self):
+        """Stacked rows are predicted after the loop; metrics must follow the final probs."""
+        model = {
+            "coefficients": np.zeros((3, 11)),
+            "intercept": np.array([0.5, 0.0, -0.5]),
+            "feature_names": [
+                "p_home_poisson", "p_draw_poisson", "p_away_poisson",
+                "p_home_dc", "p_draw_dc", "p_away_dc",
+                "p_home_dc_xg", "p_draw_dc_xg", "p_away_dc_xg",
+                "elo_diff", "fair_delta",
+            ],
+        }
+        expected = np.exp(model["intercept"]) / np.exp(model["intercept"]).sum()
+        fixtures = self._make_fixtures(120)
+        results = walk_forward_evaluate(fixtures, config_id=2, warmup=40, stacking_model=model)
+        stacked = [r for r in results if r["p_h"] == pytest.approx(expected[0])]
+        assert stacked
+        for r in stacked:
+            assert (r["p_d"], r["p_a"]) == pytest.approx((expected[1], expected[2]))
+            assert r["rps"] == pytest.approx(_rps(r["p_h"], r["p_d"], r["p_a"], r["outcome"]))
+            assert r["logloss"] == pytest.approx(_logloss(r["p_h"], r["p_d"], r["p_a"], r["outcome"]))
+
+    def test_submit_configs_parallel_matches_sequential(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        fixtures = self._make_fixtures(90)
+        sequential = submit_configs(None, fixtures, [0, 1], 30, None, None)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel = submit_configs(executor, fixtures, [0, 1], 30, None, None)
+            for cfg_id in (0, 1):
+                assert parallel[cfg_id].result() == sequential[cfg_id].result()
+
+    def test_prefetched_refits_match_inline(self):
+        """Refits fitted ahead in a pool must give exactly the inline results."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        fixtures = self._make_fixtures(200)
+        inline = walk_forward_evaluate(fixtures, config_id=1, warmup=40)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            prefetched = walk_forward_evaluate(fixtures, config_id=1, warmup=40, refit_executor=pool)
+        assert prefetched == inline
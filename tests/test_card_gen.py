@@ -125,6 +125,7 @@ def test_card_gen_image_snapshots_all():
     _bmod._playwright_instance = None
     _bmod._browser = None
     _bmod._lock = asyncio.Lock()
+    _bmod._contexts = {}
 
     manifest = _load_manifest(IMAGE_MANIFEST_PATH)
     failures: list[str] = []
@@ -246,3 +247,170 @@ class TestCardGenStructure:
         # Check status display (may be HTML-escaped)
         assert "\u0412\u042b\u0418\u0413\u0420\u042b\u0428" in win_html or "&#" in win_html
         assert "\u041f\u0420\u041e\u0418\u0413\u0420\u042b\u0428" in loss_html or "&#" in loss_html
+
+    def test_text_width_units_matches_html_image(self):
+        """Memoised per-character widths must keep the port in lockstep with html_image."""
+        from app.services.card_gen.fonts import text_width_units
+        from app.services.html_image import _text_width_units
+
+        for text in ("", "Manchester United", "WWW iii 123", "<b>Арсенал</b> ⚽️", "  MW@#%& ilIjtfr  "):
+            assert text_width_units(text) == _text_width_units(text)
+        assert text_width_units("Wi 1") == pytest.approx(1.04 + 0.45 + 0.32 + 0.72)
+
+    def test_templates_compiled_once(self):
+        """Compiled templates are reused across renders."""
+        first = _jinja_env.get_template("cards/prediction.html.j2")
+        assert _jinja_env.get_template("cards/prediction.html.j2") is first
+        assert _jinja_env.auto_reload is False
+
+    def test_placeholder_svg_memoised(self):
+        """Fallback logos for the same initial/colour are built once."""
+        from app.services.card_gen.assets import make_fallback_logo, placeholder_svg
+
+        placeholder_svg.cache_clear()
+        first = make_fallback_logo("Arsenal", (200, 16, 46))
+        assert first.startswith("data:image/svg+xml;base64,")
+        assert make_fallback_logo("Aston Villa", (200, 16, 46)) is first
+        assert placeholder_svg.cache_info().hits == 1
+
+    @staticmethod
+    def _reference_accent(pixels, fallback):
+        """Per-pixel loop of JS ``accentFromImage`` the vectorised version must reproduce."""
+        from app.services.card_gen.palette import _ALPHA_THRESHOLD, _SAT_THRESHOLD, _WEIGHT_OFFSET
+
+        total = rs = gs = bs = 0.0
+        for r, g, b, a in pixels:
+            if a < _ALPHA_THRESHOLD:
+                continue
+            sat = max(r, g, b) - min(r, g, b)
+            if sat < _SAT_THRESHOLD:
+                continue
+            weight = sat + _WEIGHT_OFFSET
+            total += weight
+            rs += r * weight
+            gs += g * weight
+            bs += b * weight
+        if total <= 0:
+            return fallback
+        return (rs / total, gs / total, bs / total)
+
+    def test_vectorised_accent_matches_pixel_loop(self):
+        """NumPy accent extraction must equal the JS-ported per-pixel loop."""
+        import io
+
+        import numpy as np
+        from PIL import Image
+
+        from app.services.card_gen.palette import _accent_from_array, extract_team_color
+
+        rng = np.random.default_rng(7)
+        rgba = rng.integers(0, 256, size=(30, 30, 4), dtype=np.uint8)
+        pixels = [tuple(int(v) for v in px) for px in rgba.reshape(-1, 4)]
+        assert _accent_from_array(rgba, (1, 2, 3)) == self._reference_accent(pixels, (1, 2, 3))
+
+        transparent = np.zeros((4, 4, 4), dtype=np.uint8)
+        assert _accent_from_array(transparent, (1, 2, 3)) == (1, 2, 3)
+
+        buf = io.BytesIO()
+        Image.fromarray(rgba, "RGBA").save(buf, format="PNG")
+        color = extract_team_color(1, buf.getvalue(), use_cache=False)
+        assert len(color) == 3 and all(0 <= c <= 255 for c in color)
+
+
+def test_screenshot_reuses_context_per_width(monkeypatch):
+    """One browser context per viewport width; every screenshot gets its own page."""
+    import asyncio
+
+    import app.services.card_gen.browser as bmod
+
+    class _Locator:
+        async def count(self):
+            return 0
+
+    class _Page:
+        closed = False
+
+        async def set_content(self, html, wait_until=None):
+            pass
+
+        async def wait_for_function(self, script, timeout=None):
+            pass
+
+        def locator(self, sel):
+            return _Locator()
+
+        async def screenshot(self, **kwargs):
+            return b"png"
+
+        async def close(self):
+            self.closed = True
+
+    class _Context:
+        def __init__(self):
+            self.pages = []
+
+        async def new_page(self):
+            page = _Page()
+            self.pages.append(page)
+            return page
+
+        async def close(self):
+            pass
+
+    class _Browser:
+        def __init__(self):
+            self.contexts = []
+
+        async def new_context(self, **kwargs):
+            ctx = _Context()
+            self.contexts.append((kwargs["viewport"]["width"], ctx))
+            return ctx
+
+    browser = _Browser()
+
+    async def _fake_ensure_browser():
+        return browser
+
+    monkeypatch.setattr(bmod, "_ensure_browser", _fake_ensure_browser)
+    monkeypatch.setattr(bmod, "_contexts", {})
+    monkeypatch.setattr(bmod, "_lock", asyncio.Lock())
+
+    async def _run():
+        assert await bmod.screenshot("<html></html>", width=1280) == b"png"
+        assert await bmod.screenshot("<html></html>", width=1280) == b"png"
+        assert await bmod.screenshot("<html></html>", width=900) == b"png"
+
+    asyncio.run(_run())
+
+    assert [w for w, _ in browser.contexts] == [1280, 900]
+    pages = browser.contexts[0][1].pages
+    assert len(pages) == 2 and all(p.closed for p in pages)
+
+
+def test_render_card_reuses_identical_cards(monkeypatch):
+    """Identical card data is screenshotted once; changed data renders again."""
+    import asyncio
+    import dataclasses
+
+    import app.services.card_gen.browser as bmod
+    import app.services.card_gen.optimizer as omod
+    import app.services.card_gen.renderer as rmod
+
+    calls: list[int] = []
+
+    async def _fake_screenshot(html, width=1280, **kwargs):
+        calls.append(width)
+        return f"png-{len(calls)}".encode()
+
+    monkeypatch.setattr(bmod, "screenshot", _fake_screenshot)
+    monkeypatch.setattr(omod, "optimize_for_telegram", lambda png: png + b"-jpeg")
+    monkeypatch.setattr(rmod, "_render_cache", rmod.OrderedDict())
+
+    card = next(c["card_data"] for c in CASES if isinstance(c["card_data"], PredictionCardData))
+    first = asyncio.run(rmod.render_card(card))
+    assert asyncio.run(rmod.render_card(card)) == first
+    assert len(calls) == 1
+
+    changed = dataclasses.replace(card, league=(card.league or "") + " X")
+    assert asyncio.run(rmod.render_card(changed)) != first
+    assert len(calls) == 2
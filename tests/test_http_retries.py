@@ -95,3 +95,18 @@ def test_request_with_retries_retries_on_request_error():
 
     asyncio.run(_run())
     assert calls["count"] == 2
+
+
+def test_request_with_retries_stream_returns_readable_response():
+    def handler(request):
+        return httpx.Response(200, content=b"x" * 1024, request=request)
+
+    async def _run():
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport, base_url="https://example.com") as client:
+            resp = await request_with_retries(client, "GET", "/logo.png", retries=0, stream=True)
+            body = b"".join([chunk async for chunk in resp.aiter_bytes()])
+            await resp.aclose()
+            assert body == b"x" * 1024
+
+    asyncio.run(_run())
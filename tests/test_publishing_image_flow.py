@@ -5,12 +5,16 @@ from app.services import publishing
 
 
 class _Result:
-    def __init__(self, row=None):
+    def __init__(self, row=None, rows=None):
         self._row = row
+        self._rows = rows if rows is not None else ([row] if row is not None else [])
 
     def first(self):
         return self._row
 
+    def all(self):
+        return list(self._rows)
+
 
 class _FakeSession:
     def __init__(self, *, existing_ok_publication: bool = False, lock_available: bool = True):
@@ -24,6 +28,9 @@ class _FakeSession:
         sql = str(statement)
         if "pg_try_advisory_xact_lock" in sql:
             return _Result(SimpleNamespace(ok=self.lock_available))
+        if "FROM prediction_publications" in sql:
+            rows = [("TOTAL", "en", None)] if self.existing_ok_publication else []
+            return _Result(rows=rows)
         if self.existing_ok_publication:
             return _Result((1,))
         return _Result(None)
@@ -239,6 +246,126 @@ def test_publish_fixture_skips_when_already_published(monkeypatch):
     assert records[-1]["kwargs"]["payload"]["reason"] == "already_published"
 
 
+def test_publish_fixture_sends_languages_concurrently(monkeypatch):
+    _configure_settings(monkeypatch, publish_headline_image=False)
+    monkeypatch.setattr(publishing.settings, "telegram_channel_de", "-1009876543210", raising=False)
+    monkeypatch.setattr(publishing.settings, "publish_concurrency", 4, raising=False)
+    _install_common_mocks(monkeypatch)
+
+    records = []
+    in_flight = 0
+    peak = 0
+
+    async def fake_record_publication(*args, **kwargs):
+        records.append({"args": args, "kwargs": kwargs})
+
+    async def fake_send_message_parts(channel_id, parts, reply_to_message_id=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [channel_id]
+
+    monkeypatch.setattr(publishing, "_record_publication", fake_record_publication)
+    monkeypatch.setattr(publishing, "send_message_parts", fake_send_message_parts)
+
+    session = _FakeSession(existing_ok_publication=False)
+    result = asyncio.run(publishing.publish_fixture(session, 1388515, dry_run=False, force=False))
+
+    assert [r["lang"] for r in result["results"]] == list(publishing.settings.telegram_channels)
+    assert all(r["status"] == "ok" for r in result["results"])
+    assert peak == 2
+    assert session.committed is True
+    assert [r["args"][3] for r in records] == list(publishing.settings.telegram_channels)
+    assert all(r["args"][5] == "published" for r in records)
+
+
+def test_publish_fixture_dry_run_skips_content_hash(monkeypatch):
+    _configure_settings(monkeypatch, publish_headline_image=True)
+    _install_common_mocks(monkeypatch)
+
+    records = []
+
+    async def fake_record_publication(*args, **kwargs):
+        records.append({"args": args, "kwargs": kwargs})
+
+    def fail_hash(*_args, **_kwargs):
+        raise AssertionError("dry runs must not hash content")
+
+    monkeypatch.setattr(publishing, "_record_publication", fake_record_publication)
+    monkeypatch.setattr(publishing, "_hash_content", fail_hash)
+
+    session = _FakeSession(existing_ok_publication=False)
+    result = asyncio.run(publishing.publish_fixture(session, 1388515, dry_run=True, force=False))
+
+    assert result["results"][0]["status"] == "dry_run"
+    assert records[-1]["args"][5] == "dry_run"
+    assert "content_hash" not in records[-1]["kwargs"]
+    assert records[-1]["kwargs"]["payload"]["analysis"] == "Model analysis"
+
+
+def test_publish_fixture_text_posts_keep_headline_before_analysis(monkeypatch):
+    _configure_settings(monkeypatch, publish_headline_image=False)
+    _install_common_mocks(monkeypatch)
+
+    sent = []
+
+    async def fake_record_publication(*_args, **_kwargs):
+        return None
+
+    async def fake_send_message_parts(channel_id, parts, reply_to_message_id=None):
+        await asyncio.sleep(0.01 if "HOT PREDICTION" in parts[0] else 0)
+        sent.append(parts[0].splitlines()[0])
+        return [len(sent)]
+
+    monkeypatch.setattr(publishing, "_record_publication", fake_record_publication)
+    monkeypatch.setattr(publishing, "send_message_parts", fake_send_message_parts)
+
+    session = _FakeSession(existing_ok_publication=False)
+    result = asyncio.run(publishing.publish_fixture(session, 1388515, dry_run=False, force=False))
+
+    assert result["results"][0]["status"] == "ok"
+    assert sent == ["HOT PREDICTION", "Model analysis"]
+
+
+def test_publish_fixture_keeps_channel_markets_in_order(monkeypatch):
+    _configure_settings(monkeypatch, publish_headline_image=False)
+    monkeypatch.setattr(publishing.settings, "publish_concurrency", 4, raising=False)
+    _install_common_mocks(monkeypatch)
+
+    preview, data = _fixture_data()
+    preview["markets"].insert(0, {**preview["markets"][0], "market": "1X2"})
+
+    async def fake_build_preview_internal(_session, _fixture_id):
+        return preview, data
+
+    def fake_build_market_text(_fixture, _pred, _indices, market, *_args, **_kwargs):
+        return f"HEADLINE {market}", f"ANALYSIS {market}"
+
+    sent = []
+
+    async def fake_record_publication(*_args, **_kwargs):
+        return None
+
+    async def fake_send_message_parts(channel_id, parts, reply_to_message_id=None):
+        # The first market's posts are slower: overlapping markets would interleave.
+        await asyncio.sleep(0.02 if parts[0].endswith("1X2") else 0)
+        sent.append(parts[0])
+        return [len(sent)]
+
+    monkeypatch.setattr(publishing, "_build_preview_internal", fake_build_preview_internal)
+    monkeypatch.setattr(publishing, "_build_market_text", fake_build_market_text)
+    monkeypatch.setattr(publishing, "_record_publication", fake_record_publication)
+    monkeypatch.setattr(publishing, "send_message_parts", fake_send_message_parts)
+
+    session = _FakeSession(existing_ok_publication=False)
+    result = asyncio.run(publishing.publish_fixture(session, 1388515, dry_run=False, force=False))
+
+    assert [r["status"] for r in result["results"]] == ["ok", "ok"]
+    assert sent == ["HEADLINE 1X2", "ANALYSIS 1X2", "HEADLINE TOTAL", "ANALYSIS TOTAL"]
+
+
 def test_build_post_preview_includes_image_and_messages(monkeypatch):
     _configure_settings(monkeypatch, publish_headline_image=True)
     _install_common_mocks(monkeypatch)
@@ -261,3 +388,49 @@ def test_build_post_preview_includes_image_and_messages(monkeypatch):
     assert post["image_data_url"].startswith("data:image/png;base64,")
     assert post["messages"][0]["type"] == "image"
     assert any(msg["type"] == "text" for msg in post["messages"])
+
+
+def test_build_post_preview_skips_blocked_bodies_in_auto_mode(monkeypatch):
+    _configure_settings(monkeypatch, publish_headline_image=True)
+    _install_common_mocks(monkeypatch)
+    preview, data = _fixture_data()
+    preview["mode"] = "auto"
+    preview["markets"][0]["quality_level"] = 2
+
+    async def fake_build_preview_internal(_session, _fixture_id):
+        return preview, data
+
+    def fail_render(*_args, **_kwargs):
+        raise AssertionError("blocked market must not be rendered")
+
+    monkeypatch.setattr(publishing, "_build_preview_internal", fake_build_preview_internal)
+    monkeypatch.setattr(publishing, "render_headline_image_html", fail_render)
+
+    session = _FakeSession(existing_ok_publication=False, lock_available=True)
+    result = asyncio.run(publishing.build_post_preview(session, 1388515, lang="ru"))
+    post = result["posts"][0]
+    assert post["status"] == "blocked"
+    assert post["reason"] == "quality_risk"
+    assert post["publish_allowed"] is False
+    assert post["messages"] == []
+
+    monkeypatch.setattr(publishing, "render_headline_image_html", lambda *_a, **_k: b"fake-png")
+    result = asyncio.run(publishing.build_post_preview(session, 1388515, lang="ru", include_blocked_bodies=True))
+    post = result["posts"][0]
+    assert post["status"] == "blocked"
+    assert post["analysis"]
+
+
+def test_post_preview_endpoint_renders_blocked_bodies_for_ui(monkeypatch):
+    from app import main
+
+    captured = {}
+
+    async def fake_build_post_preview(_session, _fixture_id, **kwargs):
+        captured.update(kwargs)
+        return {}
+
+    monkeypatch.setattr(main.publishing, "build_post_preview", fake_build_post_preview)
+    monkeypatch.setattr(main.settings, "publish_mode", "auto")
+    asyncio.run(main.api_publish_post_preview(1388515, _=None, session=object()))
+    assert captured["include_blocked_bodies"] is True
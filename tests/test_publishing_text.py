@@ -0,0 +1,547 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services import publishing
+
+
+def test_split_message_short_text_is_single_part():
+    assert publishing._split_message("hello\n\nworld", max_len=50) == ["hello\n\nworld"]
+
+
+def test_split_message_prefers_paragraph_breaks():
+    text = "\n\n".join(["a" * 30, "b" * 30, "c" * 30])
+    parts = publishing._split_message(text, max_len=70)
+    assert parts == [f"{'a' * 30}\n\n{'b' * 30}", "c" * 30]
+
+
+def test_split_message_falls_back_to_line_breaks_and_hard_cuts():
+    text = "\n".join(["a" * 30, "b" * 30]) + "\n\n" + "c" * 95
+    parts = publishing._split_message(text, max_len=40)
+    assert parts == ["a" * 30, "b" * 30, "c" * 40, "c" * 40, "c" * 15]
+    assert all(len(p) <= 40 for p in parts)
+
+
+def test_split_message_drops_empty_paragraphs():
+    text = "a" * 20 + "\n\n\n\n\n" + "b" * 20
+    parts = publishing._split_message(text, max_len=25)
+    assert parts == ["a" * 20, "b" * 20]
+
+
+def test_translate_reason_maps_known_reasons():
+    assert publishing._translate_reason("малый объём (12)", "en") == "small sample (12)"
+    assert publishing._translate_reason("Brier 0.281", "en") == "Brier 0.281"
+    assert publishing._translate_reason("нет отчёта качества", "ru") == "нет отчёта качества"
+    assert publishing._translate_reason("  custom reason ", "en") == "custom reason"
+    assert publishing._translate_reasons(["", "CLV coverage 0%"], "en") == [
+        publishing._lang_pack("en")["reason_clv_zero"]
+    ]
+
+
+def test_format_template_matches_str_format_for_all_packs():
+    kwargs = {"team": "Arsenal", "odd": "2.10", "pct": 7.345, "a": 72, "b": 48, "value": "0.281", "bets": "12"}
+
+    def _walk(node):
+        if isinstance(node, str):
+            assert publishing._format_template(node, **kwargs) == node.format(**kwargs)
+        elif isinstance(node, dict):
+            for value in node.values():
+                _walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                _walk(value)
+
+    _walk(publishing._LANG_TEXT)
+    assert publishing._format_template("{{x}} {pct:+.1f}", pct=1.5) == "{x} +1.5"
+
+
+def test_escape_html_and_protect():
+    assert publishing._escape_html('a & b <c> "d"') == "a &amp; b &lt;c&gt; &quot;d&quot;"
+    assert publishing._protect("R&D") == "<x>R&amp;D</x>"
+    assert publishing._strip_protect_tags("<x>R&amp;D</x> vs <x>B</x>") == "R&amp;D vs B"
+
+
+def test_build_standing_index_walks_all_groups_once():
+    payload = {
+        "response": [
+            {
+                "league": {
+                    "standings": [
+                        [{"team": {"id": 1}, "rank": 1}, "junk", {"team": {"id": "2"}, "rank": 2}],
+                        [{"team": {"id": 1}, "rank": 9}, {"team": {}, "rank": 3}],
+                    ]
+                }
+            },
+            None,
+        ]
+    }
+    index = publishing._build_standing_index(payload)
+    assert index[1]["rank"] == 1
+    assert index[2]["rank"] == 2
+    assert set(index) == {1, 2}
+    assert publishing._build_standing_index({"response": "bad"}) == {}
+
+
+def test_logo_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(publishing, "_logo_cache", publishing.OrderedDict())
+    monkeypatch.setattr(publishing, "_logo_cache_bytes", 0)
+    monkeypatch.setattr(publishing, "_LOGO_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(publishing, "_LOGO_CACHE_MAX_BYTES", 10)
+
+    publishing._logo_cache_put("a", b"1234")
+    publishing._logo_cache_put("b", b"1234")
+    assert publishing._logo_cache_get("a") == b"1234"
+    publishing._logo_cache_put("c", b"1234")
+    assert publishing._logo_cache_get("b") is None
+    assert list(publishing._logo_cache) == ["a", "c"]
+
+    publishing._logo_cache_put("d", b"123456789")
+    assert list(publishing._logo_cache) == ["d"]
+    assert publishing._logo_cache_bytes == 9
+
+
+def test_logo_cache_expires_after_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(publishing, "_logo_cache", publishing.OrderedDict())
+    monkeypatch.setattr(publishing, "_logo_cache_bytes", 0)
+    monkeypatch.setattr(publishing.time, "monotonic", lambda: clock[0])
+
+    publishing._logo_cache_put("a", b"1234")
+    clock[0] += publishing._LOGO_CACHE_TTL_SECONDS - 1
+    assert publishing._logo_cache_get("a") == b"1234"
+    clock[0] += 2
+    assert publishing._logo_cache_get("a") is None
+    assert publishing._logo_cache_bytes == 0
+
+
+def test_fetch_logo_bytes_single_flight(monkeypatch):
+    calls = []
+
+    async def fake_download(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return b"logo"
+
+    async def _run():
+        return await asyncio.gather(*(publishing._fetch_logo_bytes(" https://cdn.test/a.png ") for _ in range(5)))
+
+    monkeypatch.setattr(publishing, "_download_logo", fake_download)
+    assert asyncio.run(_run()) == [b"logo"] * 5
+    assert calls == ["https://cdn.test/a.png"]
+    assert publishing._logo_inflight == {}
+
+
+def test_fetch_logo_bytes_aborts_oversized_stream(monkeypatch):
+    bodies = {"/small.png": b"png" * 10, "/huge.png": b"x" * 4096}
+
+    def handler(request):
+        return httpx.Response(200, content=bodies[request.url.path], request=request)
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(publishing, "assets_client", lambda: client)
+            small = await publishing._fetch_logo_bytes("https://cdn.test/small.png")
+            huge = await publishing._fetch_logo_bytes("https://cdn.test/huge.png")
+        return small, huge
+
+    monkeypatch.setattr(publishing, "_logo_cache", publishing.OrderedDict())
+    monkeypatch.setattr(publishing, "_logo_cache_bytes", 0)
+    monkeypatch.setattr(publishing, "_LOGO_MAX_BYTES", 1024)
+    small, huge = asyncio.run(_run())
+    assert small == b"png" * 10
+    assert huge is None
+    assert list(publishing._logo_cache) == ["https://cdn.test/small.png"]
+
+
+def test_fetch_logo_bytes_revalidates_expired_entries(monkeypatch):
+    clock = [1000.0]
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(200, content=b"logo", headers={"ETag": '"v1"'}, request=request)
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(publishing, "assets_client", lambda: client)
+            first = await publishing._fetch_logo_bytes("https://cdn.test/a.png")
+            clock[0] += publishing._LOGO_CACHE_TTL_SECONDS + 1
+            second = await publishing._fetch_logo_bytes("https://cdn.test/a.png")
+            third = await publishing._fetch_logo_bytes("https://cdn.test/a.png")
+        return first, second, third
+
+    monkeypatch.setattr(publishing, "_logo_cache", publishing.OrderedDict())
+    monkeypatch.setattr(publishing, "_logo_stale", publishing.OrderedDict())
+    monkeypatch.setattr(publishing, "_logo_cache_bytes", 0)
+    monkeypatch.setattr(publishing.time, "monotonic", lambda: clock[0])
+    assert asyncio.run(_run()) == (b"logo", b"logo", b"logo")
+    assert seen == [None, '"v1"']
+    assert publishing._logo_stale == {}
+
+
+def test_extract_protected_values():
+    text = "<x>Arsenal</x> vs <x>Chelsea</x>\n@ <x>2.10</x>"
+    assert publishing._extract_protected_values(text) == ["Arsenal", "Chelsea", "2.10"]
+    assert publishing._extract_protected_values("") == []
+
+
+def test_extract_1x2_chances():
+    payload = {
+        "candidates": [
+            {"selection": "home_win", "prob": "0.5"},
+            {"selection": "DRAW", "prob": 0.25},
+            {"selection": "AWAY_WIN", "prob": -1},
+            {"selection": "OVER_2_5", "prob": 0.6},
+            "junk",
+        ]
+    }
+    assert publishing._extract_1x2_chances(payload) == (0.5, 0.25, None)
+    assert publishing._extract_1x2_chances('{"candidates": [{"selection": "AWAY_WIN", "prob": 0.3}]}') == (
+        None,
+        None,
+        0.3,
+    )
+    assert publishing._extract_1x2_chances(None) == (None, None, None)
+
+
+def test_pick_variant_is_deterministic_per_seed():
+    variants = ["a", "b", "c", "d"]
+    first = publishing._pick_variant(variants, 1388515, "1X2", "hot", "ru", "why")
+    assert first == publishing._pick_variant(variants, 1388515, "1X2", "hot", "ru", "why")
+    assert publishing._pick_variant(["only"], "anything") == "only"
+    picks = {publishing._pick_variant(variants, fixture_id, "why") for fixture_id in range(200)}
+    assert picks == set(variants)
+    assert publishing._variant_text({"k": []}, "k", "fallback", 1) == "fallback"
+    assert publishing._variant_text({"k": "single"}, "k", "fallback", 1) == "single"
+
+
+def test_fetch_image_visual_context_tolerates_partial_failures(monkeypatch):
+    from types import SimpleNamespace
+
+    async def fake_fixture(_session, fixture_id, metric_league_id=None):
+        return {"response": [{"league": {"country": "England", "round": "R1"}, "fixture": {"venue": {"name": "Emirates"}}}]}
+
+    async def failing_standings(_league_id, _season):
+        raise RuntimeError("standings down")
+
+    monkeypatch.setattr(publishing, "get_fixture_by_id", fake_fixture)
+    monkeypatch.setattr(publishing, "_fetch_standings_payload", failing_standings)
+    fixture = SimpleNamespace(id=1, league_id=39, season=2024, home_team_id=10, away_team_id=20)
+
+    ctx = asyncio.run(publishing._fetch_image_visual_context(object(), fixture))
+    assert ctx.league_country == "England"
+    assert ctx.venue_name == "Emirates"
+    assert ctx.home_rank is None
+
+
+def test_fixed_precision_formatters():
+    values = (None, "x", 0, 1.005, "2.755", 0.4623)
+    assert [publishing._fmt_float2(v) for v in values] == ["—", "—", "0.00", "1.00", "2.75", "0.46"]
+    assert [publishing._fmt_percent1(v) for v in values] == ["—", "—", "0.0%", "100.5%", "275.5%", "46.2%"]
+    assert [publishing._fmt_percent100_1(v) for v in values] == ["—", "—", "0.0%", "1.0%", "2.8%", "0.5%"]
+
+
+def test_fetch_fixture_data_splits_single_row():
+    fields = publishing._FIXTURE_FIELDS
+    row = {name: None for name in fields}
+    row.update(id=7, home_name="Arsenal", away_name="Chelsea")
+    row.update(p1_found=True, pt_found=False, mi_found=True, decision_1x2_payload={"candidates": []})
+    row.update({f"p1_{name}": None for name in publishing._PRED_1X2_FIELDS})
+    row.update({f"pt_{name}": None for name in publishing._PRED_TOTAL_FIELDS})
+    row.update({f"mi_{name}": 1.0 for name in publishing._INDICES_FIELDS})
+    row["p1_selection_code"] = "HOME_WIN"
+    queries = []
+
+    class _Result:
+        def __init__(self, value):
+            self.value = value
+
+        def mappings(self):
+            return self
+
+        def first(self):
+            return self.value
+
+    class _Session:
+        async def execute(self, stmt, params):
+            queries.append(params)
+            return _Result(row if params["fid"] == 7 else None)
+
+    data = asyncio.run(publishing._fetch_fixture_data(_Session(), 7))
+    assert len(queries) == 1
+    assert data["fixture"].home_name == "Arsenal"
+    assert data["pred_1x2"].selection_code == "HOME_WIN"
+    assert data["pred_total"] is None
+    assert data["indices"].home_rest_hours == 1.0
+    assert data["decision_1x2"] == {"candidates": []}
+
+    with pytest.raises(ValueError, match="fixture not found"):
+        asyncio.run(publishing._fetch_fixture_data(_Session(), 8))
+
+
+def test_resolve_titles_matches_variant_text_and_is_cached():
+    seed_base = "1388515:1X2:hot:en"
+    pack = publishing._lang_pack("en")
+    titles = publishing._resolve_titles("en", seed_base)
+    assert titles.why == publishing._variant_text(pack, "why_variants", pack["why"], seed_base, "why")
+    assert titles.no_risks == publishing._variant_text(pack, "no_risks_variants", pack["no_risks"], seed_base, "no_risks")
+    assert publishing._resolve_titles("en", seed_base) is titles
+
+
+def test_calc_ev_is_exact_at_tier_thresholds():
+    from decimal import Decimal
+
+    ev = publishing._calc_ev(Decimal("0.70"), Decimal("1.60"))
+    assert ev == 0.12
+    assert publishing._prediction_tier(ev, None, False) == "hot"
+    assert publishing._calc_ev(Decimal("0.55"), Decimal("2.10")) == pytest.approx(0.155)
+    assert publishing._calc_ev("0.5", 2) == pytest.approx(0.0)
+    assert publishing._calc_ev(None, 2.0) is None
+    assert publishing._calc_ev("bad", 2.0) is None
+
+
+def test_record_publication_buffers_rows_for_batched_insert(monkeypatch):
+    executed = []
+
+    class _Session:
+        async def execute(self, stmt, params):
+            executed.append(params)
+
+    monkeypatch.setattr(publishing, "_PUBLICATION_BATCH_SIZE", 2)
+    session = _Session()
+    pending = []
+
+    async def _run():
+        for lang in ("ru", "en", "uk"):
+            await publishing._record_publication(
+                session, 1, "1X2", lang, 100, "skipped", experimental=False, payload={"reason": "x"}, buffer=pending
+            )
+        assert executed == []
+        await publishing._record_publications(session, pending)
+        await publishing._record_publication(session, 1, "1X2", "ru", 100, "published", experimental=True)
+
+    asyncio.run(_run())
+    assert [len(batch["fid"]) for batch in executed] == [2, 1, 1]
+    assert all(set(batch) == set(publishing._PUBLICATION_COLUMNS) for batch in executed)
+    assert executed[0]["lang"] == ["ru", "en"]
+    assert json.loads(executed[0]["payload"][0]) == {"reason": "x"}
+    assert executed[0]["published_at"] == [None, None]
+    assert executed[2]["published_at"][0] is not None
+
+
+def test_dump_payload_keeps_unicode_readable():
+    payload = {"headline": "Прогноз «Арсенал»", "render_time_ms": 12, "ids": [1, 2], "ok": None}
+    dumped = publishing._dump_payload(payload)
+    assert "Прогноз" in dumped
+    assert json.loads(dumped) == payload
+
+
+def test_restore_translated_html_and_plain_indicator_text():
+    assert publishing._restore_translated_html("a  <BR/>  b<br>c\nd") == "a\nb\nc d"
+    assert publishing._plain_indicator_text("📈  VALUE   OVERVIEW ") == "VALUE OVERVIEW"
+    assert publishing._plain_indicator_text(None) == ""
+
+
+def test_image_jobs_run_on_one_dedicated_thread():
+    import threading
+
+    def _thread_name(suffix, *, sep):
+        return f"{threading.current_thread().name}{sep}{suffix}"
+
+    async def _run():
+        return await asyncio.gather(*(publishing._run_image_job(_thread_name, i, sep=":") for i in range(4)))
+
+    names = asyncio.run(_run())
+    assert {name.split(":")[0] for name in names} == {names[0].split(":")[0]}
+    assert names[0].startswith("headline-img")
+    assert [name.split(":")[1] for name in names] == ["0", "1", "2", "3"]
+
+
+def test_quality_from_report_is_memoized_per_report_version(monkeypatch):
+    monkeypatch.setattr(publishing, "_quality_cache", {})
+    report = {"generated_at": "2026-02-21T10:00:00+00:00", "1x2": {"summary": {"bets": 12, "clv_cov_pct": 0}}}
+    level, reasons = publishing._quality_from_report(report, "1X2")
+    assert (level, reasons) == (1, ["малый объём (12)", "CLV coverage 0%"])
+    reasons.append("mutated")
+
+    report["1x2"]["summary"]["bets"] = 500
+    assert publishing._quality_from_report(report, "1X2") == (1, ["малый объём (12)", "CLV coverage 0%"])
+    report["generated_at"] = "2026-02-21T11:00:00+00:00"
+    assert publishing._quality_from_report(report, "1X2") == (1, ["CLV coverage 0%"])
+    assert publishing._quality_from_report(None, "TOTAL") == (1, ["нет отчёта качества"])
+
+
+def test_image_labels_are_plain_and_cached():
+    labels = publishing._image_labels("en")
+    pack = publishing._lang_pack("en")
+    assert labels.bookmakers == publishing._plain_indicator_text(pack["bookmakers_give"])
+    assert labels.edge_suffix == publishing._plain_indicator_text(pack["edge_short"])
+    assert publishing._image_labels("en") is labels
+
+
+def test_content_hash_and_idempotency_key():
+    import hashlib
+
+    content_hash = publishing._hash_content("head", "body")
+    assert content_hash == hashlib.blake2b(b"headbody", digest_size=32).hexdigest()
+    assert len(content_hash) == 64
+    key = publishing._build_idempotency_key(1388515, "1X2", "ru", -100123, content_hash)
+    assert len(key) == 32
+    assert key == publishing._build_idempotency_key(1388515, "1X2", "ru", -100123, content_hash)
+    other_content = publishing._hash_content("head", "body!")
+    variants = {
+        publishing._build_idempotency_key(1388516, "1X2", "ru", -100123, content_hash),
+        publishing._build_idempotency_key(1388515, "TOTAL", "ru", -100123, content_hash),
+        publishing._build_idempotency_key(1388515, "1X2", "en", -100123, content_hash),
+        publishing._build_idempotency_key(1388515, "1X2", "ru", -100124, content_hash),
+        publishing._build_idempotency_key(1388515, "1X2", "ru", -100123, other_content),
+    }
+    assert key not in variants
+    assert len(variants) == 5
+
+
+def test_publish_reservation_key_is_stable_positive_bigint():
+    key = publishing._publish_reservation_key(1388515)
+    assert key == publishing._publish_reservation_key(1388515)
+    assert 0 <= key <= 0x7FFF_FFFF_FFFF_FFFF
+    assert key != publishing._publish_reservation_key(1388516)
+
+
+def test_render_headline_png_reuses_identical_renders(monkeypatch):
+    calls = []
+
+    def fake_render(image_text, **kwargs):
+        calls.append(image_text)
+        return f"png:{image_text}:{kwargs['bet_label']}".encode()
+
+    monkeypatch.setattr(publishing, "_render_cache", publishing.OrderedDict())
+    monkeypatch.setattr(publishing, "render_headline_image_html", fake_render)
+
+    key, image = publishing._render_headline_png("HOT", bet_label="Under 2.5", home_logo=b"\x89PNG")
+    again_key, again = publishing._render_headline_png("HOT", home_logo=b"\x89PNG", bet_label="Under 2.5")
+    assert (again_key, again) == (key, image)
+    assert calls == ["HOT"]
+
+    other_key, other = publishing._render_headline_png("HOT", bet_label="Over 2.5", home_logo=b"\x89PNG")
+    assert other_key != key
+    assert other == b"png:HOT:Over 2.5"
+    assert len(calls) == 2
+
+
+def test_indicator_helpers_match_pack_lookups():
+    pack = publishing._lang_pack("en")
+    assert publishing._tier_bet_label("en", "strong") == publishing._bet_label(pack, "strong")
+    title = publishing._indicator_title("en", 1388515, "TOTAL")
+    assert title == publishing._indicator_title("en", 1388515, "TOTAL")
+    expected = publishing._variant_text(
+        pack, "value_variants", pack.get("value_indicators", "VALUE INDICATORS"),
+        1388515, "TOTAL", "en", "signal_title",
+    )
+    assert title == (publishing._plain_indicator_text(expected) or "VALUE INDICATORS")
+
+    labels = publishing._image_labels("en")
+    line_1, line_2 = publishing._indicator_lines("en", 0.4, 0.5, 0.1)
+    assert line_1 == f"{labels.bookmakers}: {publishing._fmt_percent1(0.4)}"
+    assert line_2 == f"{labels.model}: {publishing._fmt_percent1(0.5)} (+10.0% {labels.edge_suffix})"
+    assert "(" not in publishing._indicator_lines("en", 0.4, 0.5, None)[1]
+
+
+def test_fetch_image_visual_context_caches_complete_results(monkeypatch):
+    from types import SimpleNamespace
+
+    calls = []
+
+    async def fake_fixture(_session, fixture_id, metric_league_id=None):
+        calls.append(fixture_id)
+        return {"response": [{"league": {"country": "England", "round": "R1"}}]}
+
+    async def fake_standings(_league_id, _season):
+        return {"response": []}
+
+    monkeypatch.setattr(publishing, "_visual_context_cache", {})
+    monkeypatch.setattr(publishing, "get_fixture_by_id", fake_fixture)
+    monkeypatch.setattr(publishing, "_fetch_standings_payload", fake_standings)
+    fixture = SimpleNamespace(id=7, league_id=39, season=2024, home_team_id=10, away_team_id=20)
+
+    first = asyncio.run(publishing._fetch_image_visual_context(object(), fixture))
+    first.league_round = "mutated"
+    second = asyncio.run(publishing._fetch_image_visual_context(object(), fixture))
+    assert calls == [7]
+    assert second.league_country == "England"
+    assert second.league_round == "R1"
+
+
+def test_build_preview_internal_memoizes_unchanged_fixture_data(monkeypatch):
+    from types import SimpleNamespace
+
+    pred = SimpleNamespace(selection="OVER_2_5", confidence=0.55, initial_odd=1.9, value_index=0.04)
+    data = {
+        "fixture": SimpleNamespace(id=1),
+        "pred_1x2": None,
+        "pred_total": pred,
+        "indices": None,
+        "decision_1x2": None,
+    }
+    builds = []
+
+    async def fake_fetch(_session, _fixture_id):
+        return dict(data)
+
+    async def fake_report(_session):
+        return None
+
+    async def fake_markets(_session, fetched, _report):
+        builds.append(fetched["pred_total"].confidence)
+        market = publishing.MarketPreview("TOTAL", "h", "a", "h", "a", False, 0, ["r"])
+        return [market], {"TOTAL": "derived"}
+
+    monkeypatch.setattr(publishing, "_preview_cache", {})
+    monkeypatch.setattr(publishing, "_fetch_fixture_data", fake_fetch)
+    monkeypatch.setattr(publishing.quality_report, "get_cached", fake_report)
+    monkeypatch.setattr(publishing, "_build_preview_markets", fake_markets)
+
+    preview, first = asyncio.run(publishing._build_preview_internal(None, 1))
+    preview["markets"][0]["reasons"].append("mutated")
+    first["derived"]["TOTAL"] = "mutated"
+    preview, second = asyncio.run(publishing._build_preview_internal(None, 1))
+    assert builds == [0.55]
+    assert preview["markets"][0]["reasons"] == ["r"]
+    assert second["derived"] == {"TOTAL": "derived"}
+
+    data["pred_total"] = SimpleNamespace(**{**vars(pred), "confidence": 0.6})
+    asyncio.run(publishing._build_preview_internal(None, 1))
+    assert builds == [0.55, 0.6]
+
+    monkeypatch.setattr(publishing.settings, "groq_model", "other-model")
+    asyncio.run(publishing._build_preview_internal(None, 1))
+    monkeypatch.setattr(publishing.settings, "publish_mode", "auto")
+    asyncio.run(publishing._build_preview_internal(None, 1))
+    assert builds == [0.55, 0.6, 0.6, 0.6]
+
+
+def test_normalize_translated_text_cleans_deepl_artifacts():
+    text = "Arsenal  VS\tChelsea\r\nKoef\n  : 2.10\n:x"
+    assert publishing._normalize_translated_text(text, ["Arsenal", "2.10", ""]) == "Arsenal vs Chelsea\nKoef: 2.10:x"
+    assert publishing._normalize_translated_text("", ["Arsenal"]) == ""
+    assert publishing._protected_value_res("2.10") is publishing._protected_value_res("2.10")
+
+
+def test_split_message_memoizes_long_texts():
+    text = "\n\n".join(f"paragraph {i} " + "x" * 30 for i in range(6))
+    parts = publishing._split_message(text, max_len=70)
+    parts.append("mutated")
+    again = publishing._split_message(text, max_len=70)
+    assert again == parts[:-1]
+    assert publishing._split_long_message.cache_info().hits >= 1
+
+
+def test_indicator_lines_are_memoized_on_exact_values():
+    from decimal import Decimal
+
+    first = publishing._indicator_lines("ru", 0.4235, Decimal("0.5"), 0.0765)
+    assert publishing._indicator_lines("ru", 0.4235, Decimal("0.5"), 0.0765) is first
+    assert publishing._indicator_lines("ru", 0.45, Decimal("0.5"), 0.0765)[0] != first[0]
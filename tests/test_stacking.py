@@ -132,3 +132,35 @@ class TestStackingPredict:
         assert isinstance(p_home, Decimal)
         assert isinstance(p_draw, Decimal)
         assert isinstance(p_away, Decimal)
+
+    def test_repeated_calls_do_not_leak_features(self):
+        """A feature set by one call is zero again when the next call omits it."""
+        model = _make_model()
+        full = {name: 0.3 for name in FEATURE_NAMES}
+        partial = {"p_home_poisson": 0.3, "unknown_feature": 9.0}
+        expected = model.predict(partial)
+        model.predict(full)
+        assert model.predict(partial) == expected
+        assert model.predict({"p_home_poisson": 0.3}) == expected
+
+
+class TestStackingPredictBatch:
+    def test_matches_single_predictions(self):
+        """predict_batch() rows agree with predict() after Decimal rounding."""
+        model = _make_model()
+        rng = np.random.RandomState(7)
+        feats = [
+            {name: float(rng.rand()) for name in FEATURE_NAMES if rng.rand() > 0.3}
+            for _ in range(20)
+        ]
+        feats.append({"unknown_feature": 1.0})
+        probs = model.predict_batch(feats)
+        assert probs.shape == (len(feats), 3)
+        np.testing.assert_allclose(probs.sum(axis=1), 1.0)
+        for row, features in zip(probs, feats):
+            expected = model.predict(features)
+            assert tuple(D(str(round(p, 6))).quantize(Decimal("0.0001")) for p in row) == expected
+
+    def test_empty_batch(self):
+        model = _make_model()
+        assert model.predict_batch([]).shape == (0, 3)
@@ -85,3 +85,32 @@ def test_send_message_raises_on_non_retryable(monkeypatch):
 
     assert len(calls) == 1
     assert len(sleeps) == 0
+
+
+def test_send_photo_reuses_uploaded_file_id(monkeypatch):
+    requests = []
+    payloads = [
+        {"ok": True, "result": {"message_id": 301, "photo": [{"file_id": "small"}, {"file_id": "full"}]}},
+        {"ok": True, "result": {"message_id": 302}},
+        {"ok": False, "error_code": 400, "description": "Bad Request: wrong file identifier"},
+        {"ok": True, "result": {"message_id": 303, "photo": [{"file_id": "fresh"}]}},
+    ]
+
+    async def fake_request_with_retries(*_args, **kwargs):
+        requests.append(kwargs)
+        return _Resp(payloads.pop(0))
+
+    monkeypatch.setattr(telegram, "_photo_file_ids", telegram.OrderedDict())
+    monkeypatch.setattr(telegram, "telegram_client", lambda: object())
+    monkeypatch.setattr(telegram, "request_with_retries", fake_request_with_retries)
+
+    assert asyncio.run(telegram.send_photo(-1001, b"png", cache_key="k")) == 301
+    assert asyncio.run(telegram.send_photo(-1002, b"png", cache_key="k")) == 302
+    assert "files" in requests[0]
+    assert "files" not in requests[1]
+    assert requests[1]["data"]["photo"] == "full"
+
+    # A rejected file_id falls back to uploading the bytes again.
+    assert asyncio.run(telegram.send_photo(-1003, b"png", cache_key="k")) == 303
+    assert "files" in requests[3]
+    assert telegram._photo_file_ids["k"] == "fresh"